@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     MLModel, TrainingDataset, PredictionLog,
-    SystemLog, UserActivity, Notification, AdminDashboardStats
+    SystemLog, UserActivity, Notification, AdminDashboardStats, TrainingJob,
+    DailyRollup, RollupWatermark, LogArchive
 )
 
 @admin.register(MLModel)
@@ -36,28 +37,50 @@ class MLModelAdmin(admin.ModelAdmin):
 
 @admin.register(TrainingDataset)
 class TrainingDatasetAdmin(admin.ModelAdmin):
-    list_display = ('name', 'dataset_type', 'row_count', 'column_count', 'is_validated', 'uploaded_at')
+    list_display = ('name', 'dataset_type', 'row_count', 'column_count', 'is_validated', 'profile_status', 'uploaded_at')
     list_filter = ('dataset_type', 'is_validated', 'uploaded_at')
     search_fields = ('name', 'description')
-    readonly_fields = ('uploaded_at', 'file_size_mb', 'row_count', 'column_count', 'column_names', 'validation_report')
+    readonly_fields = ('uploaded_at', 'file_size_mb', 'row_count', 'column_count', 'column_names', 'validation_report',
+                       'profile_status', 'profile_progress', 'profiled_at', 'columnar_path')
     fieldsets = (
         ('Basic Information', {
             'fields': ('name', 'description', 'target_column')
         }),
         ('File Information', {
-            'fields': ('dataset_file', 'dataset_type')
+            'fields': ('dataset_file', 'dataset_type', 'columnar_path')
         }),
         ('Dataset Statistics', {
             'fields': ('file_size_mb', 'row_count', 'column_count', 'column_names')
         }),
         ('Validation', {
-            'fields': ('is_validated', 'validation_report')
+            'fields': ('is_validated', 'validation_report', 'profile_status', 'profile_progress', 'profiled_at')
         }),
         ('Upload Info', {
             'fields': ('uploaded_by', 'uploaded_at')
         }),
     )
 
+@admin.register(TrainingJob)
+class TrainingJobAdmin(admin.ModelAdmin):
+    list_display = ('job_type', 'status', 'progress', 'stage', 'submitted_by', 'created_at', 'finished_at')
+    list_filter = ('job_type', 'status', 'created_at')
+    search_fields = ('error_message', 'worker')
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'heartbeat_at', 'worker')
+    fieldsets = (
+        ('Job', {
+            'fields': ('job_type', 'params', 'submitted_by')
+        }),
+        ('Progress', {
+            'fields': ('status', 'progress', 'stage', 'worker', 'heartbeat_at')
+        }),
+        ('Outcome', {
+            'fields': ('metrics', 'result', 'ml_model', 'error_message', 'logs')
+        }),
+        ('Metadata', {
+            'fields': ('created_at', 'started_at', 'finished_at')
+        }),
+    )
+
 @admin.register(PredictionLog)
 class PredictionLogAdmin(admin.ModelAdmin):
     list_display = ('user', 'confidence_score', 'status', 'is_flagged', 'created_at')
@@ -151,4 +174,25 @@ class AdminDashboardStatsAdmin(admin.ModelAdmin):
         return False
     
     def has_delete_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+@admin.register(DailyRollup)
+class DailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('metric', 'dimension', 'date', 'count')
+    list_filter = ('metric', 'date')
+    readonly_fields = ('metric', 'dimension', 'date', 'count')
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ('metric', 'position', 'updated_at')
+    readonly_fields = ('metric', 'position', 'updated_at')
+
+@admin.register(LogArchive)
+class LogArchiveAdmin(admin.ModelAdmin):
+    list_display = ('source', 'partition_date', 'row_count', 'size_bytes', 'status', 'created_at')
+    list_filter = ('source', 'status', 'partition_date')
+    search_fields = ('path',)
+    readonly_fields = [field.name for field in LogArchive._meta.fields]
+    
+    def has_add_permission(self, request):
+        return False
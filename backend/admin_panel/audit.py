@@ -0,0 +1,201 @@
+"""
+Batched, asynchronous writes of audit rows (UserActivity, SystemLog, Notification).
+
+The admin_panel signals and the prediction views used to INSERT an audit row
+inline for every registration, prediction and feedback, so on SQLite each
+request also queued for the database write lock. They now hand the unsaved
+row to ``audit_writer.record()``, which stamps its created_at and, once the
+caller's transaction commits, puts it on an in-process queue. A background
+thread writes queued rows with multi-row INSERTs (admin_panel.bulk.bulk_insert)
+once AUDIT_BATCH_SIZE rows are waiting or the oldest has waited
+AUDIT_FLUSH_INTERVAL seconds, and drains the queue at interpreter exit.
+
+The queue holds at most AUDIT_QUEUE_SIZE rows. When it is full, AUDIT_OVERFLOW
+decides:
+
+    'block'   the caller waits up to AUDIT_BLOCK_TIMEOUT seconds for room
+              (backpressure), then the row is dropped
+    'drop'    the row is dropped at once
+
+Dropped and failed rows are counted in stats() and logged. With AUDIT_WRITER_MODE
+'sync' (always used by the test runner) rows are saved immediately in the
+calling thread, as before.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .bulk import bulk_insert
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('block', 'drop')
+
+_FLUSH = object()
+_STOP = object()
+
+
+class AuditWriter:
+    def __init__(self, mode=None, max_queue=10000, batch_size=500, flush_interval=1.0,
+                 overflow='block', block_timeout=1.0):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+        self._mode = mode
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue = queue.Queue(max_queue)
+        self._thread = None
+        self._pid = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_queue=getattr(settings, 'AUDIT_QUEUE_SIZE', 10000),
+            batch_size=getattr(settings, 'AUDIT_BATCH_SIZE', 500),
+            flush_interval=getattr(settings, 'AUDIT_FLUSH_INTERVAL', 1.0),
+            overflow=getattr(settings, 'AUDIT_OVERFLOW', 'block'),
+            block_timeout=getattr(settings, 'AUDIT_BLOCK_TIMEOUT', 1.0),
+        )
+
+    @property
+    def mode(self):
+        """'sync' or 'async'; follows settings.AUDIT_WRITER_MODE unless given"""
+        return self._mode or getattr(settings, 'AUDIT_WRITER_MODE', 'async')
+
+    def record(self, instance):
+        """
+        Write an unsaved model instance (in async mode, after the current
+        transaction commits, in a later batch).
+        """
+        if self.mode == 'sync' or self._closed:
+            instance.save(force_insert=True)
+            self._count('written')
+            return
+
+        # Stamp the event time now; the row is inserted as is later
+        now = timezone.now()
+        for field in instance._meta.concrete_fields:
+            if getattr(field, 'auto_now_add', False) and getattr(instance, field.attname) is None:
+                setattr(instance, field.attname, now)
+
+        # The row may point at rows the caller has not committed yet (and must
+        # not outlive them if the transaction rolls back)
+        transaction.on_commit(lambda: self._enqueue(instance))
+
+    def _enqueue(self, instance):
+        self._ensure_thread()
+        try:
+            if self.overflow == 'block':
+                self._queue.put(instance, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(instance)
+        except queue.Full:
+            self._count('dropped')
+            logger.warning('Audit queue full (%s); dropped a %s row', self.max_queue, type(instance).__name__)
+
+    def flush(self, timeout=None):
+        """Wait until every row recorded so far is written (or has failed)"""
+        if self.mode == 'sync' or self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_FLUSH, timeout=timeout)
+        self._queue.join()
+
+    def shutdown(self, timeout=10):
+        """Write what is queued and stop the thread; later rows are saved synchronously"""
+        self._closed = True
+        thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning('Audit queue still full at shutdown; some rows may be lost')
+            return
+        thread.join(timeout)
+
+    def stats(self):
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+        }
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                # Forked worker: the parent's queue and thread don't exist here
+                self._queue = queue.Queue(self.max_queue)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.shutdown)
+                self._atexit_registered = True
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = None if deadline is None else max(0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _FLUSH or item is _STOP:
+                    self._queue.task_done()
+                    stop = item is _STOP
+                    break
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch:
+                self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch):
+        rows = defaultdict(list)
+        for instance in batch:
+            rows[type(instance)].append(instance)
+        try:
+            for model, instances in rows.items():
+                try:
+                    bulk_insert(model, instances, self.batch_size)
+                    self._count('written', len(instances))
+                except Exception as e:
+                    self._count('failed', len(instances))
+                    logger.error('Writing %s %s audit rows failed: %s', len(instances), model.__name__, e)
+        finally:
+            close_old_connections()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+
+audit_writer = AuditWriter.from_settings()
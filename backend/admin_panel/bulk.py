@@ -0,0 +1,28 @@
+"""
+Multi-row inserts that keep the values set on the objects.
+
+bulk_create() runs each field's pre_save, which stamps auto_now_add fields
+(created_at on the log models) with the time of the INSERT. bulk_insert()
+writes rows the way loaddata does (raw, without pre_save), so a created_at
+chosen earlier survives: back-dated sample data, or audit rows that are
+written a little after the event they record.
+"""
+from django.db import connections, router, transaction
+
+
+def bulk_insert(model, objs, batch_size=1000):
+    """
+    Insert ``objs`` with one multi-row INSERT per batch, keeping the values
+    set on them (auto_now_add fields included) and sending no signals.
+
+    Fields with defaults are filled in when the objects are instantiated, so
+    only auto_now_add/auto_now fields need to be set by the caller.
+    """
+    if not objs:
+        return
+    using = router.db_for_write(model)
+    fields = model._meta.concrete_fields
+    batch_size = max(1, min(batch_size, connections[using].ops.bulk_batch_size(fields, objs)))
+    with transaction.atomic(using=using, savepoint=False):
+        for start in range(0, len(objs), batch_size):
+            model._base_manager._insert(objs[start:start + batch_size], fields=fields, raw=True, using=using)
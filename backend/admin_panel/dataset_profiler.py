@@ -0,0 +1,245 @@
+"""
+Streaming profile of uploaded training datasets.
+
+CSV files are read in chunks of ``chunk_rows`` rows, so memory stays bounded
+however large the upload is. Each chunk updates per-column accumulators that
+can also be merged with one another (e.g. profiles of file parts built in
+parallel):
+
+    nulls, dtype            counted / widened chunk by chunk
+    count, mean, std        Chan's parallel update of count, mean and M2
+    min, max                running extremes
+    25%, 50%, 75%           a bottom-k random sample of ``sample_size`` values;
+                            exact while a column has no more values than that
+
+The report has the same shape the upload view used to produce with
+``isnull().sum()``, ``dtypes`` and ``describe()``. JSON and Excel files cannot
+be read incrementally by pandas and are profiled in one chunk. A dataset that
+already has a columnar copy (predictions.columnar) is profiled from that, with
+dictionary-encoded text columns reported as 'category'.
+"""
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from predictions.columnar import ColumnarDataset
+
+DEFAULT_CHUNK_ROWS = 50000
+DEFAULT_SAMPLE_SIZE = 4096
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+_INTEGER_DTYPES = ('int8', 'int16', 'int32', 'int64', 'uint8', 'uint16', 'uint32', 'uint64')
+
+
+def merge_dtypes(first, second):
+    """The dtype a full read would give a column seen with both dtypes"""
+    if first is None or first == second:
+        return second
+    if second is None:
+        return first
+    numeric = {first, second} <= set(_INTEGER_DTYPES + ('float32', 'float64'))
+    if numeric:
+        return 'float64' if 'float64' in (first, second) or 'float32' in (first, second) else 'int64'
+    return 'object'
+
+
+def is_numeric_dtype(dtype):
+    return dtype in _INTEGER_DTYPES or dtype in ('float32', 'float64')
+
+
+def _json_number(value):
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else value
+
+
+class NumericSummary:
+    """Mergeable count/mean/std/min/max with a fixed-size sample for quantiles"""
+
+    def __init__(self, sample_size=DEFAULT_SAMPLE_SIZE, seed=0):
+        self.sample_size = sample_size
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._rng = np.random.default_rng(seed)
+        self._sample_keys = np.empty(0)
+        self._sample_values = np.empty(0)
+
+    def update(self, values):
+        """Add a 1-D float array without NaNs"""
+        n = len(values)
+        if n == 0:
+            return
+        mean = float(values.mean())
+        self._combine(n, mean, float(((values - mean) ** 2).sum()), float(values.min()), float(values.max()))
+        self._add_sample(self._rng.random(n), values)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        self._add_sample(other._sample_keys, other._sample_values)
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    def _add_sample(self, keys, values):
+        # Keeping the values with the smallest random keys gives a uniform
+        # sample of everything seen, and merges the same way
+        keys = np.concatenate([self._sample_keys, keys])
+        values = np.concatenate([self._sample_values, np.asarray(values, dtype=np.float64)])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, values = keys[keep], values[keep]
+        self._sample_keys, self._sample_values = keys, values
+
+    @property
+    def std(self):
+        # Sample standard deviation, like pandas
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+    @property
+    def is_exact(self):
+        return self.count <= self.sample_size
+
+    def quantiles(self, quantiles=QUANTILES):
+        if self.count == 0:
+            return [math.nan] * len(quantiles)
+        return [float(q) for q in np.quantile(self._sample_values, quantiles)]
+
+    def describe(self):
+        """The numbers pandas' describe() reports for a numeric column"""
+        q25, q50, q75 = self.quantiles()
+        stats = {
+            'count': float(self.count),
+            'mean': self.mean if self.count else math.nan,
+            'std': self.std,
+            'min': self.min if self.count else math.nan,
+            '25%': q25,
+            '50%': q50,
+            '75%': q75,
+            'max': self.max if self.count else math.nan,
+        }
+        return {name: _json_number(value) for name, value in stats.items()}
+
+
+class ColumnProfile:
+    def __init__(self, sample_size=DEFAULT_SAMPLE_SIZE, seed=0):
+        self.nulls = 0
+        self.dtype = None
+        self.numeric = NumericSummary(sample_size, seed)
+
+    def update(self, series):
+        nulls = int(series.isna().sum())
+        self.nulls += nulls
+        if nulls < len(series):
+            # An all-null chunk says nothing about the column's type
+            self.dtype = merge_dtypes(self.dtype, str(series.dtype))
+        if is_numeric_dtype(str(series.dtype)):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            self.numeric.update(values[~np.isnan(values)])
+
+    def merge(self, other):
+        self.nulls += other.nulls
+        self.dtype = merge_dtypes(self.dtype, other.dtype)
+        self.numeric.merge(other.numeric)
+
+    @property
+    def final_dtype(self):
+        # pandas reads a column without any values as float64
+        return self.dtype or 'float64'
+
+
+class DatasetProfiler:
+    """Accumulates a dataset profile chunk by chunk"""
+
+    def __init__(self, sample_size=DEFAULT_SAMPLE_SIZE, seed=0):
+        self.sample_size = sample_size
+        self.seed = seed
+        self.rows = 0
+        self.chunks = 0
+        self.columns = {}
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        self.chunks += 1
+        for index, name in enumerate(chunk.columns):
+            column = self.columns.get(name)
+            if column is None:
+                column = self.columns[name] = ColumnProfile(self.sample_size, self.seed + index)
+            column.update(chunk[name])
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.chunks += other.chunks
+        for name, other_column in other.columns.items():
+            if name not in self.columns:
+                self.columns[name] = ColumnProfile(self.sample_size, self.seed + len(self.columns))
+            self.columns[name].merge(other_column)
+
+    def report(self):
+        """Statistics in the TrainingDataset.validation_report format"""
+        basic_stats = {}
+        for name, column in self.columns.items():
+            if is_numeric_dtype(column.final_dtype):
+                basic_stats[name] = column.numeric.describe()
+
+        return {
+            'missing_values': {name: column.nulls for name, column in self.columns.items()},
+            'data_types': {name: column.final_dtype for name, column in self.columns.items()},
+            'basic_stats': basic_stats,
+            'profile': {
+                'rows': self.rows,
+                'chunks': self.chunks,
+                'quantile_sample_size': self.sample_size,
+                'exact_quantiles': all(column.numeric.is_exact for column in self.columns.values()),
+            },
+        }
+
+
+def iter_dataset_chunks(path, dataset_type, chunk_rows=DEFAULT_CHUNK_ROWS, columns=None):
+    """
+    Yield (DataFrame chunk, fraction of the file read so far).
+
+    ``dataset_type`` 'columnar' reads a columnar dataset directory, where
+    ``columns`` limits the read to those columns.
+    """
+    if dataset_type == 'columnar':
+        yield from ColumnarDataset(path).iter_chunks(columns=columns, chunk_rows=chunk_rows)
+    elif dataset_type == 'csv':
+        size = os.path.getsize(path) or 1
+        with open(path, 'rb') as f:
+            for chunk in pd.read_csv(f, chunksize=chunk_rows, usecols=columns):
+                yield chunk, min(f.tell() / size, 1.0)
+    elif dataset_type == 'json':
+        df = pd.read_json(path)
+        yield (df if columns is None else df[list(columns)]), 1.0
+    elif dataset_type in ('xlsx', 'xls'):
+        yield pd.read_excel(path, usecols=columns), 1.0
+    else:
+        raise ValueError(f'Unsupported dataset type: {dataset_type}')
+
+
+def profile_dataset(path, dataset_type, chunk_rows=DEFAULT_CHUNK_ROWS,
+                    sample_size=DEFAULT_SAMPLE_SIZE, progress=None, columns=None):
+    """
+    Profile a dataset file; ``progress(fraction, rows)`` is called after each chunk.
+
+    Returns the profiler (its column names, row count and report()).
+    """
+    profiler = DatasetProfiler(sample_size=sample_size)
+    for chunk, fraction in iter_dataset_chunks(path, dataset_type, chunk_rows, columns):
+        profiler.update(chunk)
+        if progress is not None:
+            progress(fraction, profiler.rows)
+    return profiler
@@ -0,0 +1,195 @@
+"""
+Streaming exports for ExportDataView.
+
+Rows are read with QuerySet.iterator() (FKs the serializer touches joined in
+with select_related), serialized one at a time with the admin serializers and
+written out in ~64 KB pieces, so memory stays constant however large the
+table is. Output formats:
+
+    json     one JSON array (the previous response body)
+    ndjson   one JSON object per line
+    csv      header row plus one line per record; nested values as JSON
+
+Any of them can be gzip-compressed on the fly.
+"""
+import csv
+import json
+import zlib
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.utils.encoders import JSONEncoder
+
+from users.models import User
+from .models import MLModel, PredictionLog, SystemLog, UserActivity
+from .serializers import (
+    MLModelSerializer, PredictionLogSerializer, SystemLogSerializer,
+    UserActivitySerializer, UserSerializer
+)
+
+FLUSH_BYTES = 64 * 1024
+
+ExportSpec = namedtuple('ExportSpec', ['model', 'serializer_class', 'select_related', 'time_field'])
+
+EXPORTS = {
+    'predictions': ExportSpec(PredictionLog, PredictionLogSerializer, ('user', 'model_used', 'reviewed_by'), 'created_at'),
+    'users': ExportSpec(User, UserSerializer, (), 'date_joined'),
+    'activities': ExportSpec(UserActivity, UserActivitySerializer, ('user',), 'created_at'),
+    'system_logs': ExportSpec(SystemLog, SystemLogSerializer, ('user',), 'created_at'),
+    'models': ExportSpec(MLModel, MLModelSerializer, ('trained_by', 'training_dataset'), 'created_at'),
+}
+
+FORMATS = {
+    'json': ('application/json', 'json'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+}
+
+
+class ExportError(ValueError):
+    """Invalid export parameters (reported to the client as 400)"""
+
+
+class Export:
+    def __init__(self, export_type, output='json', fields=None, start_date=None, end_date=None,
+                 compress=False, context=None, chunk_size=None):
+        if export_type not in EXPORTS:
+            raise ExportError('Invalid export type')
+        if output not in FORMATS:
+            raise ExportError(f"Invalid output format '{output}' (choose from {', '.join(FORMATS)})")
+
+        self.spec = EXPORTS[export_type]
+        self.export_type = export_type
+        self.output = output
+        self.compress = compress
+        self.chunk_size = chunk_size or getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+        self.serializer = self.spec.serializer_class(context=context or {})
+        self.fields = self._check_fields(fields)
+        self.start, self.end = self._date_range(start_date, end_date)
+
+    @property
+    def content_type(self):
+        return 'application/gzip' if self.compress else FORMATS[self.output][0]
+
+    @property
+    def filename(self):
+        name = f'{self.export_type}_export.{FORMATS[self.output][1]}'
+        return f'{name}.gz' if self.compress else name
+
+    def _check_fields(self, fields):
+        if not fields:
+            return None
+        available = set(self.serializer.fields)
+        unknown = [field for field in fields if field not in available]
+        if unknown:
+            raise ExportError(f"Unknown fields for {self.export_type}: {', '.join(unknown)}")
+        return list(fields)
+
+    def _date_range(self, start_date, end_date):
+        bounds = []
+        for label, value in (('start_date', start_date), ('end_date', end_date)):
+            if not value:
+                bounds.append(None)
+                continue
+            date = parse_date(value)
+            if date is None:
+                raise ExportError(f'{label} must be a date (YYYY-MM-DD)')
+            bounds.append(timezone.make_aware(datetime.combine(date, time.min)))
+        start, end = bounds
+        # end_date is inclusive
+        return start, end + timedelta(days=1) if end else None
+
+    def queryset(self):
+        queryset = self.spec.model.objects.all()
+        if self.spec.select_related:
+            queryset = queryset.select_related(*self.spec.select_related)
+        if self.start:
+            queryset = queryset.filter(**{f'{self.spec.time_field}__gte': self.start})
+        if self.end:
+            queryset = queryset.filter(**{f'{self.spec.time_field}__lt': self.end})
+        return queryset.order_by(self.spec.time_field, 'pk')
+
+    def records(self):
+        """Serialized rows, one dict at a time"""
+        for instance in self.queryset().iterator(chunk_size=self.chunk_size):
+            record = self.serializer.to_representation(instance)
+            if self.fields:
+                record = {field: record.get(field) for field in self.fields}
+            yield record
+
+    def _encode(self, value):
+        return json.dumps(value, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+    def _text_pieces(self):
+        if self.output == 'ndjson':
+            for record in self.records():
+                yield self._encode(record) + '\n'
+
+        elif self.output == 'json':
+            yield '['
+            separator = ''
+            for record in self.records():
+                yield separator + self._encode(record)
+                separator = ','
+            yield ']'
+
+        else:
+            line = _LineBuffer()
+            writer = csv.writer(line)
+            header = None
+            for record in self.records():
+                if header is None:
+                    header = list(record)
+                    writer.writerow(header)
+                    yield line.pop()
+                writer.writerow([self._csv_value(record.get(field)) for field in header])
+                yield line.pop()
+            if header is None:
+                # No rows: still write the header
+                writer.writerow(self.fields or list(self.serializer.fields))
+                yield line.pop()
+
+    def _csv_value(self, value):
+        if isinstance(value, (dict, list)):
+            return self._encode(value)
+        return '' if value is None else value
+
+    def stream(self):
+        """The export body as bytes chunks of about FLUSH_BYTES"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if self.compress else None  # 31: gzip container
+        buffer = []
+        size = 0
+        for piece in self._text_pieces():
+            data = piece.encode('utf-8')
+            buffer.append(data)
+            size += len(data)
+            if size >= FLUSH_BYTES:
+                chunk = b''.join(buffer)
+                buffer, size = [], 0
+                chunk = compressor.compress(chunk) if compressor else chunk
+                if chunk:
+                    yield chunk
+
+        chunk = b''.join(buffer)
+        if compressor:
+            chunk = compressor.compress(chunk) + compressor.flush()
+        if chunk:
+            yield chunk
+
+
+class _LineBuffer:
+    """File-like target for csv.writer that hands back each written line"""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, value):
+        self.parts.append(value)
+
+    def pop(self):
+        text = ''.join(self.parts)
+        self.parts = []
+        return text
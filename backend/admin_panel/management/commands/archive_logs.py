@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+import time
+
+from admin_panel.retention import SOURCES, archive_cutoff, archive_source
+
+
+class Command(BaseCommand):
+    help = 'Move system logs and user activities older than the retention horizon to archive files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', action='append', choices=list(SOURCES), dest='sources',
+                            help='Table to archive (repeatable; default: all)')
+        parser.add_argument('--older-than-days', type=int, default=None,
+                            help='Override the retention horizon from the settings')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Rows per read and per delete transaction')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many rows would be archived')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, archiving every --interval seconds')
+        parser.add_argument('--interval', type=int, default=getattr(settings, 'RETENTION_INTERVAL', 86400),
+                            help='Seconds between runs with --loop')
+
+    def handle(self, *args, **options):
+        sources = options['sources'] or list(SOURCES)
+        try:
+            while True:
+                for name in sources:
+                    if options['dry_run']:
+                        self._report(name, options)
+                    else:
+                        self._archive(name, options)
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Archiving stopped')
+
+    def _report(self, name, options):
+        cutoff = archive_cutoff(name, options['older_than_days'])
+        if cutoff is None:
+            self.stdout.write(f'{name}: not rolled up yet, nothing would be archived')
+            return
+        rows = SOURCES[name].model.objects.filter(created_at__lt=cutoff).count()
+        self.stdout.write(f'{name}: {rows} row(s) created before {cutoff:%Y-%m-%d %H:%M} would be archived')
+
+    def _archive(self, name, options):
+        archives = archive_source(name, options['older_than_days'], options['batch_size'])
+        for archive in archives:
+            self.stdout.write(f'{name} {archive.partition_date}: {archive.row_count} row(s) '
+                              f'-> {archive.path} ({archive.size_bytes / 1024:.1f} KB)')
+        rows = sum(archive.row_count for archive in archives)
+        self.stdout.write(self.style.SUCCESS(f'{name}: archived {rows} row(s) in {len(archives)} file(s)'))
@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand
+import os
+import tempfile
+import time
+
+from predictions.columnar import ColumnarDataset, write_columnar
+from admin_panel.dataset_profiler import profile_dataset
+from predictions.synthetic_data import write_synthetic_data
+
+# A typical training projection: target, a few numeric and categorical features
+PROJECTION = [
+    'predicted_job_role', 'age', 'gpa_score', 'total_experience_years',
+    'highest_degree', 'degree_field', 'skill_python', 'skill_sql',
+]
+
+
+def _directory_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+class Command(BaseCommand):
+    help = 'Compare loading a training dataset from CSV and from its columnar copy'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000,
+                            help='Rows of synthetic data to generate')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Loads per measurement (the best time is reported)')
+        parser.add_argument('--directory', type=str, default=None,
+                            help='Where to write the files (default: a temporary directory)')
+
+    def handle(self, *args, **options):
+        if options['directory']:
+            os.makedirs(options['directory'], exist_ok=True)
+            self._run(options['directory'], options)
+        else:
+            with tempfile.TemporaryDirectory() as directory:
+                self._run(directory, options)
+
+    def _time(self, load, repeat):
+        best = None
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            frame = load()
+            elapsed = time.perf_counter() - start_time
+            best = elapsed if best is None else min(best, elapsed)
+        return best, frame.memory_usage(deep=True).sum()
+
+    def _run(self, directory, options):
+        import pandas as pd
+
+        csv_path = os.path.join(directory, 'dataset.csv')
+        columnar_path = os.path.join(directory, 'dataset.columnar')
+
+        self.stdout.write(f"Generating {options['rows']} rows...")
+        write_synthetic_data(csv_path, n_samples=options['rows'])
+
+        start_time = time.perf_counter()
+        profiler = profile_dataset(csv_path, 'csv')
+        profile_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        write_columnar(csv_path, columnar_path,
+                       dtypes={name: column.final_dtype for name, column in profiler.columns.items()},
+                       rows=profiler.rows)
+        convert_time = time.perf_counter() - start_time
+
+        self.stdout.write(f'Profiled in {profile_time:.2f}s, converted in {convert_time:.2f}s (once, at ingest)')
+        self.stdout.write(f'CSV {_directory_size(csv_path) / 1e6:.1f} MB, '
+                          f'columnar {_directory_size(columnar_path) / 1e6:.1f} MB on disk')
+
+        dataset = ColumnarDataset(columnar_path)
+        projection = [name for name in PROJECTION if name in dataset.columns]
+        repeat = options['repeat']
+        results = [
+            ('csv, all columns', self._time(lambda: pd.read_csv(csv_path), repeat)),
+            ('columnar, all columns', self._time(lambda: dataset.to_frame(), repeat)),
+            (f'csv, {len(projection)} columns', self._time(lambda: pd.read_csv(csv_path, usecols=projection), repeat)),
+            (f'columnar, {len(projection)} columns', self._time(lambda: dataset.to_frame(projection), repeat)),
+        ]
+
+        self.stdout.write(f"\n{'load':<26}{'seconds':>10}{'frame MB':>12}")
+        for label, (seconds, frame_bytes) in results:
+            self.stdout.write(f'{label:<26}{seconds:>10.2f}{frame_bytes / 1e6:>12.1f}')
+
+        speedup = results[0][1][0] / results[1][1][0]
+        self.stdout.write(self.style.SUCCESS(f'\nColumnar full load speedup: {speedup:.1f}x'))
@@ -0,0 +1,124 @@
+from django.core.management.base import BaseCommand
+from datetime import timedelta
+import random
+import time
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from admin_panel.bulk import bulk_insert
+from admin_panel.models import SystemLog
+from admin_panel.pagination import KeysetPagination
+
+LEVELS = ['info', 'info', 'info', 'warning', 'error', 'debug']
+CATEGORIES = ['system', 'database', 'api', 'prediction', 'user']
+
+
+class Command(BaseCommand):
+    help = 'Compare OFFSET and keyset pagination of the system log listing at increasing depths'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000000,
+                            help='Fill SystemLog up to this many rows')
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--depths', type=str, default='1,100,1000,10000,50000',
+                            help='Comma-separated page numbers to time')
+        parser.add_argument('--level', type=str, default=None,
+                            help='Also filter by this level, as the listing does')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Requests per measurement (the best time is reported)')
+        parser.add_argument('--cleanup', action='store_true',
+                            help='Delete the generated rows afterwards')
+
+    def handle(self, *args, **options):
+        self._fill(options['rows'])
+
+        queryset = SystemLog.objects.all()
+        if options['level']:
+            queryset = queryset.filter(level=options['level'])
+        page_size = options['page_size']
+        factory = APIRequestFactory()
+
+        self.stdout.write(f"{'page':>8} {'offset (ms)':>12} {'keyset (ms)':>12}")
+        for depth in [int(value) for value in options['depths'].split(',')]:
+            offset_time = self._time(options['repeat'], lambda: self._offset_page(factory, queryset, page_size, depth))
+            # The keyset request starts from the cursor the previous page would link to
+            cursor = self._cursor_before(factory, queryset, page_size, depth)
+            if offset_time is None or cursor is False:
+                self.stdout.write(f'{depth:>8} (past the last page)')
+                continue
+            keyset_time = self._time(options['repeat'], lambda: self._keyset_page(factory, queryset, page_size, cursor))
+            self.stdout.write(f'{depth:>8} {offset_time * 1000:>12.1f} {keyset_time * 1000:>12.1f}')
+
+        if options['cleanup']:
+            deleted, _ = SystemLog.objects.filter(source='benchmark').delete()
+            self.stdout.write(f'Deleted {deleted} benchmark rows')
+
+    def _fill(self, rows):
+        missing = rows - SystemLog.objects.count()
+        if missing <= 0:
+            return
+        self.stdout.write(f'Writing {missing} system log rows...')
+        rng = random.Random(0)
+        now = timezone.now()
+        batch_size = 20000
+        written = 0
+        with transaction.atomic():
+            while written < missing:
+                size = min(batch_size, missing - written)
+                bulk_insert(SystemLog, [
+                    SystemLog(
+                        level=rng.choice(LEVELS),
+                        category=rng.choice(CATEGORIES),
+                        source='benchmark',
+                        message='Benchmark log row',
+                        created_at=now - timedelta(seconds=rng.uniform(0, 90 * 24 * 3600))
+                    )
+                    for _ in range(size)
+                ])
+                written += size
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+    def _request(self, factory, params):
+        return Request(factory.get('/api/admin/system-logs/', params))
+
+    def _offset_page(self, factory, queryset, page_size, page):
+        paginator = PageNumberPagination()
+        paginator.page_size = page_size
+        try:
+            return paginator.paginate_queryset(queryset.order_by('-created_at'), self._request(factory, {'page': page}))
+        except Exception:
+            return None
+
+    def _keyset_page(self, factory, queryset, page_size, cursor):
+        paginator = KeysetPagination()
+        params = {'page_size': page_size}
+        if cursor:
+            params['cursor'] = cursor
+        return paginator.paginate_queryset(queryset, self._request(factory, params))
+
+    def _cursor_before(self, factory, queryset, page_size, page):
+        if page == 1:
+            return None
+        # Find the last row of the previous page once, outside the timing
+        boundary = queryset.order_by('-created_at', '-id').only('id', 'created_at')[(page - 1) * page_size - 1:][:1]
+        boundary = list(boundary)
+        if not boundary:
+            return False
+        return KeysetPagination().encode_cursor(boundary[0], reverse=False)
+
+    def _time(self, repeat, fetch):
+        best = None
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            page = fetch()
+            elapsed = time.perf_counter() - start_time
+            if page is None:
+                return None
+            best = elapsed if best is None else min(best, elapsed)
+        return best
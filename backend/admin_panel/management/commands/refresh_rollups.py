@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from admin_panel.rollups import SOURCES, rebuild_rollups, refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Add rows created since the last run to the daily dashboard rollups (run periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--metric', action='append', choices=list(SOURCES), dest='metrics',
+                            help='Metric to refresh (repeatable; default: all)')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Discard the rollups and recount from the source tables')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            processed = rebuild_rollups(options['metrics'])
+        else:
+            processed = refresh_rollups(options['metrics'])
+
+        for metric, rows in processed.items():
+            self.stdout.write(f'{metric}: {rows} new row(s) rolled up')
+        self.stdout.write(self.style.SUCCESS('Rollups are up to date'))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from datetime import timedelta
+import os
+import time
+
+from admin_panel.training_jobs import claim_next_job, fail_stale_jobs, get_worker_name, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run queued model training jobs (keep one running next to the web workers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Exit when the queue is empty instead of polling')
+        parser.add_argument('--poll-interval', type=float,
+                            default=getattr(settings, 'TRAINING_WORKER_POLL_INTERVAL', 5),
+                            help='Seconds to wait between queue checks when idle')
+        parser.add_argument('--nice', type=int, default=getattr(settings, 'TRAINING_NICE', 10),
+                            help='Scheduling niceness increment so web workers win CPU contention')
+        parser.add_argument('--stale-after', type=int, default=7200,
+                            help='Fail running jobs without a heartbeat for this many seconds')
+
+    def handle(self, *args, **options):
+        worker = get_worker_name()
+
+        if options['nice'] and hasattr(os, 'nice'):
+            os.nice(options['nice'])
+
+        stale = fail_stale_jobs(timedelta(seconds=options['stale_after']))
+        if stale:
+            self.stdout.write(self.style.WARNING(f'Marked {stale} stale job(s) as failed'))
+
+        self.stdout.write(f'Training worker {worker} started')
+        try:
+            while True:
+                job = claim_next_job(worker)
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                self.stdout.write(f'Running {job.job_type} job {job.pk}...')
+                job = run_job(job)
+                style = self.style.SUCCESS if job.status == 'succeeded' else self.style.ERROR
+                self.stdout.write(style(f'Job {job.pk} {job.status} in {job.metrics.get("duration_seconds")}s'))
+        except KeyboardInterrupt:
+            self.stdout.write('Training worker stopped')
@@ -4,14 +4,30 @@ from admin_panel.models import (
     MLModel, TrainingDataset, PredictionLog, 
     SystemLog, UserActivity, Notification
 )
+from admin_panel.sample_data import ACTIVITY_MODES, DEFAULT_BATCH_SIZE, generate_sample_data
 import uuid
 from datetime import datetime, timedelta
 import json
+import time
 
 User = get_user_model()
 
 class Command(BaseCommand):
-    help = 'Seed initial data for admin panel'
+    help = 'Seed initial data for admin panel (--predictions N adds bulk sample data, e.g. for load tests)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--predictions', type=int, default=0,
+                            help='Also generate this many sample predictions (bulk inserted)')
+        parser.add_argument('--users', type=int, default=5,
+                            help='Sample users the generated predictions are spread over')
+        parser.add_argument('--days', type=int, default=30,
+                            help='Spread generated rows over this many past days')
+        parser.add_argument('--activities', choices=ACTIVITY_MODES, default='bulk',
+                            help='How the per-prediction activity rows are written')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Rows built and inserted per batch')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='Random seed for reproducible data')
     
     def handle(self, *args, **kwargs):
         self.stdout.write('Seeding admin panel data...')
@@ -136,4 +152,29 @@ class Command(BaseCommand):
             
             self.stdout.write('Created sample notifications')
         
-        self.stdout.write(self.style.SUCCESS('Admin panel data seeded successfully!'))
\ No newline at end of file
+        if kwargs['predictions'] > 0:
+            self.generate(kwargs)
+        
+        self.stdout.write(self.style.SUCCESS('Admin panel data seeded successfully!'))
+    
+    def generate(self, options):
+        total = options['predictions']
+        self.stdout.write(f"Generating {total} sample predictions ({options['activities']} activities)...")
+        
+        def progress(done, total):
+            self.stdout.write(f'  {done}/{total} predictions')
+        
+        start_time = time.perf_counter()
+        counts = generate_sample_data(
+            predictions=total,
+            users=options['users'],
+            days=options['days'],
+            activities=options['activities'],
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            progress=progress
+        )
+        elapsed = time.perf_counter() - start_time
+        
+        self.stdout.write(', '.join(f'{count} {name}' for name, count in counts.items()) +
+                          f' in {elapsed:.1f}s ({total / elapsed:.0f} predictions/s)')
\ No newline at end of file
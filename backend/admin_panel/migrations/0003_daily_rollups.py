@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:02
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0002_training_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('metric', models.CharField(choices=[('predictions', 'Predictions'), ('registrations', 'Registrations'), ('activities', 'User Activities'), ('logs', 'System Logs')], max_length=50, primary_key=True, serialize=False)),
+                ('position', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('metric', models.CharField(choices=[('predictions', 'Predictions'), ('registrations', 'Registrations'), ('activities', 'User Activities'), ('logs', 'System Logs')], max_length=50)),
+                ('dimension', models.CharField(blank=True, default='', max_length=50)),
+                ('date', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['metric', 'date'], name='admin_panel_metric_b97283_idx')],
+                'unique_together': {('metric', 'dimension', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:12
+
+from django.db import migrations, models
+
+
+def mark_existing_datasets(apps, schema_editor):
+    # Datasets uploaded before were profiled during the upload request
+    TrainingDataset = apps.get_model('admin_panel', 'TrainingDataset')
+    TrainingDataset.objects.filter(is_validated=True).update(profile_status='completed', profile_progress=100.0)
+    TrainingDataset.objects.filter(is_validated=False).update(profile_status='failed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0003_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingdataset',
+            name='profile_progress',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='trainingdataset',
+            name='profile_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='trainingdataset',
+            name='profiled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='trainingjob',
+            name='job_type',
+            field=models.CharField(choices=[('train_model', 'Train Admin Model'), ('retrain_prediction_model', 'Retrain Prediction Model'), ('profile_dataset', 'Profile Dataset')], max_length=50),
+        ),
+        migrations.RunPython(mark_existing_datasets, migrations.RunPython.noop),
+    ]
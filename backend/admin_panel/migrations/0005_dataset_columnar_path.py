@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0004_dataset_profiling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingdataset',
+            name='columnar_path',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
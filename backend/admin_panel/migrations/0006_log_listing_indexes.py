@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0005_dataset_columnar_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_at', 'id'], name='admin_panel_created_209cd7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_read', 'created_at', 'id'], name='admin_panel_is_read_43a3e0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['priority', 'created_at', 'id'], name='admin_panel_priorit_bd7e5c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['notification_type', 'created_at', 'id'], name='admin_panel_notific_4b9ae3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionlog',
+            index=models.Index(fields=['created_at', 'id'], name='admin_panel_created_291d2a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionlog',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='admin_panel_status_5a7a26_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='systemlog',
+            index=models.Index(fields=['created_at', 'id'], name='admin_panel_created_a5d38c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='systemlog',
+            index=models.Index(fields=['level', 'created_at', 'id'], name='admin_panel_level_67e806_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='systemlog',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='admin_panel_categor_1834d2_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:49
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0006_log_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogArchive',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('source', models.CharField(choices=[('system_logs', 'System Logs'), ('user_activities', 'User Activities')], max_length=50)),
+                ('partition_date', models.DateField()),
+                ('path', models.CharField(max_length=500)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('size_bytes', models.PositiveBigIntegerField(default=0)),
+                ('sha256', models.CharField(max_length=64)),
+                ('first_created_at', models.DateTimeField(blank=True, null=True)),
+                ('last_created_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('deleting', 'Deleting archived rows'), ('complete', 'Complete')], default='deleting', max_length=20)),
+                ('deleted_rows', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-partition_date', '-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['created_at', 'id'], name='admin_panel_created_0b5f9b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logarchive',
+            index=models.Index(fields=['source', 'partition_date'], name='admin_panel_source_ac1bff_idx'),
+        ),
+    ]
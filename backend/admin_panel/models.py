@@ -2,6 +2,7 @@ from django.db import models
 import uuid
 from django.conf import settings
 import json
+import os
 
 class MLModel(models.Model):
     MODEL_TYPES = [
@@ -75,6 +76,13 @@ class TrainingDataset(models.Model):
         ('excel', 'Excel'),
     ]
     
+    PROFILE_STATUS = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -94,6 +102,14 @@ class TrainingDataset(models.Model):
     is_validated = models.BooleanField(default=False)
     validation_report = models.JSONField(default=dict, blank=True)
     
+    # Profiling (runs as a background 'profile_dataset' job after upload)
+    profile_status = models.CharField(max_length=20, choices=PROFILE_STATUS, default='pending')
+    profile_progress = models.FloatField(default=0.0)  # 0-100
+    profiled_at = models.DateTimeField(null=True, blank=True)
+    
+    # Columnar copy written by the profile job (relative to MEDIA_ROOT; see predictions.columnar)
+    columnar_path = models.CharField(max_length=255, blank=True)
+    
     # Upload info
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -111,6 +127,85 @@ class TrainingDataset(models.Model):
         if not self.file_size_mb and self.dataset_file:
             self.file_size_mb = self.dataset_file.size / (1024 * 1024)  # Convert to MB
         super().save(*args, **kwargs)
+    
+    @property
+    def columnar_directory(self):
+        if not self.columnar_path:
+            return None
+        return os.path.join(settings.MEDIA_ROOT, self.columnar_path)
+    
+    def read_columns(self):
+        """Column names, from the columnar metadata or the CSV header"""
+        import pandas as pd
+        from predictions.columnar import ColumnarDataset, is_columnar
+        
+        if is_columnar(self.columnar_directory):
+            return ColumnarDataset(self.columnar_directory).columns
+        return list(pd.read_csv(self.dataset_file.path, nrows=0).columns)
+    
+    def load_frame(self, columns=None):
+        """The dataset as a DataFrame, from its columnar copy when there is one"""
+        import pandas as pd
+        from predictions.columnar import ColumnarDataset, is_columnar
+        
+        if is_columnar(self.columnar_directory):
+            return ColumnarDataset(self.columnar_directory).to_frame(columns)
+        return pd.read_csv(self.dataset_file.path, usecols=columns)
+
+class TrainingJob(models.Model):
+    """A model training run queued by the API and executed by run_training_worker"""
+    JOB_TYPES = [
+        ('train_model', 'Train Admin Model'),
+        ('retrain_prediction_model', 'Retrain Prediction Model'),
+        ('profile_dataset', 'Profile Dataset'),
+    ]
+    
+    JOB_STATUS = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job_type = models.CharField(max_length=50, choices=JOB_TYPES)
+    params = models.JSONField(default=dict, blank=True)
+    
+    # Progress
+    status = models.CharField(max_length=20, choices=JOB_STATUS, default='queued')
+    progress = models.FloatField(default=0.0)  # 0-100
+    stage = models.CharField(max_length=100, blank=True)
+    
+    # Outcome
+    metrics = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    logs = models.TextField(blank=True)
+    error_message = models.TextField(blank=True)
+    ml_model = models.ForeignKey(MLModel, on_delete=models.SET_NULL, null=True, blank=True)
+    
+    # Worker info
+    submitted_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
+    worker = models.CharField(max_length=200, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_job_type_display()} [{self.status}] {self.created_at}"
+    
+    @property
+    def is_finished(self):
+        return self.status in ('succeeded', 'failed', 'cancelled')
 
 class PredictionLog(models.Model):
     PREDICTION_STATUS = [
@@ -150,6 +245,11 @@ class PredictionLog(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        # Admin listing filters, newest first (keyset pagination on created_at, id)
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['status', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"Prediction for {self.user.email} - {self.created_at}"
@@ -190,6 +290,11 @@ class SystemLog(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['level', 'created_at', 'id']),
+            models.Index(fields=['category', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"[{self.level.upper()}] {self.message[:100]}"
@@ -223,6 +328,9 @@ class UserActivity(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.activity_type}"
@@ -268,6 +376,12 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['is_read', 'created_at', 'id']),
+            models.Index(fields=['priority', 'created_at', 'id']),
+            models.Index(fields=['notification_type', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return self.title
@@ -287,4 +401,80 @@ class AdminDashboardStats(models.Model):
         verbose_name_plural = 'Admin Dashboard Stats'
     
     def __str__(self):
-        return f"Dashboard Stats - {self.last_refreshed}"
\ No newline at end of file
+        return f"Dashboard Stats - {self.last_refreshed}"
+
+
+class DailyRollup(models.Model):
+    """Per-day row counts behind the admin dashboards (see admin_panel.rollups)"""
+    METRICS = [
+        ('predictions', 'Predictions'),
+        ('registrations', 'Registrations'),
+        ('activities', 'User Activities'),
+        ('logs', 'System Logs'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    metric = models.CharField(max_length=50, choices=METRICS)
+    # Activity type or log level; empty for metrics without a breakdown
+    dimension = models.CharField(max_length=50, blank=True, default='')
+    date = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-date']
+        unique_together = ('metric', 'dimension', 'date')
+        indexes = [
+            models.Index(fields=['metric', 'date']),
+        ]
+    
+    def __str__(self):
+        label = f"{self.metric}:{self.dimension}" if self.dimension else self.metric
+        return f"{label} {self.date} = {self.count}"
+
+class RollupWatermark(models.Model):
+    """Rows of a metric created before ``position`` are already counted in DailyRollup"""
+    metric = models.CharField(max_length=50, primary_key=True, choices=DailyRollup.METRICS)
+    position = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.metric} rolled up to {self.position}"
+
+class LogArchive(models.Model):
+    """One day of SystemLog or UserActivity rows moved to a file (see admin_panel.retention)"""
+    SOURCES = [
+        ('system_logs', 'System Logs'),
+        ('user_activities', 'User Activities'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('deleting', 'Deleting archived rows'),
+        ('complete', 'Complete'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    source = models.CharField(max_length=50, choices=SOURCES)
+    # Local day the rows were created on
+    partition_date = models.DateField()
+    
+    # gzip-compressed NDJSON, relative to MEDIA_ROOT
+    path = models.CharField(max_length=500)
+    row_count = models.PositiveIntegerField(default=0)
+    size_bytes = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64)
+    first_created_at = models.DateTimeField(null=True, blank=True)
+    last_created_at = models.DateTimeField(null=True, blank=True)
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='deleting')
+    deleted_rows = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-partition_date', '-created_at']
+        indexes = [
+            models.Index(fields=['source', 'partition_date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.source} {self.partition_date} ({self.row_count} rows)"
@@ -0,0 +1,126 @@
+"""
+Keyset pagination for the admin log listings.
+
+PageNumberPagination runs a COUNT(*) over the whole filtered table and then
+an OFFSET query that reads and discards every row before the page, so page
+N costs O(N) and the count alone scans millions of log rows. KeysetPagination
+orders by (created_at, id) descending and encodes the boundary row of a page
+in an opaque ``cursor``. The next page is then
+
+    WHERE created_at <= :created_at
+      AND (created_at < :created_at OR (created_at = :created_at AND id < :id))
+    ORDER BY created_at DESC, id DESC LIMIT page_size + 1
+
+which the composite (filter, created_at, id) indexes on SystemLog,
+Notification and PredictionLog answer by seeking, at the same cost for page 1
+and page 100,000. There is no total count; responses carry ``next``,
+``previous`` and ``results``.
+"""
+import base64
+import binascii
+import uuid
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            reverse = False
+            queryset = queryset.order_by('-created_at', '-id')
+        else:
+            created_at, pk, reverse = self.cursor
+            # The plain range bound is redundant with the OR below, but it is
+            # what lets the database seek the index instead of scanning it
+            if reverse:
+                # Walking back towards newer rows
+                queryset = queryset.filter(created_at__gte=created_at).filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                ).order_by('created_at', 'id')
+            else:
+                queryset = queryset.filter(created_at__lte=created_at).filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                ).order_by('-created_at', '-id')
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = (not reverse and has_more) or (reverse and bool(rows))
+        self.has_previous = (reverse and has_more) or (not reverse and self.cursor is not None and bool(rows))
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def encode_cursor(self, row, reverse):
+        raw = f"{row.created_at.isoformat()}|{row.pk.hex}|{'r' if reverse else 'f'}"
+        return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk, direction = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            created_at = parse_datetime(created_at)
+            pk = uuid.UUID(pk)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None or direction not in ('f', 'r'):
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk, direction == 'r'
+
+    def _link(self, cursor):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(remove_query_param(url, 'page'), self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self._link(self.encode_cursor(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self._link(self.encode_cursor(self.page[0], reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
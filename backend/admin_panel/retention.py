@@ -0,0 +1,280 @@
+"""
+Retention for the audit tables.
+
+SystemLog and UserActivity get rows from signals on every prediction and
+registration, and nothing removed them. archive_source() moves rows older
+than a retention horizon (SYSTEM_LOG_RETENTION_DAYS,
+USER_ACTIVITY_RETENTION_DAYS) out of the database, one local day at a time:
+
+    1. the day's rows are streamed in (created_at, id) order into a
+       gzip-compressed NDJSON file under MEDIA_ROOT/RETENTION_ARCHIVE_DIR
+       (written as .partial, fsynced, then renamed)
+    2. a LogArchive row records the file, its row count, time range and sha256
+    3. the rows listed in the file are deleted, RETENTION_BATCH_SIZE per
+       transaction, so the table is never locked for long
+
+An archive interrupted during step 3 stays in status 'deleting' and its
+deletes are finished before anything else is archived. Only rows in the
+archive file are deleted, so a row that arrives late for an archived day is
+picked up by a later run.
+
+The dashboards read these tables through DailyRollup (admin_panel.rollups),
+so rollups are brought up to date before archiving and rows past the rollup
+watermark are never archived: archived rows keep counting in the history.
+`refresh_rollups --rebuild` recounts from the live tables only.
+
+read_archives() streams archived rows back, opening only the files whose time
+range overlaps the query. Run `python manage.py archive_logs` from cron, or
+with --loop as a long-running process.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import LogArchive, RollupWatermark, SystemLog, UserActivity
+from .rollups import refresh_rollups
+
+logger = logging.getLogger(__name__)
+
+# model, rollup metric, retention setting (and its default) and the fields
+# archived rows can be filtered on
+ArchiveSource = namedtuple('ArchiveSource', ['model', 'metric', 'retention_setting', 'default_days', 'filters'])
+
+SOURCES = {
+    'system_logs': ArchiveSource(SystemLog, 'logs', 'SYSTEM_LOG_RETENTION_DAYS', 90,
+                                 ('level', 'category', 'user_id')),
+    'user_activities': ArchiveSource(UserActivity, 'activities', 'USER_ACTIVITY_RETENTION_DAYS', 180,
+                                     ('activity_type', 'user_id')),
+}
+
+
+def retention_days(name):
+    source = SOURCES[name]
+    return getattr(settings, source.retention_setting, source.default_days)
+
+
+def default_batch_size():
+    return getattr(settings, 'RETENTION_BATCH_SIZE', 1000)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _fields(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def _iter_batches(model, start, end, batch_size):
+    """Rows (as dicts) with start <= created_at < end in (created_at, id) order"""
+    queryset = model._base_manager.filter(created_at__gte=start, created_at__lt=end).order_by('created_at', 'id')
+    fields = _fields(model)
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            page = page.filter(created_at__gte=last[0]).filter(
+                Q(created_at__gt=last[0]) | Q(created_at=last[0], id__gt=last[1])
+            )
+        rows = list(page.values(*fields)[:batch_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]['created_at'], rows[-1]['id']
+
+
+def _read_file(relative_path):
+    with gzip.open(os.path.join(settings.MEDIA_ROOT, relative_path), 'rt', encoding='utf-8') as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_partition(name, day, start, end, batch_size):
+    """Write the day's rows to a new archive file; None when there are none"""
+    archive_dir = getattr(settings, 'RETENTION_ARCHIVE_DIR', 'archives')
+    relative_path = os.path.join(archive_dir, name, f'{day:%Y}', f'{day:%m}',
+                                 f'{name}-{day.isoformat()}-{uuid.uuid4().hex[:8]}.ndjson.gz')
+    path = os.path.join(settings.MEDIA_ROOT, relative_path)
+    partial_path = path + '.partial'
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    rows = 0
+    first_created_at = last_created_at = None
+    try:
+        with open(partial_path, 'wb') as raw:
+            with gzip.open(raw, 'wt', encoding='utf-8') as handle:
+                for batch in _iter_batches(SOURCES[name].model, start, end, batch_size):
+                    for row in batch:
+                        handle.write(json.dumps(row, default=_json_default))
+                        handle.write('\n')
+                    rows += len(batch)
+                    first_created_at = first_created_at or batch[0]['created_at']
+                    last_created_at = batch[-1]['created_at']
+            raw.flush()
+            os.fsync(raw.fileno())
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    if not rows:
+        os.remove(partial_path)
+        return None
+
+    os.replace(partial_path, path)
+    return LogArchive.objects.create(
+        source=name,
+        partition_date=day,
+        path=relative_path,
+        row_count=rows,
+        size_bytes=os.path.getsize(path),
+        sha256=_sha256(path),
+        first_created_at=first_created_at,
+        last_created_at=last_created_at,
+    )
+
+
+def _delete_batch(archive, model, ids):
+    with transaction.atomic():
+        deleted, _ = model._base_manager.filter(pk__in=ids).delete()
+        LogArchive.objects.filter(pk=archive.pk).update(deleted_rows=F('deleted_rows') + deleted)
+
+
+def delete_archived_rows(archive, batch_size=None):
+    """Delete the rows listed in ``archive``'s file from the live table (idempotent)"""
+    batch_size = batch_size or default_batch_size()
+    model = SOURCES[archive.source].model
+
+    ids = []
+    for row in _read_file(archive.path):
+        ids.append(row['id'])
+        if len(ids) >= batch_size:
+            _delete_batch(archive, model, ids)
+            ids = []
+    if ids:
+        _delete_batch(archive, model, ids)
+
+    archive.refresh_from_db(fields=['deleted_rows'])
+    if archive.deleted_rows != archive.row_count:
+        # e.g. activities of a user deleted in the meantime (CASCADE)
+        logger.warning('Archive %s: deleted %s of %s rows', archive.path, archive.deleted_rows, archive.row_count)
+    archive.status = 'complete'
+    archive.completed_at = timezone.now()
+    archive.save(update_fields=['status', 'completed_at'])
+    return archive
+
+
+def archive_cutoff(name, older_than_days=None, now=None):
+    """
+    Rows created before this are archived: the start of the local day
+    ``older_than_days`` ago, but never past the rollup watermark (None when
+    the metric was never rolled up).
+    """
+    days = retention_days(name) if older_than_days is None else older_than_days
+    now = now or timezone.now()
+    cutoff = _day_start(timezone.localdate(now) - timedelta(days=days))
+
+    position = (RollupWatermark.objects.filter(metric=SOURCES[name].metric)
+                .values_list('position', flat=True).first())
+    if position is None:
+        return None
+    if position < cutoff:
+        cutoff = _day_start(timezone.localdate(position))
+    return cutoff
+
+
+def archive_source(name, older_than_days=None, batch_size=None, now=None):
+    """
+    Move ``name``'s rows older than the retention horizon to archive files.
+
+    Returns the LogArchive rows written, one per local day (more if late rows
+    arrive for a day that was already archived).
+    """
+    batch_size = batch_size or default_batch_size()
+
+    for archive in LogArchive.objects.filter(source=name, status='deleting').order_by('created_at'):
+        logger.info('Finishing interrupted archive %s', archive.path)
+        delete_archived_rows(archive, batch_size)
+
+    # Archived rows must already be counted in the dashboard rollups
+    refresh_rollups([SOURCES[name].metric], now=now)
+    cutoff = archive_cutoff(name, older_than_days, now)
+    if cutoff is None:
+        return []
+
+    model = SOURCES[name].model
+    archives = []
+    while True:
+        oldest = (model._base_manager.filter(created_at__lt=cutoff)
+                  .order_by('created_at').values_list('created_at', flat=True).first())
+        if oldest is None:
+            break
+        day = timezone.localdate(oldest)
+        end = min(_day_start(day + timedelta(days=1)), cutoff)
+
+        archive = _write_partition(name, day, _day_start(day), end, batch_size)
+        if archive is None:
+            break
+        archives.append(delete_archived_rows(archive, batch_size))
+        logger.info('Archived %s %s rows from %s to %s', archive.row_count, name, day, archive.path)
+    return archives
+
+
+def read_archives(name, start=None, end=None, **filters):
+    """
+    Yield archived rows of ``name`` with start <= created_at < end whose
+    fields equal ``filters`` (see SOURCES), oldest first. created_at is
+    parsed; other values are as stored (UUIDs as strings).
+    """
+    source = SOURCES[name]
+    unknown = set(filters) - set(source.filters)
+    if unknown:
+        raise ValueError(f"Cannot filter {name} archives on {', '.join(sorted(unknown))}")
+    filters = {key: str(value) if isinstance(value, uuid.UUID) else value for key, value in filters.items()}
+
+    archives = LogArchive.objects.filter(source=name).order_by('partition_date', 'first_created_at')
+    if start is not None:
+        archives = archives.filter(last_created_at__gte=start)
+    if end is not None:
+        archives = archives.filter(first_created_at__lt=end)
+
+    for archive in archives.iterator():
+        for row in _read_file(archive.path):
+            created_at = parse_datetime(row['created_at'])
+            if start is not None and created_at < start:
+                continue
+            if end is not None and created_at >= end:
+                # Files are written in created_at order
+                break
+            if all(row.get(key) == value for key, value in filters.items()):
+                row['created_at'] = created_at
+                yield row
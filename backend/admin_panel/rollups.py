@@ -0,0 +1,200 @@
+"""
+Daily rollups behind the admin dashboards.
+
+The dashboards chart per-day counts of predictions, registrations, user
+activities (by type) and system logs (by level). Instead of counting the raw
+tables for every day on every request, counts are kept per (metric, dimension,
+local date) in DailyRollup and brought up to date incrementally:
+
+    refresh_rollups() counts only rows created since the metric's watermark
+    (RollupWatermark.position) with one grouped query, adds them to the daily
+    rows and moves the watermark forward.
+
+Rows younger than ROLLUP_SETTLE_SECONDS are left for the next refresh, so a
+transaction that commits a little late is still counted. Readers add those
+not-yet-rolled-up rows live (the "tail"), so results are always exact while a
+dashboard query only touches O(days) rollup rows plus the short tail.
+
+Refresh runs from `python manage.py refresh_rollups` (e.g. every few minutes
+from cron) and lazily from the dashboards when a watermark is older than
+ROLLUP_REFRESH_INTERVAL. Rollups count rows as they were created, so rows
+removed later (e.g. archived logs) keep counting in the history; use
+`refresh_rollups --rebuild` to recount from the tables.
+"""
+import logging
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from users.models import User
+from .models import DailyRollup, RollupWatermark, PredictionLog, UserActivity, SystemLog
+
+logger = logging.getLogger(__name__)
+
+# model, timestamp field and optional breakdown field of each metric
+RollupSource = namedtuple('RollupSource', ['model', 'time_field', 'dimension'])
+
+SOURCES = {
+    'predictions': RollupSource(PredictionLog, 'created_at', None),
+    'registrations': RollupSource(User, 'date_joined', None),
+    'activities': RollupSource(UserActivity, 'created_at', 'activity_type'),
+    'logs': RollupSource(SystemLog, 'created_at', 'level'),
+}
+
+
+def settle_seconds():
+    return getattr(settings, 'ROLLUP_SETTLE_SECONDS', 60)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def _grouped_counts(source, start=None, end=None):
+    """(local date, dimension, count) for rows with start <= time < end"""
+    queryset = source.model.objects.all()
+    if start is not None:
+        queryset = queryset.filter(**{f'{source.time_field}__gte': start})
+    if end is not None:
+        queryset = queryset.filter(**{f'{source.time_field}__lt': end})
+
+    fields = ['rollup_day'] + ([source.dimension] if source.dimension else [])
+    rows = (queryset.annotate(rollup_day=TruncDate(source.time_field))
+            .values(*fields)
+            .annotate(rollup_count=Count('pk'))
+            .order_by())
+    for row in rows:
+        dimension = row[source.dimension] if source.dimension else ''
+        yield row['rollup_day'], dimension or '', row['rollup_count']
+
+
+def _add_count(metric, dimension, day, count):
+    updated = DailyRollup.objects.filter(
+        metric=metric, dimension=dimension, date=day
+    ).update(count=F('count') + count)
+    if not updated:
+        DailyRollup.objects.create(metric=metric, dimension=dimension, date=day, count=count)
+
+
+def _refresh_metric(metric, cutoff):
+    source = SOURCES[metric]
+    with transaction.atomic():
+        watermark, _ = RollupWatermark.objects.get_or_create(metric=metric)
+        start = watermark.position
+        if start is not None and start >= cutoff:
+            return 0
+
+        # Claim [start, cutoff) with a conditional UPDATE: a concurrent refresh
+        # that read the same watermark updates nothing and counts nothing
+        claimed = RollupWatermark.objects.filter(metric=metric, position=start).update(
+            position=cutoff, updated_at=timezone.now()
+        )
+        if not claimed:
+            return 0
+
+        rows = 0
+        for day, dimension, count in _grouped_counts(source, start, cutoff):
+            _add_count(metric, dimension, day, count)
+            rows += count
+    return rows
+
+
+def refresh_rollups(metrics=None, max_age=None, now=None):
+    """
+    Roll up rows created since each metric's watermark.
+
+    With ``max_age`` (seconds) only metrics refreshed longer ago than that are
+    processed. Returns {metric: rows added}.
+    """
+    metrics = list(metrics or SOURCES)
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=settle_seconds())
+
+    if max_age is not None:
+        fresh = set(RollupWatermark.objects.filter(
+            metric__in=metrics, updated_at__gt=now - timedelta(seconds=max_age)
+        ).values_list('metric', flat=True))
+        metrics = [metric for metric in metrics if metric not in fresh]
+
+    return {metric: _refresh_metric(metric, cutoff) for metric in metrics}
+
+
+def refresh_stale_rollups():
+    """Refresh metrics not refreshed within ROLLUP_REFRESH_INTERVAL; never raises"""
+    try:
+        return refresh_rollups(max_age=getattr(settings, 'ROLLUP_REFRESH_INTERVAL', 300))
+    except Exception as e:
+        # Readers add the rows since the watermark themselves, so a failed
+        # refresh only makes the dashboard query a little longer
+        logger.warning('Rollup refresh failed: %s', e)
+        return {}
+
+
+def rebuild_rollups(metrics=None):
+    """Recount the given metrics (default: all) from the source tables"""
+    metrics = list(metrics or SOURCES)
+    with transaction.atomic():
+        DailyRollup.objects.filter(metric__in=metrics).delete()
+        RollupWatermark.objects.filter(metric__in=metrics).delete()
+        return refresh_rollups(metrics)
+
+
+def _watermark(metric):
+    return RollupWatermark.objects.filter(metric=metric).values_list('position', flat=True).first()
+
+
+def _tail_start(metric, since=None):
+    """Where rows not yet in DailyRollup begin (None: the start of the table)"""
+    position = _watermark(metric)
+    if position is None:
+        return since
+    if since is None:
+        return position
+    return max(position, since)
+
+
+def daily_counts(metric, days, today=None):
+    """[{'date', 'count'}] for the last ``days`` local days, oldest first, zeros included"""
+    today = today or timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
+
+    counts = defaultdict(int)
+    rollups = (DailyRollup.objects.filter(metric=metric, date__gte=first_day, date__lte=today)
+               .values('date')
+               .annotate(total=Sum('count'))
+               .order_by())
+    for row in rollups:
+        counts[row['date']] += row['total']
+
+    start = _tail_start(metric, _day_start(first_day))
+    for day, _, count in _grouped_counts(SOURCES[metric], start=start):
+        counts[day] += count
+
+    return [
+        {'date': (first_day + timedelta(days=i)).isoformat(), 'count': counts[first_day + timedelta(days=i)]}
+        for i in range(days)
+    ]
+
+
+def totals_by_dimension(metric):
+    """{dimension: count} over all time"""
+    totals = defaultdict(int)
+    for row in (DailyRollup.objects.filter(metric=metric)
+                .values('dimension')
+                .annotate(total=Sum('count'))
+                .order_by()):
+        totals[row['dimension']] += row['total']
+
+    for _, dimension, count in _grouped_counts(SOURCES[metric], start=_tail_start(metric)):
+        totals[dimension] += count
+    return dict(totals)
+
+
+def total_count(metric):
+    """Rows of a metric created over all time"""
+    return sum(totals_by_dimension(metric).values())
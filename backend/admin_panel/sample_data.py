@@ -0,0 +1,267 @@
+"""
+High-volume sample data for the admin dashboards.
+
+GenerateSampleDataView, PredictionLogViewSet.generate_sample_data and
+`seed_data --predictions N` all go through generate_sample_data(). Rows are
+built ``batch_size`` at a time and written with multi-row INSERTs inside one
+transaction, so a dashboard load test with 1M predictions takes minutes rather
+than millions of single-row saves.
+
+Predictions are spread over the last ``days`` days. bulk_create() stamps
+auto_now_add fields with the current time, so rows go through
+admin_panel.bulk.bulk_insert() and the back-dated created_at stays.
+
+The rows log_prediction_activity writes for each new PredictionLog (a
+UserActivity, plus a warning SystemLog for a failed prediction) depend on
+``activities``:
+
+    'bulk'      synthesized with the same content and the prediction's date,
+                and bulk inserted with the predictions (default)
+    'signals'   post_save is sent for each prediction, so the receivers write
+                them through the audit writer as in production
+    'none'      not written
+
+Sample users are few and are saved one at a time, so their profile and
+registration signals run as usual. The rollups of the written metrics are
+rebuilt at the end, since back-dated rows fall behind their watermarks.
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import router, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from users.models import User
+from .audit import audit_writer
+from .bulk import bulk_insert
+from .models import MLModel, Notification, PredictionLog, SystemLog, UserActivity
+from .rollups import rebuild_rollups
+
+ACTIVITY_MODES = ('bulk', 'signals', 'none')
+DEFAULT_BATCH_SIZE = 5000
+
+JOB_ROLES = [
+    'Software Engineer', 'Data Scientist', 'Machine Learning Engineer',
+    'DevOps Engineer', 'Frontend Developer', 'Backend Developer',
+    'Full Stack Developer', 'Data Analyst', 'AI Engineer', 'Cloud Architect'
+]
+
+SKILL_SETS = [
+    ['Python', 'Django', 'React', 'PostgreSQL'],
+    ['Java', 'Spring', 'MySQL', 'Docker'],
+    ['Python', 'TensorFlow', 'PyTorch', 'Scikit-learn'],
+    ['JavaScript', 'Node.js', 'MongoDB', 'AWS'],
+    ['C++', 'Python', 'Linux', 'Git']
+]
+
+LOCATIONS = ['New York', 'San Francisco', 'London', 'Berlin', 'Tokyo']
+
+LOG_MESSAGES = [
+    ('info', 'User login successful'),
+    ('info', 'Model prediction completed'),
+    ('warning', 'High prediction latency detected'),
+    ('error', 'Database connection timeout'),
+    ('info', 'New user registered'),
+    ('warning', 'Low confidence prediction flagged'),
+    ('info', 'Dataset uploaded successfully'),
+    ('error', 'Model training failed'),
+    ('info', 'System backup completed'),
+    ('warning', 'Memory usage above threshold')
+]
+
+NOTIFICATIONS = [
+    ('New Prediction Available', 'A new job prediction has been made', 'prediction', 2),
+    ('Model Training Complete', 'ML model training completed successfully', 'model', 2),
+    ('System Alert', 'High server load detected', 'system', 3),
+    ('User Registered', 'New user joined the platform', 'user', 1),
+    ('Data Export Ready', 'Prediction data export is ready for download', 'system', 2)
+]
+
+
+def _sample_users(count):
+    emails = [f'user{i}@example.com' for i in range(1, count + 1)]
+    users = {user.email: user for user in User.objects.filter(email__in=emails)}
+    created = 0
+    password = None
+    for i, email in enumerate(emails, start=1):
+        if email in users:
+            continue
+        # Hash the shared sample password once rather than per user
+        password = password or make_password('password123')
+        user = User(email=email, name=f'User {i}', role='user', is_active=True, is_verified=True, password=password)
+        user.save()
+        users[email] = user
+        created += 1
+    return [users[email] for email in emails], created
+
+
+def _active_model():
+    active_model = MLModel.objects.filter(is_active=True).first()
+    if active_model:
+        return active_model
+    return MLModel.objects.create(
+        name='Job Prediction Model v1.0',
+        model_type='random_forest',
+        accuracy=0.87,
+        precision=0.85,
+        recall=0.86,
+        f1_score=0.855,
+        is_active=True,
+        status='trained',
+        version='1.0.0',
+        description='Default model for job role prediction'
+    )
+
+
+def _prediction(rng, user, model, created_at):
+    job_role = rng.choice(JOB_ROLES)
+    confidence = rng.uniform(0.65, 0.98)
+
+    # Mostly success, some flagged/failed
+    status_roll = rng.random()
+    status = 'success' if status_roll < 0.85 else 'flagged' if status_roll < 0.95 else 'failed'
+
+    return PredictionLog(
+        user=user,
+        input_data={
+            'education': rng.choice(["Bachelor's", "Master's", 'PhD']),
+            'experience': f'{rng.randint(1, 15)} years',
+            'skills': rng.choice(SKILL_SETS),
+            'location': rng.choice(LOCATIONS),
+            'field': rng.choice(['Computer Science', 'Data Science', 'Software Engineering'])
+        },
+        prediction_result={
+            'job_role': job_role,
+            'confidence': confidence,
+            'salary_range': f'${rng.randint(70, 150)}k - ${rng.randint(100, 250)}k',
+            'top_skills': rng.sample(['Python', 'SQL', 'AWS', 'Docker', 'React', 'TensorFlow'], 3)
+        },
+        confidence_score=confidence,
+        model_used=model,
+        model_version=model.version or '1.0.0',
+        status=status,
+        is_flagged=status == 'flagged',
+        flag_reason='Low confidence' if status == 'flagged' else '',
+        processing_time=rng.uniform(0.1, 3.0),
+        created_at=created_at
+    )
+
+
+def _prediction_activity_rows(prediction):
+    """The rows log_prediction_activity writes for ``prediction``, dated like it"""
+    activity = UserActivity(
+        user=prediction.user,
+        activity_type='prediction',
+        description=f'Made prediction with {prediction.confidence_score:.1%} confidence',
+        metadata={
+            'model_used': str(prediction.model_used.id) if prediction.model_used else None,
+            'confidence': prediction.confidence_score,
+            'status': prediction.status
+        },
+        created_at=prediction.created_at
+    )
+    if prediction.status != 'failed':
+        return activity, None
+    return activity, SystemLog(
+        level='warning',
+        category='prediction',
+        source='prediction_service',
+        message=f'Prediction failed for user {prediction.user.email}',
+        user=prediction.user,
+        details={'error': prediction.error_message},
+        created_at=prediction.created_at
+    )
+
+
+def generate_sample_data(predictions=50, users=5, days=30, activities='bulk', system_logs=10,
+                         notifications=5, batch_size=DEFAULT_BATCH_SIZE, seed=None, progress=None):
+    """
+    Write sample users, predictions, activities, system logs and notifications.
+
+    ``progress(done, total)`` is called after each batch of predictions.
+    Returns the number of rows written per kind.
+    """
+    if activities not in ACTIVITY_MODES:
+        raise ValueError(f"activities must be one of {', '.join(ACTIVITY_MODES)}")
+    for name, value in (('predictions', predictions), ('system_logs', system_logs),
+                        ('notifications', notifications)):
+        if value < 0:
+            raise ValueError(f'{name} must not be negative')
+    if users < 1 or days < 1 or batch_size < 1:
+        raise ValueError('users, days and batch_size must be at least 1')
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    span = days * 24 * 3600
+
+    def created_at(max_days=None):
+        seconds = min(span, max_days * 24 * 3600) if max_days else span
+        return now - timedelta(seconds=rng.uniform(0, seconds))
+
+    counts = {'users': 0, 'predictions': 0, 'activities': 0, 'system_logs': 0, 'notifications': 0}
+    with transaction.atomic():
+        sample_users, counts['users'] = _sample_users(users)
+        model = _active_model()
+
+        while counts['predictions'] < predictions:
+            size = min(batch_size, predictions - counts['predictions'])
+            batch = [_prediction(rng, rng.choice(sample_users), model, created_at()) for _ in range(size)]
+            bulk_insert(PredictionLog, batch, batch_size)
+
+            if activities == 'bulk':
+                rows = [_prediction_activity_rows(prediction) for prediction in batch]
+                bulk_insert(UserActivity, [activity for activity, _ in rows], batch_size)
+                failure_logs = [log for _, log in rows if log is not None]
+                bulk_insert(SystemLog, failure_logs, batch_size)
+                counts['activities'] += len(rows)
+                counts['system_logs'] += len(failure_logs)
+            elif activities == 'signals':
+                using = router.db_for_write(PredictionLog)
+                for prediction in batch:
+                    post_save.send(sender=PredictionLog, instance=prediction, created=True,
+                                   update_fields=None, raw=False, using=using)
+                counts['activities'] += len(batch)
+
+            counts['predictions'] += size
+            if progress is not None:
+                progress(counts['predictions'], predictions)
+
+        logs = []
+        for _ in range(system_logs):
+            level, message = rng.choice(LOG_MESSAGES)
+            logged_at = created_at(14)
+            logs.append(SystemLog(
+                level=level,
+                category=rng.choice(['system', 'database', 'api', 'prediction']),
+                source='prediction_service',
+                message=message,
+                details={'timestamp': logged_at.isoformat()},
+                created_at=logged_at
+            ))
+        bulk_insert(SystemLog, logs, batch_size)
+        counts['system_logs'] += len(logs)
+
+        sample_notifications = []
+        for _ in range(notifications):
+            title, message, notification_type, priority = rng.choice(NOTIFICATIONS)
+            sample_notifications.append(Notification(
+                title=title,
+                message=message,
+                notification_type=notification_type,
+                priority=priority,
+                is_read=rng.choice([True, False]),
+                created_at=created_at(7)
+            ))
+        bulk_insert(Notification, sample_notifications, batch_size)
+        counts['notifications'] = len(sample_notifications)
+
+    if activities == 'signals':
+        audit_writer.flush()
+    rebuild_rollups(['predictions', 'activities', 'logs'])
+
+    from .views import AdminStatsView
+    from edu2job_backend.caching import response_cache
+    response_cache.invalidate(AdminStatsView.cache_key)
+    return counts
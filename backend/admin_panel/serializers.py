@@ -1,9 +1,11 @@
 from rest_framework import serializers
 from .models import (
     MLModel, TrainingDataset, PredictionLog, 
-    SystemLog, UserActivity, Notification
+    SystemLog, UserActivity, Notification, TrainingJob, LogArchive
 )
 from users.models import User
+from django.db.models.fields.json import KT
+from django.db.models.functions import Coalesce
 from datetime import timedelta
 from django.utils import timezone
 import uuid
@@ -53,7 +55,8 @@ class TrainingDatasetSerializer(serializers.ModelSerializer):
         model = TrainingDataset
         fields = '__all__'
         read_only_fields = ('id', 'uploaded_at', 'created_at', 'file_size_mb', 
-                          'row_count', 'column_count', 'column_names', 'validation_report')
+                          'row_count', 'column_count', 'column_names', 'validation_report',
+                          'profile_status', 'profile_progress', 'profiled_at', 'columnar_path')
     
     def get_uploaded_by_id(self, obj):
         return str(obj.uploaded_by.id) if obj.uploaded_by else None
@@ -73,6 +76,26 @@ class TrainingDatasetSerializer(serializers.ModelSerializer):
         
         return representation
 
+class TrainingJobSerializer(serializers.ModelSerializer):
+    submitted_by_email = serializers.CharField(source='submitted_by.email', read_only=True, allow_null=True)
+    ml_model_name = serializers.CharField(source='ml_model.name', read_only=True, allow_null=True)
+    is_finished = serializers.BooleanField(read_only=True)
+    
+    class Meta:
+        model = TrainingJob
+        fields = '__all__'
+        read_only_fields = [field.name for field in TrainingJob._meta.fields]
+    
+    def to_representation(self, instance):
+        """Convert UUID to string in JSON response"""
+        representation = super().to_representation(instance)
+        
+        for field in ('id', 'submitted_by', 'ml_model'):
+            if representation.get(field):
+                representation[field] = str(representation[field])
+        
+        return representation
+
 class PredictionLogSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.name', read_only=True, allow_null=True)
     user_email = serializers.CharField(source='user.email', read_only=True, allow_null=True)
@@ -113,6 +136,33 @@ class PredictionLogSerializer(serializers.ModelSerializer):
         
         return representation
 
+class PredictionLogSummarySerializer(serializers.ModelSerializer):
+    """
+    Row of the prediction log listings: who, which role, how confident and
+    when. input_data, prediction_result and flag_details stay in the
+    database; the detail endpoint (PredictionLogSerializer) returns them.
+    Serialize querysets prepared by summary_queryset().
+    """
+    user_id = serializers.UUIDField(read_only=True, allow_null=True)
+    user_name = serializers.CharField(source='user.name', read_only=True, allow_null=True)
+    user_email = serializers.CharField(source='user.email', read_only=True, allow_null=True)
+    model_name = serializers.CharField(source='model_used.name', read_only=True, allow_null=True)
+    job_role = serializers.CharField(read_only=True, allow_null=True)
+    
+    class Meta:
+        model = PredictionLog
+        fields = ('id', 'user_id', 'user_name', 'user_email', 'model_name', 'model_version', 'job_role',
+                  'confidence_score', 'status', 'is_flagged', 'processing_time', 'created_at')
+        read_only_fields = fields
+    
+    @staticmethod
+    def summary_queryset(queryset):
+        """Select only the summary columns (and the role out of prediction_result)"""
+        return (queryset.select_related('user', 'model_used')
+                .only('id', 'user', 'user__name', 'user__email', 'model_used', 'model_used__name',
+                      'model_version', 'confidence_score', 'status', 'is_flagged', 'processing_time', 'created_at')
+                .annotate(job_role=Coalesce(KT('prediction_result__job_role'), KT('prediction_result__top_prediction'))))
+
 class SystemLogSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.name', read_only=True, allow_null=True)
     user_email = serializers.CharField(source='user.email', read_only=True, allow_null=True)
@@ -169,6 +219,17 @@ class UserActivitySerializer(serializers.ModelSerializer):
         
         return representation
 
+class LogArchiveSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LogArchive
+        fields = '__all__'
+        read_only_fields = [field.name for field in LogArchive._meta.fields]
+    
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        representation['id'] = str(representation['id'])
+        return representation
+
 class NotificationSerializer(serializers.ModelSerializer):
     related_user_name = serializers.CharField(source='related_user.name', read_only=True, allow_null=True)
     related_user_email = serializers.CharField(source='related_user.email', read_only=True, allow_null=True)
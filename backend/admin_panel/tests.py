@@ -1,13 +1,44 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.contrib.auth import get_user_model
-from rest_framework.test import APITestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
-from .models import MLModel, TrainingDataset, PredictionLog
+from io import StringIO
+from unittest import mock
+import numpy as np
+import pandas as pd
+from .models import MLModel, TrainingDataset, PredictionLog, SystemLog, TrainingJob, DailyRollup, UserActivity, LogArchive
+from edu2job_backend.caching import TieredCache, response_cache
+from . import audit, retention
+from .audit import AuditWriter
+from predictions.columnar import ColumnarDataset, encode_labels, write_columnar
+from .dataset_profiler import DatasetProfiler, profile_dataset
+from .sample_data import generate_sample_data
+from .retention import archive_source, read_archives
+from .rollups import daily_counts, rebuild_rollups, refresh_rollups, total_count, totals_by_dimension
+from .training_jobs import claim_next_job, run_job, submit_job
+from predictions.ml_service import read_model_generation
 
 User = get_user_model()
 
 class AdminPanelTests(APITestCase):
     def setUp(self):
+        response_cache.clear()
+        
         # Create admin user
         self.admin_user = User.objects.create_user(
             email='admin@test.com',
@@ -41,6 +72,14 @@ class AdminPanelTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('total_users', response.data)
     
+    def test_admin_stats_are_cached(self):
+        """Test the dashboard stats are computed once for repeated requests"""
+        with mock.patch('admin_panel.views.AdminStatsView._calculate_stats', return_value={'total_users': 1}) as calculate:
+            for _ in range(3):
+                response = self.client.get('/api/admin/stats/')
+                self.assertEqual(response.data, {'total_users': 1})
+        calculate.assert_called_once()
+    
     def test_non_admin_stats_access(self):
         """Test non-admin cannot access stats"""
         self.client.force_authenticate(user=self.regular_user)
@@ -55,9 +94,808 @@ class AdminPanelTests(APITestCase):
     
     def test_model_activation(self):
         """Test admin can activate model"""
+        generation = read_model_generation()
         response = self.client.post(f'/api/admin/models/{self.model.id}/activate/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # Verify model is active
         self.model.refresh_from_db()
-        self.assertTrue(self.model.is_active)
\ No newline at end of file
+        self.assertTrue(self.model.is_active)
+        
+        # The served model files are not touched
+        self.assertEqual(read_model_generation(), generation)
+
+
+class TrainingJobTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        self.admin_user = User.objects.create_user(
+            email='trainer@test.com',
+            name='Trainer',
+            password='testpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        
+        rows = ['skill,experience,role'] + [
+            f'{i % 10},{i % 7},{"engineer" if i % 10 > 4 else "analyst"}' for i in range(60)
+        ]
+        self.dataset = TrainingDataset.objects.create(
+            name='Roles',
+            dataset_file=SimpleUploadedFile('roles.csv', '\n'.join(rows).encode()),
+            dataset_type='csv'
+        )
+    
+    def train_payload(self, **overrides):
+        payload = {
+            'dataset_id': str(self.dataset.id),
+            'model_name': 'Queued Model',
+            'model_type': 'random_forest',
+            'target_column': 'role'
+        }
+        payload.update(overrides)
+        return payload
+    
+    def test_train_model_queues_job(self):
+        """Test training is queued (202) instead of running in the request"""
+        response = self.client.post('/api/admin/train-model/', self.train_payload(), format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['job']['status'], 'queued')
+        self.assertFalse(MLModel.objects.filter(name='Queued Model').exists())
+        
+        status_response = self.client.get(response.data['status_url'])
+        self.assertEqual(status_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(status_response.data['id'], response.data['job']['id'])
+    
+    def test_unknown_target_column_is_rejected_up_front(self):
+        """Test the target column is checked before queueing"""
+        response = self.client.post('/api/admin/train-model/', self.train_payload(target_column='salary'), format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TrainingJob.objects.exists())
+    
+    def test_worker_runs_job_and_records_outcome(self):
+        """Test run_training_worker trains the model and stores progress, metrics and logs"""
+        response = self.client.post('/api/admin/train-model/', self.train_payload(), format='json')
+        
+        call_command('run_training_worker', once=True, nice=0, stdout=StringIO())
+        
+        job = TrainingJob.objects.get(id=response.data['job']['id'])
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.progress, 100.0)
+        self.assertIn('accuracy', job.metrics)
+        self.assertIn('Training random_forest', job.logs)
+        self.assertEqual(job.ml_model.name, 'Queued Model')
+        self.assertEqual(job.ml_model.trained_by, self.admin_user)
+    
+    def test_failed_job_records_error(self):
+        """Test a failing job is marked failed with its error and a system log"""
+        submit_job('train_model', self.train_payload(target_column='missing'), user=self.admin_user)
+        
+        job = run_job(claim_next_job('test-worker'))
+        
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('missing', job.error_message)
+        self.assertTrue(SystemLog.objects.filter(level='error', category='model_training').exists())
+    
+    def test_failed_retrain_job_logs_training_error(self):
+        """Test the prediction service's training errors reach the job log"""
+        dataset_path = f'{self.media_root}/empty.csv'
+        open(dataset_path, 'w').close()
+        submit_job('retrain_prediction_model', {'dataset_path': dataset_path}, user=self.admin_user)
+        
+        job = run_job(claim_next_job('test-worker'))
+        
+        self.assertEqual(job.status, 'failed')
+        self.assertIn(f'Training the model on {dataset_path} failed', job.logs)
+        self.assertIn('No columns to parse from file', job.logs)
+    
+    def test_job_is_claimed_once(self):
+        """Test two workers cannot claim the same job"""
+        job = submit_job('train_model', self.train_payload(), user=self.admin_user)
+        
+        self.assertEqual(claim_next_job('worker-a').pk, job.pk)
+        self.assertIsNone(claim_next_job('worker-b'))
+    
+    def test_cancel_queued_job(self):
+        """Test a queued job can be cancelled but a running one cannot"""
+        job = submit_job('train_model', self.train_payload(), user=self.admin_user)
+        
+        response = self.client.post(f'/api/admin/training-jobs/{job.id}/cancel/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['job']['status'], 'cancelled')
+        self.assertIsNone(claim_next_job('test-worker'))
+        
+        running = submit_job('train_model', self.train_payload(), user=self.admin_user)
+        claim_next_job('test-worker')
+        response = self.client.post(f'/api/admin/training-jobs/{running.id}/cancel/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+    
+    def test_training_reads_columnar_copy(self):
+        """Test the profile job writes a columnar copy that training then reads"""
+        submit_job('profile_dataset', {'dataset_id': str(self.dataset.id)})
+        run_job(claim_next_job('test-worker'))
+        self.dataset.refresh_from_db()
+        self.assertEqual(self.dataset.columnar_path, f'datasets/columnar/{self.dataset.id}')
+        self.assertEqual(self.dataset.read_columns(), ['skill', 'experience', 'role'])
+        
+        response = self.client.post('/api/admin/train-model/', self.train_payload(), format='json')
+        job = run_job(claim_next_job('test-worker'))
+        
+        self.assertEqual(str(job.id), response.data['job']['id'])
+        self.assertEqual(job.status, 'succeeded')
+        self.assertIn('(columnar copy)', job.logs)
+
+@override_settings(ROLLUP_SETTLE_SECONDS=0)
+class RollupTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.admin_user = User.objects.create_user(
+            email='rollup-admin@test.com',
+            name='Rollup Admin',
+            password='testpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def make_predictions(self, count, days_ago=0):
+        for _ in range(count):
+            log = PredictionLog.objects.create(
+                user=self.admin_user, input_data={}, prediction_result={},
+                model_version='1.0.0', status='success'
+            )
+            if days_ago:
+                PredictionLog.objects.filter(pk=log.pk).update(
+                    created_at=timezone.now() - timedelta(days=days_ago)
+                )
+
+    def rolled_up(self, metric, dimension=''):
+        return DailyRollup.objects.get(metric=metric, dimension=dimension, date=timezone.localdate()).count
+
+    def test_refresh_only_counts_new_rows(self):
+        """Test each refresh adds only rows created since the watermark"""
+        self.make_predictions(3)
+        self.make_predictions(2, days_ago=3)
+        self.assertEqual(refresh_rollups()['predictions'], 5)
+        self.assertEqual(self.rolled_up('predictions'), 3)
+
+        self.make_predictions(2)
+        self.assertEqual(refresh_rollups()['predictions'], 2)
+        self.assertEqual(refresh_rollups()['predictions'], 0)
+        self.assertEqual(self.rolled_up('predictions'), 5)
+        self.assertEqual(self.rolled_up('activities', 'prediction'), 7)
+
+        counts = daily_counts('predictions', 7)
+        self.assertEqual(counts[-1], {'date': timezone.localdate().isoformat(), 'count': 5})
+        self.assertEqual(counts[-4]['count'], 2)
+
+    def test_readers_include_rows_not_yet_rolled_up(self):
+        """Test rows inside the settle window are counted live"""
+        self.make_predictions(2)
+        refresh_rollups()
+        self.make_predictions(1)
+        with override_settings(ROLLUP_SETTLE_SECONDS=60):
+            refresh_rollups()  # the new row is still settling
+
+        self.assertEqual(self.rolled_up('predictions'), 2)
+        self.assertEqual(daily_counts('predictions', 1)[0]['count'], 3)
+        self.assertEqual(total_count('predictions'), 3)
+        self.assertEqual(totals_by_dimension('activities'), {'registration': 1, 'prediction': 3})
+
+    def test_dashboards_read_constant_number_of_queries(self):
+        """Test chart queries don't grow with the number of days of data"""
+        def chart_queries():
+            # Rows are back-dated after creation, which only a rebuild picks up
+            rebuild_rollups()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/admin/charts/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries), response.data
+
+        self.make_predictions(1)
+        baseline, _ = chart_queries()
+        for days_ago in range(1, 20):
+            self.make_predictions(1, days_ago=days_ago)
+        SystemLog.objects.create(level='error', source='test', message='boom')
+        queries, data = chart_queries()
+
+        self.assertEqual(queries, baseline)
+        self.assertEqual(sum(day['count'] for day in data['prediction_trends']), 20)
+        self.assertEqual(data['activity_by_type'][0], {'activity_type': 'prediction', 'count': 20})
+        self.assertEqual(data['logs_by_level'], [{'level': 'error', 'count': 1}, {'level': 'info', 'count': 1}])
+
+        stats = self.client.get('/api/admin/stats/').data
+        self.assertEqual(stats['total_predictions'], 20)
+        self.assertEqual(stats['predictions_today'], 1)
+        self.assertEqual(stats['user_registrations'][-1]['count'], 1)
+
+    def test_rebuild_command_recounts(self):
+        """Test --rebuild recounts rows already rolled up"""
+        self.make_predictions(2)
+        refresh_rollups()
+        DailyRollup.objects.filter(metric='predictions').update(count=99)
+
+        out = StringIO()
+        call_command('refresh_rollups', '--rebuild', '--metric', 'predictions', stdout=out)
+        self.assertIn('predictions: 2 new row(s)', out.getvalue())
+        self.assertEqual(self.rolled_up('predictions'), 2)
+
+class TieredCacheTests(TestCase):
+    def setUp(self):
+        self.cache = TieredCache(wait_interval=0.01)
+        self.cache.clear()
+
+    def test_fresh_value_is_served_without_recompute(self):
+        """Test a fresh entry is computed once and then served from the cache"""
+        compute = mock.Mock(return_value={'total': 1})
+        self.assertEqual(self.cache.get_or_set('stats', compute, ttl=60), {'total': 1})
+        self.assertEqual(self.cache.get_or_set('stats', compute, ttl=60), {'total': 1})
+        compute.assert_called_once()
+
+        # The local tier answers even when the shared tier lost the entry
+        self.cache.shared.clear()
+        self.assertEqual(self.cache.get_or_set('stats', compute, ttl=60), {'total': 1})
+        compute.assert_called_once()
+
+    def test_concurrent_misses_compute_once(self):
+        """Test a burst of requests on a cold key runs the computation once"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get_or_set('cold', compute, ttl=60)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['value'] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_stale_value_served_while_another_caller_refreshes(self):
+        """Test a stale entry is returned to everyone but the refreshing caller"""
+        self.cache.get_or_set('stale', lambda: 'old', ttl=0, stale_ttl=60)
+
+        # Another worker holds the refresh lock
+        self.assertTrue(self.cache.shared.add('tiered:stale:lock', 'other', timeout=30))
+        compute = mock.Mock(return_value='new')
+        self.assertEqual(self.cache.get_or_set('stale', compute, ttl=60), 'old')
+        compute.assert_not_called()
+
+        self.cache.shared.delete('tiered:stale:lock')
+        self.assertEqual(self.cache.get_or_set('stale', compute, ttl=60), 'new')
+        self.assertEqual(self.cache.get_or_set('stale', compute, ttl=60), 'new')
+        compute.assert_called_once()
+
+    def test_failed_refresh_keeps_stale_value(self):
+        """Test a refresh error serves the stale value and a cold error propagates"""
+        self.cache.get_or_set('flaky', lambda: 'old', ttl=0, stale_ttl=60)
+        failing = mock.Mock(side_effect=RuntimeError('database down'))
+        self.assertEqual(self.cache.get_or_set('flaky', failing, ttl=60), 'old')
+
+        self.cache.invalidate('flaky')
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_set('flaky', failing, ttl=60)
+        self.assertIsNone(self.cache.shared.get('tiered:flaky:lock'))
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            email='export-admin@test.com',
+            name='Export Admin',
+            password='testpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        self.model = MLModel.objects.create(name='Export Model', status='trained')
+        for index in range(5):
+            PredictionLog.objects.create(
+                user=self.admin_user, model_used=self.model, model_version='1.0.0',
+                input_data={'skills': ['Python', 'SQL']}, prediction_result={'job_role': f'Role {index}'},
+                confidence_score=0.5 + index / 10, status='success'
+            )
+        old = PredictionLog.objects.order_by('created_at').first()
+        PredictionLog.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=10))
+
+    def export(self, **params):
+        response = self.client.get('/api/admin/export/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b''.join(response.streaming_content)
+
+    def test_json_export_matches_serializer_output(self):
+        """Test the default export is the same JSON array as before, streamed"""
+        response, body = self.export(type='predictions')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        records = json.loads(body)
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[0]['user_email'], 'export-admin@test.com')
+        self.assertEqual(records[0]['model_name'], 'Export Model')
+
+    def test_csv_export_with_projection_and_date_range(self):
+        """Test CSV output keeps only the requested fields and days"""
+        start = (timezone.localdate() - timedelta(days=1)).isoformat()
+        response, body = self.export(type='predictions', output='csv', fields='id,confidence_score,input_data',
+                                     start_date=start)
+        self.assertIn('predictions_export.csv', response['Content-Disposition'])
+
+        rows = list(csv.reader(io.StringIO(body.decode('utf-8'))))
+        self.assertEqual(rows[0], ['id', 'confidence_score', 'input_data'])
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(json.loads(rows[1][2]), {'skills': ['Python', 'SQL']})
+
+    def test_gzip_ndjson_export(self):
+        """Test NDJSON output compressed on the fly"""
+        response, body = self.export(type='activities', output='ndjson', gzip='true', fields='activity_type')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        lines = gzip.decompress(body).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 6)  # registration + 5 predictions
+        self.assertEqual(json.loads(lines[0]), {'activity_type': 'registration'})
+
+    def test_export_uses_one_query_regardless_of_rows(self):
+        """Test related rows are joined rather than fetched per record"""
+        response = self.client.get('/api/admin/export/', {'type': 'predictions', 'output': 'ndjson'})
+        with self.assertNumQueries(1):
+            body = b''.join(response.streaming_content)
+        self.assertEqual(len(body.splitlines()), 5)
+
+    def test_invalid_parameters_are_rejected(self):
+        """Test unknown types, formats, fields and dates return 400"""
+        for params in ({'type': 'secrets'}, {'output': 'xml'}, {'fields': 'id,password'},
+                       {'start_date': 'yesterday'}):
+            response = self.client.get('/api/admin/export/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+class DatasetProfilerTests(TestCase):
+    def make_frame(self, rows=1000):
+        rng = np.random.RandomState(7)
+        df = pd.DataFrame({
+            'age': rng.randint(20, 60, rows),
+            'score': rng.normal(70, 10, rows),
+            'role': rng.choice(['analyst', 'engineer'], rows),
+        })
+        df.loc[::17, 'score'] = np.nan
+        # Integers only in the first rows, text further down
+        df['code'] = ['1'] * (rows // 2) + ['x'] * (rows - rows // 2)
+        return df
+
+    def write_csv(self, df):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = f'{directory}/data.csv'
+        df.to_csv(path, index=False)
+        return path
+
+    def test_chunked_profile_matches_pandas(self):
+        """Test a profile built 97 rows at a time matches a full pandas read"""
+        path = self.write_csv(self.make_frame())
+        progress = []
+        profiler = profile_dataset(path, 'csv', chunk_rows=97, progress=lambda fraction, rows: progress.append(fraction))
+        report = profiler.report()
+
+        full = pd.read_csv(path)
+        self.assertEqual(profiler.rows, len(full))
+        self.assertEqual(report['missing_values'], full.isnull().sum().to_dict())
+        self.assertEqual(report['data_types'], full.dtypes.astype(str).to_dict())
+        expected = full.describe().to_dict()
+        self.assertEqual(set(report['basic_stats']), set(expected))
+        for column, stats in expected.items():
+            for name, value in stats.items():
+                self.assertAlmostEqual(report['basic_stats'][column][name], value, places=6, msg=f'{column} {name}')
+
+        self.assertEqual(len(progress), 11)
+        self.assertEqual(progress[-1], 1.0)
+        self.assertTrue(report['profile']['exact_quantiles'])
+
+    def test_profiles_merge_and_sample_stays_bounded(self):
+        """Test merged partial profiles equal one profile and quantiles use a bounded sample"""
+        values = pd.DataFrame({'x': np.random.RandomState(1).exponential(5, 20000)})
+        whole = DatasetProfiler(sample_size=500)
+        whole.update(values)
+        first, second = DatasetProfiler(sample_size=500), DatasetProfiler(sample_size=500)
+        first.update(values.iloc[:7000])
+        second.update(values.iloc[7000:])
+        first.merge(second)
+
+        merged = first.report()['basic_stats']['x']
+        for name in ('count', 'mean', 'std', 'min', 'max'):
+            self.assertAlmostEqual(merged[name], whole.report()['basic_stats']['x'][name], places=6)
+        self.assertEqual(len(first.columns['x'].numeric._sample_values), 500)
+        self.assertFalse(first.report()['profile']['exact_quantiles'])
+        self.assertAlmostEqual(merged['50%'], values['x'].median(), delta=0.5)
+
+    def test_upload_profiles_in_background(self):
+        """Test uploading returns at once and the worker fills in the profile"""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        admin_user = User.objects.create_user(
+            email='profiler@test.com', name='Profiler', password='testpass123', role='admin'
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        content = self.make_frame(300).to_csv(index=False).encode()
+
+        with override_settings(MEDIA_ROOT=media_root, DATASET_PROFILE_CHUNK_ROWS=100):
+            response = client.post('/api/admin/datasets/', {
+                'name': 'Profiles', 'dataset_file': SimpleUploadedFile('profiles.csv', content)
+            }, format='multipart')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data['profile_status'], 'pending')
+            self.assertEqual(response.data['profile_job']['job_type'], 'profile_dataset')
+
+            job = run_job(claim_next_job('test-worker'))
+
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.metrics['chunks'], 3)
+        dataset = TrainingDataset.objects.get(id=response.data['id'])
+        self.assertEqual(dataset.profile_status, 'completed')
+        self.assertEqual(dataset.profile_progress, 100.0)
+        self.assertEqual(dataset.row_count, 300)
+        self.assertEqual(dataset.column_names, ['age', 'score', 'role', 'code'])
+        self.assertTrue(dataset.is_validated)
+        self.assertEqual(dataset.validation_report['missing_values']['score'], 18)
+
+
+class ColumnarDatasetTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        rng = np.random.RandomState(3)
+        rows = 500
+        self.frame = pd.DataFrame({
+            'age': rng.randint(20, 60, rows),
+            'score': rng.normal(70, 10, rows),
+            'role': rng.choice(['engineer', 'analyst', 'manager'], rows),
+            'remote': rng.choice([True, False], rows),
+        })
+        self.frame.loc[::13, 'score'] = np.nan
+        self.csv_path = f'{self.directory}/data.csv'
+        self.frame.to_csv(self.csv_path, index=False)
+    
+    def convert(self, chunk_rows=97):
+        profiler = profile_dataset(self.csv_path, 'csv', chunk_rows=chunk_rows)
+        path = f'{self.directory}/columnar'
+        write_columnar(self.csv_path, path, {name: column.final_dtype for name, column in profiler.columns.items()},
+                       profiler.rows, chunk_rows=chunk_rows)
+        return ColumnarDataset(path)
+    
+    def test_round_trip_matches_csv_read(self):
+        """Test a columnar copy written in chunks reads back like the CSV, with sorted codes"""
+        dataset = self.convert()
+        frame = dataset.to_frame()
+        expected = pd.read_csv(self.csv_path)
+        
+        self.assertEqual(dataset.rows, 500)
+        self.assertEqual(str(frame['age'].dtype), 'int64')
+        self.assertEqual(str(frame['remote'].dtype), 'bool')
+        self.assertEqual(str(frame['role'].dtype), 'category')
+        pd.testing.assert_frame_equal(frame.astype({'role': object}), expected)
+        
+        # Dictionary codes equal LabelEncoder's, so training can use them directly
+        codes, encoder = encode_labels(frame['role'])
+        expected_codes, expected_encoder = encode_labels(expected['role'])
+        np.testing.assert_array_equal(codes, expected_codes)
+        self.assertEqual(list(encoder.classes_), list(expected_encoder.classes_))
+    
+    def test_projection_and_chunked_profile(self):
+        """Test projected reads and profiling from the columnar copy"""
+        dataset = self.convert()
+        
+        projected = dataset.to_frame(['score', 'role'])
+        self.assertEqual(list(projected.columns), ['score', 'role'])
+        with self.assertRaises(ValueError):
+            dataset.to_frame(['salary'])
+        
+        report = profile_dataset(dataset.directory, 'columnar', chunk_rows=64, columns=['age', 'score']).report()
+        csv_report = profile_dataset(self.csv_path, 'csv', chunk_rows=64, columns=['age', 'score']).report()
+        self.assertEqual(report['missing_values'], {'age': 0, 'score': 39})
+        self.assertEqual(report['basic_stats'], csv_report['basic_stats'])
+
+
+class SampleDataTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+    
+    def test_bulk_generation_is_batched_and_back_dated(self):
+        """Test predictions and their activity rows are bulk inserted with spread dates"""
+        with CaptureQueriesContext(connection) as queries:
+            counts = generate_sample_data(predictions=300, users=3, days=10, system_logs=4,
+                                          notifications=2, batch_size=100, seed=1)
+        
+        self.assertEqual(counts['predictions'], 300)
+        self.assertEqual(PredictionLog.objects.count(), 300)
+        self.assertEqual(UserActivity.objects.filter(activity_type='prediction').count(), 300)
+        failed = PredictionLog.objects.filter(status='failed').count()
+        self.assertEqual(SystemLog.objects.filter(category='prediction', level='warning',
+                                                  message__startswith='Prediction failed').count(), failed)
+        self.assertEqual(counts['system_logs'], failed + 4)
+        
+        # One multi-row INSERT per batch rather than one per row
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "admin_panel_predictionlog"')]
+        self.assertLess(len(inserts), 20)
+        
+        oldest = PredictionLog.objects.order_by('created_at').first()
+        self.assertLess(oldest.created_at, timezone.now() - timedelta(days=2))
+        activity = UserActivity.objects.get(metadata__status=oldest.status, created_at=oldest.created_at)
+        self.assertEqual(activity.user_id, oldest.user_id)
+        # Rollups are rebuilt, so the back-dated rows show up on the dashboards
+        self.assertEqual(sum(day['count'] for day in daily_counts('predictions', 12)), 300)
+    
+    def test_signal_mode_writes_the_same_rows(self):
+        """Test activities='signals' runs log_prediction_activity and 'none' skips it"""
+        generate_sample_data(predictions=40, users=2, activities='signals', seed=2)
+        self.assertEqual(UserActivity.objects.filter(activity_type='prediction').count(), 40)
+        
+        generate_sample_data(predictions=10, users=2, activities='none', seed=3)
+        self.assertEqual(PredictionLog.objects.count(), 50)
+        self.assertEqual(UserActivity.objects.filter(activity_type='prediction').count(), 40)
+        self.assertEqual(User.objects.filter(email__endswith='@example.com').count(), 2)
+    
+    def test_generate_sample_data_endpoints(self):
+        """Test both sample data endpoints use the generator and validate their options"""
+        admin_user = User.objects.create_user(
+            email='sampler@test.com', name='Sampler', password='testpass123', role='admin'
+        )
+        self.client.force_authenticate(user=admin_user)
+        
+        response = self.client.post('/api/admin/generate-sample-data/', {'predictions': 25, 'days': 5}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['predictions_created'], 25)
+        self.assertEqual(response.data['data']['activities_created'], 25)
+        
+        response = self.client.post('/api/admin/predictions/generate_sample_data/', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_predictions'], 45)
+        
+        with override_settings(SAMPLE_DATA_MAX_PREDICTIONS=100):
+            response = self.client.post('/api/admin/generate-sample-data/', {'predictions': 101}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post('/api/admin/generate-sample-data/', {'activities': 'later'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AuditWriterTests(TransactionTestCase):
+    def make_log(self, message):
+        return SystemLog(level='info', category='system', source='audit_test', message=message)
+    
+    def test_rows_are_written_in_batches_after_commit(self):
+        """Test queued rows are bulk inserted in batches, keep their time and skip rolled-back work"""
+        writer = AuditWriter(mode='async', batch_size=3, flush_interval=0.05)
+        self.addCleanup(writer.shutdown)
+        batches = []
+        real_insert = audit.bulk_insert
+        
+        def recording_insert(model, objs, batch_size):
+            batches.append(len(objs))
+            real_insert(model, objs, batch_size)
+        
+        with mock.patch.object(audit, 'bulk_insert', recording_insert):
+            for i in range(7):
+                writer.record(self.make_log(f'event {i}'))
+            recorded_before = timezone.now()
+            try:
+                with transaction.atomic():
+                    writer.record(self.make_log('rolled back'))
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            writer.flush()
+        
+        self.assertEqual(SystemLog.objects.filter(source='audit_test').count(), 7)
+        self.assertFalse(SystemLog.objects.filter(message='rolled back').exists())
+        self.assertTrue(all(size <= 3 for size in batches))
+        self.assertLess(len(batches), 7)
+        self.assertFalse(SystemLog.objects.filter(created_at__gt=recorded_before).exists())
+        self.assertEqual(writer.stats()['written'], 7)
+    
+    def test_full_queue_drops_and_shutdown_drains(self):
+        """Test the 'drop' policy bounds the queue and shutdown writes what is left"""
+        writer = AuditWriter(mode='async', max_queue=2, batch_size=1, flush_interval=0, overflow='drop')
+        writing, release = threading.Event(), threading.Event()
+        real_insert = audit.bulk_insert
+        
+        def slow_insert(model, objs, batch_size):
+            writing.set()
+            release.wait(5)
+            real_insert(model, objs, batch_size)
+        
+        with mock.patch.object(audit, 'bulk_insert', slow_insert):
+            writer.record(self.make_log('first'))
+            self.assertTrue(writing.wait(5))
+            for i in range(3):
+                writer.record(self.make_log(f'queued {i}'))
+            release.set()
+            writer.shutdown()
+        
+        self.assertEqual(SystemLog.objects.filter(source='audit_test').count(), 3)
+        self.assertEqual(writer.stats()['dropped'], 1)
+        
+        # After shutdown rows are saved inline
+        writer.record(self.make_log('late'))
+        self.assertTrue(SystemLog.objects.filter(message='late').exists())
+    
+    def test_shared_writer_follows_settings(self):
+        """Test the shared writer takes its mode from settings (sync under the test runner)"""
+        self.assertEqual(audit.audit_writer.mode, 'sync')
+        with override_settings(AUDIT_WRITER_MODE='async'):
+            self.assertEqual(audit.audit_writer.mode, 'async')
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        admin_user = User.objects.create_user(
+            email='pager@test.com', name='Pager', password='testpass123', role='admin'
+        )
+        self.client.force_authenticate(user=admin_user)
+        SystemLog.objects.all().delete()
+        now = timezone.now()
+        for i in range(25):
+            log = SystemLog.objects.create(level='error' if i % 3 == 0 else 'info', category='system',
+                                           source='pager', message=f'log {i}')
+            # Groups of five share a timestamp, so pages must break ties on id
+            SystemLog.objects.filter(pk=log.pk).update(created_at=now - timedelta(minutes=i // 5))
+        self.expected = [str(pk) for pk in SystemLog.objects.order_by('-created_at', '-id').values_list('id', flat=True)]
+    
+    def walk(self, url):
+        pages = []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertFalse(any('COUNT(' in q['sql'] for q in queries.captured_queries))
+            pages.append(response.data)
+            url = response.data['next']
+        return pages
+    
+    def test_pages_follow_created_at_and_id(self):
+        """Test next links walk every row once, newest first, and previous links walk back"""
+        pages = self.walk('/api/admin/system-logs/?page_size=10')
+        
+        self.assertEqual([len(page['results']) for page in pages], [10, 10, 5])
+        self.assertEqual([row['id'] for page in pages for row in page['results']], self.expected)
+        self.assertIsNone(pages[0]['previous'])
+        
+        back = self.client.get(pages[2]['previous']).data
+        self.assertEqual(back['results'], pages[1]['results'])
+        first = self.client.get(back['previous']).data
+        self.assertEqual(first['results'], pages[0]['results'])
+        self.assertIsNone(first['previous'])
+    
+    def test_filters_and_invalid_cursor(self):
+        """Test keyset pages combine with the listing filters and reject bad cursors"""
+        pages = self.walk('/api/admin/system-logs/?level=error&page_size=4')
+        errors = [row['id'] for page in pages for row in page['results']]
+        self.assertEqual(errors, [pk for pk in self.expected if SystemLog.objects.get(pk=pk).level == 'error'])
+        
+        response = self.client.get('/api/admin/system-logs/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(ROLLUP_SETTLE_SECONDS=0)
+class RetentionTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        self.admin_user = User.objects.create_user(
+            email='retention@test.com', name='Retention', password='testpass123', role='admin'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def make_logs(self, count, days_ago, level='info'):
+        logs = []
+        for i in range(count):
+            log = SystemLog.objects.create(level=level, category='system', source='retention', message=f'log {i}')
+            SystemLog.objects.filter(pk=log.pk).update(created_at=timezone.now() - timedelta(days=days_ago, minutes=i))
+            logs.append(str(log.pk))
+        return logs
+    
+    def test_old_rows_move_to_archives(self):
+        """Test old logs are archived per day, deleted, still counted and readable"""
+        errors = self.make_logs(2, days_ago=100, level='error')
+        self.make_logs(2, days_ago=100)
+        self.make_logs(3, days_ago=120)
+        recent = self.make_logs(2, days_ago=10)
+        totals = totals_by_dimension('logs')
+        
+        archives = archive_source('system_logs', batch_size=2)
+        
+        self.assertEqual([archive.row_count for archive in archives], [3, 4])
+        for archive in archives:
+            self.assertEqual(archive.status, 'complete')
+            self.assertEqual(archive.deleted_rows, archive.row_count)
+            with open(f'{self.media_root}/{archive.path}', 'rb') as handle:
+                self.assertEqual(len(gzip.decompress(handle.read()).splitlines()), archive.row_count)
+        self.assertFalse(SystemLog.objects.filter(source='retention').exclude(pk__in=recent).exists())
+        self.assertEqual(totals_by_dimension('logs'), totals)
+        self.assertEqual(archive_source('system_logs'), [])
+        
+        archived_errors = list(read_archives('system_logs', level='error'))
+        self.assertEqual(sorted(row['id'] for row in archived_errors), sorted(errors))
+        day = archives[0].first_created_at
+        self.assertEqual(len(list(read_archives('system_logs', start=day, end=day + timedelta(hours=1)))), 3)
+        
+        response = self.client.get('/api/admin/archives/rows/?source=system_logs&level=error&limit=1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertTrue(response.data['truncated'])
+        self.assertEqual(self.client.get('/api/admin/archives/?source=system_logs').status_code, status.HTTP_200_OK)
+    
+    def test_interrupted_deletes_are_finished(self):
+        """Test an archive whose deletes failed part way is completed by the next run"""
+        self.make_logs(5, days_ago=100)
+        real_delete = retention._delete_batch
+        calls = []
+        
+        def fail_second_batch(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError('database went away')
+            return real_delete(*args)
+        
+        with mock.patch.object(retention, '_delete_batch', side_effect=fail_second_batch):
+            with self.assertRaises(RuntimeError):
+                archive_source('system_logs', batch_size=2)
+        
+        archive = LogArchive.objects.get()
+        self.assertEqual((archive.status, archive.deleted_rows), ('deleting', 2))
+        self.assertEqual(SystemLog.objects.filter(source='retention').count(), 3)
+        
+        self.assertEqual(archive_source('system_logs', batch_size=2), [])
+        archive.refresh_from_db()
+        self.assertEqual((archive.status, archive.deleted_rows, archive.row_count), ('complete', 5, 5))
+        self.assertFalse(SystemLog.objects.filter(source='retention').exists())
+
+
+class PredictionLogListingTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.admin_user = User.objects.create_user(
+            email='listing-admin@test.com', name='Listing Admin', password='testpass123', role='admin'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        model = MLModel.objects.create(name='Listing Model', status='trained')
+        for index in range(6):
+            PredictionLog.objects.create(
+                user=self.admin_user, model_used=model, model_version='1.0.0',
+                input_data={f'skill_{n}': n for n in range(80)},
+                prediction_result={'job_role': f'Role {index}', 'top_skills': ['Python'] * 20},
+                confidence_score=0.7, status='success'
+            )
+    
+    def test_list_sends_summaries_from_projected_query(self):
+        """Test the listing skips the JSON columns and still names the role"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/admin/predictions/?page_size=4')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"input_data"', queries[0]['sql'])
+        
+        row = response.data['results'][0]
+        self.assertEqual(row['job_role'], 'Role 5')
+        self.assertEqual((row['user_email'], row['model_name']), ('listing-admin@test.com', 'Listing Model'))
+        self.assertNotIn('input_data', row)
+        
+        detail = self.client.get(f"/api/admin/predictions/{row['id']}/")
+        self.assertEqual(detail.data['prediction_result']['job_role'], 'Role 5')
+        self.assertEqual(len(detail.data['input_data']), 80)
+    
+    def test_dashboard_recent_predictions_are_summaries(self):
+        """Test the stats endpoint embeds the same summary rows"""
+        recent = self.client.get('/api/admin/stats/').data['recent_predictions']
+        self.assertEqual(len(recent), 6)
+        self.assertEqual(recent[0]['job_role'], 'Role 5')
+        self.assertNotIn('prediction_result', recent[0])
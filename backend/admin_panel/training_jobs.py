@@ -0,0 +1,493 @@
+"""
+Background model training (and other long admin jobs such as dataset profiling).
+
+Training used to run inside the HTTP request (TrainModelView and the
+predictions RetrainModelView), holding a gunicorn worker for minutes while the
+forest used every core of the host. The views now only queue a TrainingJob;
+a separate process started with
+
+    python manage.py run_training_worker
+
+claims queued jobs one at a time, runs them with at most
+settings.TRAINING_MAX_THREADS threads, and records progress, metrics and logs
+on the job row for the status endpoints to report.
+
+Jobs are claimed with a conditional UPDATE (queued -> running), so several
+workers can share the queue without running a job twice.
+"""
+import contextlib
+import io
+import logging
+import os
+import socket
+import time
+import traceback
+
+import joblib
+import pandas as pd
+from django.conf import settings
+from django.utils import timezone
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+from threadpoolctl import threadpool_limits
+
+from predictions.columnar import encode_labels, is_columnar, write_columnar
+from predictions.ml_service import JobPredictionService
+from predictions.models import MLModelVersion
+from predictions.serializers import MLModelVersionSerializer
+from .dataset_profiler import profile_dataset
+from .models import MLModel, SystemLog, TrainingDataset, TrainingJob
+
+logger = logging.getLogger(__name__)
+
+# Keep the tail of very chatty jobs rather than growing the row without bound
+MAX_LOG_CHARS = 200000
+
+
+class TrainingJobError(Exception):
+    """A job failure whose message is shown to the admin as-is"""
+
+
+def get_worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def training_n_jobs():
+    """Cores a training job may use (the n_jobs passed to estimators)"""
+    return getattr(settings, 'TRAINING_MAX_THREADS', 1)
+
+
+class JobReporter:
+    """Writes progress and log lines to a running job's row"""
+
+    def __init__(self, job):
+        self.job = job
+
+    def progress(self, percent, stage=None):
+        self.job.progress = round(float(percent), 1)
+        self.job.heartbeat_at = timezone.now()
+        fields = {'progress': self.job.progress, 'heartbeat_at': self.job.heartbeat_at}
+        if stage is not None:
+            self.job.stage = fields['stage'] = stage
+        TrainingJob.objects.filter(pk=self.job.pk).update(**fields)
+
+    def log(self, message):
+        line = f"[{timezone.now().strftime('%H:%M:%S')}] {message}\n"
+        self.job.logs = (self.job.logs + line)[-MAX_LOG_CHARS:]
+        self.job.heartbeat_at = timezone.now()
+        TrainingJob.objects.filter(pk=self.job.pk).update(logs=self.job.logs, heartbeat_at=self.job.heartbeat_at)
+
+
+class _LogStream(io.TextIOBase):
+    """File-like object that forwards complete lines to a JobReporter"""
+
+    def __init__(self, reporter):
+        self.reporter = reporter
+        self._buffer = ''
+
+    def write(self, text):
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            if line.strip():
+                self.reporter.log(line.rstrip())
+        return len(text)
+
+    def flush(self):
+        if self._buffer.strip():
+            self.reporter.log(self._buffer.rstrip())
+        self._buffer = ''
+
+
+class _LogHandler(logging.Handler):
+    """Logging handler that forwards records to a JobReporter"""
+
+    def __init__(self, reporter):
+        super().__init__()
+        self.reporter = reporter
+        self.setFormatter(logging.Formatter('%(levelname)s %(name)s: %(message)s'))
+
+    def emit(self, record):
+        try:
+            self.reporter.log(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+def submit_job(job_type, params, user=None):
+    """Queue a training job; run_training_worker picks it up"""
+    return TrainingJob.objects.create(job_type=job_type, params=params, submitted_by=user)
+
+
+def cancel_job(job):
+    """Cancel a job that has not started yet. Returns True if it was cancelled."""
+    cancelled = TrainingJob.objects.filter(pk=job.pk, status='queued').update(
+        status='cancelled', stage='cancelled', finished_at=timezone.now()
+    )
+    return bool(cancelled)
+
+
+def claim_next_job(worker=None):
+    """Mark the oldest queued job as running for this worker and return it (None if idle)"""
+    worker = worker or get_worker_name()
+    candidates = TrainingJob.objects.filter(status='queued').order_by('created_at').values_list('id', flat=True)[:10]
+    for job_id in candidates:
+        now = timezone.now()
+        claimed = TrainingJob.objects.filter(pk=job_id, status='queued').update(
+            status='running', stage='starting', worker=worker, started_at=now, heartbeat_at=now
+        )
+        if claimed:
+            return TrainingJob.objects.get(pk=job_id)
+    return None
+
+
+def fail_stale_jobs(older_than):
+    """Fail running jobs whose worker has not reported for ``older_than`` (a timedelta)"""
+    return TrainingJob.objects.filter(
+        status='running', heartbeat_at__lt=timezone.now() - older_than
+    ).update(
+        status='failed', stage='failed', finished_at=timezone.now(),
+        error_message='Training worker stopped responding'
+    )
+
+
+def run_job(job):
+    """Run a claimed job to completion and record the outcome on its row"""
+    reporter = JobReporter(job)
+    handler = JOB_HANDLERS.get(job.job_type)
+    start_time = time.perf_counter()
+    reporter.log(f'Started on {job.worker or get_worker_name()} with {training_n_jobs()} thread(s)')
+
+    try:
+        if handler is None:
+            raise TrainingJobError(f'Unknown job type: {job.job_type}')
+
+        # Training libraries print progress and the prediction service logs
+        # it; keep both in the job log
+        stream = _LogStream(reporter)
+        log_handler = _LogHandler(reporter)
+        prediction_logger = logging.getLogger('predictions')
+        prediction_logger.addHandler(log_handler)
+        try:
+            with threadpool_limits(limits=training_n_jobs()), contextlib.redirect_stdout(stream):
+                outcome = handler(job, reporter)
+        finally:
+            prediction_logger.removeHandler(log_handler)
+            stream.flush()
+    except Exception as e:
+        if isinstance(e, TrainingJobError):
+            logger.warning('Training job %s failed: %s', job.pk, e)
+        else:
+            logger.exception('Training job %s failed', job.pk)
+            reporter.log(traceback.format_exc())
+        job.status = 'failed'
+        job.stage = 'failed'
+        job.error_message = str(e)
+
+        SystemLog.objects.create(
+            level='error',
+            category='model_training',
+            source='training_worker',
+            message=f'{job.get_job_type_display()} job failed: {str(e)}',
+            user=job.submitted_by,
+            details={'job_id': str(job.pk), 'job_type': job.job_type, 'error': str(e)}
+        )
+    else:
+        job.status = 'succeeded'
+        job.stage = 'finished'
+        job.progress = 100.0
+        job.metrics = outcome.get('metrics', {})
+        job.result = outcome.get('result', {})
+        job.ml_model = outcome.get('ml_model')
+
+    job.metrics['duration_seconds'] = round(time.perf_counter() - start_time, 3)
+    job.finished_at = timezone.now()
+    job.heartbeat_at = job.finished_at
+    job.save(update_fields=[
+        'status', 'stage', 'progress', 'metrics', 'result', 'ml_model',
+        'error_message', 'finished_at', 'heartbeat_at'
+    ])
+    reporter.log(f'Finished with status {job.status}')
+    return job
+
+
+def train_admin_model(job, reporter):
+    """Train an MLModel from an uploaded TrainingDataset (admin 'Train Model')"""
+    params = job.params
+
+    reporter.progress(5, 'loading dataset')
+    try:
+        dataset = TrainingDataset.objects.get(id=params['dataset_id'])
+    except TrainingDataset.DoesNotExist:
+        raise TrainingJobError('Training dataset no longer exists')
+    if dataset.dataset_type != 'csv':
+        raise TrainingJobError('Only CSV files are supported for training')
+
+    df = dataset.load_frame()
+    source = 'columnar copy' if is_columnar(dataset.columnar_directory) else 'CSV'
+    reporter.log(f'Loaded {len(df)} rows x {len(df.columns)} columns from "{dataset.name}" ({source})')
+
+    # Prepare data
+    target_column = params['target_column']
+    if target_column not in df.columns:
+        raise TrainingJobError(f'Target column "{target_column}" not found in dataset')
+
+    reporter.progress(15, 'preparing features')
+    X = df.drop(columns=[target_column])
+    y = df[target_column]
+    if isinstance(y.dtype, pd.CategoricalDtype):
+        y = y.astype(object)
+
+    # Handle categorical variables (dictionary-encoded columns keep their codes)
+    categorical_cols = X.select_dtypes(include=['object', 'category']).columns
+    label_encoders = {}
+    for col in categorical_cols:
+        X[col], label_encoders[col] = encode_labels(X[col])
+
+    # Split data
+    test_size = params.get('test_size', 0.2)
+    random_state = params.get('random_state', 42)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state
+    )
+
+    # Scale features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    # Train model based on selected type
+    model_type = params.get('model_type', 'random_forest')
+    if model_type == 'random_forest':
+        model = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=training_n_jobs())
+    elif model_type == 'decision_tree':
+        model = DecisionTreeClassifier(random_state=42)
+    elif model_type == 'svm':
+        model = SVC(probability=True, random_state=42)
+    elif model_type == 'gradient_boosting':
+        model = GradientBoostingClassifier(random_state=42)
+    else:
+        raise TrainingJobError(f'Unsupported model type: {model_type}')
+
+    reporter.progress(25, 'training')
+    reporter.log(f'Training {model_type} on {len(X_train)} rows')
+    start_time = time.time()
+    model.fit(X_train_scaled, y_train)
+    training_time = time.time() - start_time
+
+    # Calculate metrics
+    reporter.progress(85, 'evaluating')
+    y_pred = model.predict(X_test_scaled)
+    metrics = {
+        'accuracy': accuracy_score(y_test, y_pred),
+        'precision': precision_score(y_test, y_pred, average='weighted', zero_division=0),
+        'recall': recall_score(y_test, y_pred, average='weighted', zero_division=0),
+        'f1_score': f1_score(y_test, y_pred, average='weighted', zero_division=0),
+        'training_time': training_time,
+    }
+    metrics = {name: float(value) for name, value in metrics.items()}
+    reporter.log(f"Accuracy {metrics['accuracy']:.4f}, F1 {metrics['f1_score']:.4f}")
+
+    # Create new model record
+    reporter.progress(95, 'saving model')
+    ml_model = MLModel.objects.create(
+        name=params['model_name'],
+        version='1.0.0',
+        model_type=model_type,
+        description=params.get('description', ''),
+        accuracy=metrics['accuracy'],
+        precision=metrics['precision'],
+        recall=metrics['recall'],
+        f1_score=metrics['f1_score'],
+        training_time=training_time,
+        test_size=test_size,
+        random_state=random_state,
+        features_used=list(X.columns),
+        target_column=target_column,
+        trained_by=job.submitted_by,
+        training_dataset=dataset,
+        status='trained'
+    )
+
+    # Save model and scaler
+    models_dir = os.path.join(settings.MEDIA_ROOT, 'models')
+    scalers_dir = os.path.join(settings.MEDIA_ROOT, 'scalers')
+    encoders_dir = os.path.join(settings.MEDIA_ROOT, 'encoders')
+
+    os.makedirs(models_dir, exist_ok=True)
+    os.makedirs(scalers_dir, exist_ok=True)
+    os.makedirs(encoders_dir, exist_ok=True)
+
+    joblib.dump(model, os.path.join(models_dir, f'model_{ml_model.id}.joblib'))
+    joblib.dump(scaler, os.path.join(scalers_dir, f'scaler_{ml_model.id}.joblib'))
+
+    # Save label encoders if any
+    if label_encoders:
+        joblib.dump(label_encoders, os.path.join(encoders_dir, f'encoder_{ml_model.id}.joblib'))
+        ml_model.encoder_file.name = f'encoders/encoder_{ml_model.id}.joblib'
+
+    ml_model.model_file.name = f'models/model_{ml_model.id}.joblib'
+    ml_model.scaler_file.name = f'scalers/scaler_{ml_model.id}.joblib'
+    ml_model.save()
+
+    # Log successful training
+    SystemLog.objects.create(
+        level='info',
+        category='model_training',
+        source='admin_panel',
+        message=f'Model "{ml_model.name}" trained successfully',
+        user=job.submitted_by,
+        details={
+            'model_id': str(ml_model.id),
+            'job_id': str(job.pk),
+            'accuracy': metrics['accuracy'],
+            'training_time': training_time,
+            'features_used': len(ml_model.features_used)
+        }
+    )
+
+    return {
+        'metrics': metrics,
+        'result': {'model_id': str(ml_model.id), 'model_name': ml_model.name},
+        'ml_model': ml_model,
+    }
+
+
+def retrain_prediction_model(job, reporter):
+    """Retrain the job prediction model; serving workers hot-swap to it when saved"""
+    params = job.params
+
+    reporter.progress(5, 'training')
+    predictor = JobPredictionService(auto_load=False)
+    result = predictor.retrain_model(
+        dataset_path=params.get('dataset_path'),
+        n_estimators=params.get('n_estimators', 200),
+        max_depth=params.get('max_depth', 20)
+    )
+
+    # train_model logs failures instead of raising (run_job copies them to the job log)
+    if not result.get('success') or not predictor.model_loaded:
+        raise TrainingJobError(result.get('error') or 'Model retraining failed; see the job log')
+
+    # Save model version to database
+    reporter.progress(95, 'recording model version')
+    model_version = MLModelVersion.objects.create(
+        version=f"v{timezone.now().strftime('%Y%m%d_%H%M%S')}",
+        accuracy_score=result['accuracy'],
+        trained_on=timezone.now(),
+        features_used=result.get('features_used', []),
+        total_samples=result.get('total_samples', 0),
+        model_path=result.get('model_path', ''),
+        is_active=True,
+        notes=params.get('notes', '')
+    )
+
+    return {
+        'metrics': {
+            'accuracy': float(result['accuracy']),
+            'total_samples': result.get('total_samples'),
+            'features_used': len(result.get('features_used', [])),
+        },
+        'result': {'model_version': MLModelVersionSerializer(model_version).data},
+    }
+
+
+def profile_uploaded_dataset(job, reporter):
+    """
+    Profile an uploaded TrainingDataset in chunks, reporting progress on the
+    dataset, and write the columnar copy training reads (CSV uploads).
+
+    A dataset that already has a columnar copy is profiled from it.
+    """
+    try:
+        dataset = TrainingDataset.objects.get(id=job.params['dataset_id'])
+    except TrainingDataset.DoesNotExist:
+        raise TrainingJobError('Training dataset no longer exists')
+
+    datasets = TrainingDataset.objects.filter(pk=dataset.pk)
+    datasets.update(profile_status='running', profile_progress=0.0)
+    reporter.progress(0, 'profiling')
+
+    chunk_rows = getattr(settings, 'DATASET_PROFILE_CHUNK_ROWS', 50000)
+    from_columnar = is_columnar(dataset.columnar_directory)
+    convert = dataset.dataset_type == 'csv' and not from_columnar
+    # Profiling and conversion each take about half of a CSV job
+    profile_share = 50 if convert else 100
+
+    def report_progress(fraction, rows):
+        percent = round(fraction * profile_share, 1)
+        reporter.progress(percent, f'profiled {rows} rows')
+        datasets.update(profile_progress=percent)
+
+    try:
+        if from_columnar:
+            profiler = profile_dataset(dataset.columnar_directory, 'columnar',
+                                       chunk_rows=chunk_rows, progress=report_progress)
+        else:
+            profiler = profile_dataset(dataset.dataset_file.path, dataset.dataset_type,
+                                       chunk_rows=chunk_rows, progress=report_progress)
+    except Exception as e:
+        datasets.update(profile_status='failed', validation_report={'error': str(e)})
+        raise TrainingJobError(f'Could not profile dataset: {str(e)}')
+
+    columnar_path = dataset.columnar_path if from_columnar else ''
+    if convert:
+        columnar_path = _convert_to_columnar(dataset, profiler, chunk_rows, reporter, datasets)
+
+    report = profiler.report()
+    datasets.update(
+        columnar_path=columnar_path,
+        row_count=profiler.rows,
+        column_count=len(profiler.columns),
+        column_names=[str(name) for name in profiler.columns],
+        validation_report=report,
+        is_validated=True,
+        profile_status='completed',
+        profile_progress=100.0,
+        profiled_at=timezone.now()
+    )
+    reporter.log(f'Profiled {profiler.rows} rows x {len(profiler.columns)} columns in {profiler.chunks} chunk(s)')
+
+    return {
+        'metrics': {'rows': profiler.rows, 'columns': len(profiler.columns), 'chunks': profiler.chunks},
+        'result': {'dataset_id': str(dataset.pk)},
+    }
+
+
+def _convert_to_columnar(dataset, profiler, chunk_rows, reporter, datasets):
+    """Write the columnar copy with the profiled dtypes; '' when that fails"""
+    relative_path = os.path.join('datasets', 'columnar', str(dataset.pk))
+
+    def report_progress(fraction):
+        percent = round(50 + fraction * 50, 1)
+        reporter.progress(percent, 'writing columnar copy')
+        datasets.update(profile_progress=percent)
+
+    try:
+        write_columnar(
+            dataset.dataset_file.path,
+            os.path.join(settings.MEDIA_ROOT, relative_path),
+            dtypes={name: column.final_dtype for name, column in profiler.columns.items()},
+            rows=profiler.rows,
+            chunk_rows=chunk_rows,
+            progress=report_progress
+        )
+    except Exception as e:
+        # Training falls back to the CSV, so this doesn't fail the job
+        logger.warning('Columnar conversion of dataset %s failed: %s', dataset.pk, e)
+        reporter.log(f'Could not write the columnar copy ({e}); training will read the CSV')
+        return ''
+
+    reporter.log(f'Wrote columnar copy to {relative_path}')
+    return relative_path
+
+
+JOB_HANDLERS = {
+    'train_model': train_admin_model,
+    'retrain_prediction_model': retrain_prediction_model,
+    'profile_dataset': profile_uploaded_dataset,
+}
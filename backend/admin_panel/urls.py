@@ -6,6 +6,7 @@ router = DefaultRouter()
 router.register(r'models', views.MLModelViewSet, basename='mlmodel')
 router.register(r'datasets', views.TrainingDatasetViewSet, basename='trainingdataset')
 router.register(r'predictions', views.PredictionLogViewSet, basename='predictionlog')
+router.register(r'training-jobs', views.TrainingJobViewSet, basename='trainingjob')
 
 urlpatterns = [
     # Dashboard
@@ -28,6 +29,8 @@ urlpatterns = [
     
     # System Logs
     path('system-logs/', views.SystemLogView.as_view(), name='system_logs'),
+    path('archives/', views.LogArchiveView.as_view(), name='log_archives'),
+    path('archives/rows/', views.ArchivedRowsView.as_view(), name='archived_rows'),
     
     # Notifications
     path('notifications/', views.NotificationView.as_view(), name='notifications'),
@@ -6,7 +6,6 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django.db.models import Count, Avg, Q, F
 from django.utils import timezone
 from datetime import timedelta, datetime
-import pandas as pd
 import joblib
 import numpy as np
 import json
@@ -14,32 +13,32 @@ import os
 from django.conf import settings
 import logging
 from django.db import transaction
-import random
 import uuid
-from django.utils.dateparse import parse_date
+from django.utils.dateparse import parse_date, parse_datetime
+from django.urls import reverse
+from django.http import StreamingHttpResponse
 
 from .models import (
     MLModel, TrainingDataset, PredictionLog, 
-    SystemLog, UserActivity, Notification, AdminDashboardStats
+    SystemLog, UserActivity, Notification, TrainingJob, LogArchive
 )
 from .serializers import (
     MLModelSerializer, TrainingDatasetSerializer, PredictionLogSerializer,
     SystemLogSerializer, UserActivitySerializer, NotificationSerializer,
     UserSerializer, TrainingDatasetUploadSerializer, TrainModelSerializer,
-    FlagPredictionSerializer
+    FlagPredictionSerializer, TrainingJobSerializer, LogArchiveSerializer, PredictionLogSummarySerializer
 )
+from .training_jobs import submit_job, cancel_job
+from .exports import Export, ExportError
+from .pagination import KeysetPagination
+from .retention import SOURCES as ARCHIVE_SOURCES, read_archives
+from .rollups import daily_counts, refresh_stale_rollups, total_count, totals_by_dimension
+from .sample_data import ACTIVITY_MODES, generate_sample_data
 from users.models import User
+from edu2job_backend.caching import response_cache
 
 logger = logging.getLogger(__name__)
 
-# ML Training imports
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.svm import SVC
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -111,8 +110,8 @@ class TrainingDatasetViewSet(viewsets.ModelViewSet):
                 target_column=serializer.validated_data.get('target_column', '')
             )
             
-            # Process dataset to get stats
-            self._process_dataset(dataset)
+            # Profile the file in the background; progress shows on the dataset
+            job = submit_job('profile_dataset', {'dataset_id': str(dataset.id)}, user=request.user)
             
             # Log the upload
             SystemLog.objects.create(
@@ -124,59 +123,36 @@ class TrainingDatasetViewSet(viewsets.ModelViewSet):
                 details={
                     'dataset_id': str(dataset.id),
                     'file_size': f"{dataset.file_size_mb:.2f} MB",
-                    'rows': dataset.row_count,
-                    'columns': dataset.column_count
+                    'profile_job_id': str(job.id)
                 }
             )
             
-            return Response(TrainingDatasetSerializer(dataset).data, status=status.HTTP_201_CREATED)
+            data = TrainingDatasetSerializer(dataset).data
+            data['profile_job'] = TrainingJobSerializer(job).data
+            data['profile_status_url'] = request.build_absolute_uri(reverse('trainingjob-detail', args=[job.id]))
+            return Response(data, status=status.HTTP_201_CREATED)
             
         except Exception as e:
             logger.error(f"Error uploading dataset: {str(e)}")
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-    
-    def _process_dataset(self, dataset):
-        """Process dataset to extract statistics"""
-        try:
-            file_path = dataset.dataset_file.path
-            
-            if dataset.dataset_type == 'csv':
-                df = pd.read_csv(file_path)
-            elif dataset.dataset_type == 'json':
-                df = pd.read_json(file_path)
-            elif dataset.dataset_type in ['xlsx', 'xls']:
-                df = pd.read_excel(file_path)
-            else:
-                return
-            
-            # Update dataset statistics
-            dataset.row_count = len(df)
-            dataset.column_count = len(df.columns)
-            dataset.column_names = list(df.columns)
-            
-            # Basic validation
-            validation_report = {
-                'missing_values': df.isnull().sum().to_dict(),
-                'data_types': df.dtypes.astype(str).to_dict(),
-                'basic_stats': df.describe().to_dict() if len(df.select_dtypes(include=[np.number]).columns) > 0 else {}
-            }
-            
-            dataset.validation_report = validation_report
-            dataset.is_validated = True
-            dataset.save()
-            
-        except Exception as e:
-            logger.error(f"Error processing dataset: {str(e)}")
-            dataset.validation_report = {'error': str(e)}
-            dataset.save()
 
 class PredictionLogViewSet(viewsets.ModelViewSet):
     queryset = PredictionLog.objects.all()
     serializer_class = PredictionLogSerializer
     permission_classes = [IsAdmin]
+    pagination_class = KeysetPagination
+    
+    def get_serializer_class(self):
+        # Listings send summaries; a single prediction comes with its JSON
+        if self.action == 'list':
+            return PredictionLogSummarySerializer
+        return PredictionLogSerializer
     
     def get_queryset(self):
-        queryset = PredictionLog.objects.select_related('user', 'model_used').order_by('-created_at')
+        if self.action == 'list':
+            queryset = PredictionLogSummarySerializer.summary_queryset(PredictionLog.objects.order_by('-created_at'))
+        else:
+            queryset = PredictionLog.objects.select_related('user', 'model_used', 'reviewed_by').order_by('-created_at')
         
         # Filter by status if provided
         status_filter = self.request.query_params.get('status', None)
@@ -238,113 +214,21 @@ class PredictionLogViewSet(viewsets.ModelViewSet):
     def generate_sample_data(self, request):
         """Generate sample prediction data for testing"""
         try:
-            # Get or create test users
-            users = User.objects.filter(role='user')
-            
-            if not users.exists():
-                # Create some test users
-                for i in range(5):
-                    user, _ = User.objects.get_or_create(
-                        email=f'testuser{i+1}@example.com',
-                        defaults={
-                            'name': f'Test User {i+1}',
-                            'role': 'user',
-                            'is_active': True
-                        }
-                    )
-                    users = User.objects.filter(role='user')
-            
-            # Get active model
-            active_model = MLModel.objects.filter(is_active=True).first()
-            
-            if not active_model:
-                # Create a default model if none exists
-                active_model = MLModel.objects.create(
-                    name='Default Prediction Model',
-                    model_type='random_forest',
-                    accuracy=0.85,
-                    is_active=True,
-                    status='trained'
-                )
-            
-            # Sample data for predictions
-            job_roles = [
-                'Software Engineer', 'Data Scientist', 'ML Engineer',
-                'DevOps Engineer', 'Frontend Developer', 'Backend Developer',
-                'Full Stack Developer', 'Data Analyst', 'AI Engineer'
-            ]
-            
-            skills_sets = [
-                ['Python', 'Django', 'React', 'SQL'],
-                ['Java', 'Spring Boot', 'Angular'],
-                ['Python', 'TensorFlow', 'PyTorch'],
-                ['JavaScript', 'Node.js', 'AWS'],
-                ['C++', 'Python', 'Linux'],
-                ['Python', 'Flask', 'PostgreSQL'],
-                ['JavaScript', 'TypeScript', 'React'],
-                ['R', 'Python', 'Tableau'],
-                ['Python', 'OpenCV', 'Keras']
-            ]
-            
-            locations = ['New York', 'San Francisco', 'London', 'Berlin', 'Tokyo']
-            
-            # Create sample predictions
-            predictions_created = 0
-            for i in range(20):  # Create 20 sample predictions
-                user = random.choice(users)
-                job_index = random.randint(0, len(job_roles) - 1)
-                confidence = random.uniform(0.65, 0.95)
-                
-                # Random status
-                status_options = ['success', 'success', 'success', 'success', 'flagged', 'failed']
-                status = random.choice(status_options)
-                
-                prediction = PredictionLog.objects.create(
-                    user=user,
-                    input_data={
-                        'education': random.choice(['Bachelor\'s', 'Master\'s', 'PhD']),
-                        'experience': f"{random.randint(1, 10)} years",
-                        'skills': skills_sets[job_index],
-                        'location': random.choice(locations),
-                        'field': random.choice(['Computer Science', 'Data Science', 'Engineering'])
-                    },
-                    prediction_result={
-                        'job_role': job_roles[job_index],
-                        'confidence': confidence,
-                        'salary_range': f"${random.randint(60, 120)}k - ${random.randint(80, 180)}k",
-                        'probability_distribution': {
-                            job_roles[job_index]: confidence,
-                            'Alternative Role': 1 - confidence
-                        }
-                    },
-                    confidence_score=confidence,
-                    model_used=active_model,
-                    model_version=active_model.version or '1.0.0',
-                    status=status,
-                    is_flagged=status == 'flagged',
-                    flag_reason='Low confidence score' if status == 'flagged' else '',
-                    processing_time=random.uniform(0.1, 2.5)
-                )
-                
-                # Create user activity
-                UserActivity.objects.create(
-                    user=user,
-                    activity_type='prediction',
-                    description=f'Made prediction for {job_roles[job_index]} with {confidence:.1%} confidence',
-                    metadata={
-                        'model_used': str(active_model.id),
-                        'confidence': confidence,
-                        'status': status
-                    }
-                )
-                
-                predictions_created += 1
+            options = sample_data_options(request.data, default_predictions=20)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            counts = generate_sample_data(system_logs=0, notifications=0, **options)
             
             return Response({
-                'message': f'Successfully created {predictions_created} sample predictions',
-                'total_predictions': PredictionLog.objects.count()
+                'message': f"Successfully created {counts['predictions']} sample predictions",
+                'total_predictions': PredictionLog.objects.count(),
+                'created': counts
             })
             
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error generating sample data: {str(e)}")
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -357,188 +241,82 @@ class TrainModelView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
+        params = serializer.validated_data
         try:
-            # Get dataset
-            dataset_id = serializer.validated_data['dataset_id']
-            dataset = TrainingDataset.objects.get(id=dataset_id)
-            
-            # Read dataset
-            file_path = dataset.dataset_file.path
-            
-            if dataset.dataset_type == 'csv':
-                df = pd.read_csv(file_path)
-            else:
-                return Response({'error': 'Only CSV files are supported for training'}, 
-                              status=status.HTTP_400_BAD_REQUEST)
-            
-            # Prepare data
-            target_column = serializer.validated_data['target_column']
-            if target_column not in df.columns:
-                return Response({'error': f'Target column "{target_column}" not found in dataset'}, 
-                              status=status.HTTP_400_BAD_REQUEST)
-            
-            # Separate features and target
-            X = df.drop(columns=[target_column])
-            y = df[target_column]
-            
-            # Handle categorical variables
-            categorical_cols = X.select_dtypes(include=['object']).columns
-            label_encoders = {}
-            if len(categorical_cols) > 0:
-                for col in categorical_cols:
-                    le = LabelEncoder()
-                    X[col] = le.fit_transform(X[col].astype(str))
-                    label_encoders[col] = le
-            
-            # Split data
-            test_size = serializer.validated_data.get('test_size', 0.2)
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=test_size, random_state=serializer.validated_data.get('random_state', 42)
-            )
-            
-            # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
-            
-            # Train model based on selected type
-            model_type = serializer.validated_data['model_type']
-            
-            if model_type == 'random_forest':
-                model = RandomForestClassifier(n_estimators=100, random_state=42)
-            elif model_type == 'decision_tree':
-                model = DecisionTreeClassifier(random_state=42)
-            elif model_type == 'svm':
-                model = SVC(probability=True, random_state=42)
-            elif model_type == 'gradient_boosting':
-                model = GradientBoostingClassifier(random_state=42)
-            else:
-                return Response({'error': f'Unsupported model type: {model_type}'}, 
-                              status=status.HTTP_400_BAD_REQUEST)
-            
-            import time
-            start_time = time.time()
-            model.fit(X_train_scaled, y_train)
-            training_time = time.time() - start_time
-            
-            # Make predictions
-            y_pred = model.predict(X_test_scaled)
-            
-            # Calculate metrics
-            accuracy = accuracy_score(y_test, y_pred)
-            precision = precision_score(y_test, y_pred, average='weighted', zero_division=0)
-            recall = recall_score(y_test, y_pred, average='weighted', zero_division=0)
-            f1 = f1_score(y_test, y_pred, average='weighted', zero_division=0)
-            
-            # Create new model record
-            ml_model = MLModel.objects.create(
-                name=serializer.validated_data['model_name'],
-                version='1.0.0',
-                model_type=model_type,
-                description=serializer.validated_data.get('description', ''),
-                accuracy=accuracy,
-                precision=precision,
-                recall=recall,
-                f1_score=f1,
-                training_time=training_time,
-                test_size=test_size,
-                random_state=serializer.validated_data.get('random_state', 42),
-                features_used=list(X.columns),
-                target_column=target_column,
-                trained_by=request.user,
-                training_dataset=dataset,
-                status='trained'
-            )
-            
-            # Save model and scaler
-            models_dir = os.path.join(settings.MEDIA_ROOT, 'models')
-            scalers_dir = os.path.join(settings.MEDIA_ROOT, 'scalers')
-            encoders_dir = os.path.join(settings.MEDIA_ROOT, 'encoders')
-            
-            os.makedirs(models_dir, exist_ok=True)
-            os.makedirs(scalers_dir, exist_ok=True)
-            os.makedirs(encoders_dir, exist_ok=True)
-            
-            model_path = os.path.join(models_dir, f'model_{ml_model.id}.joblib')
-            scaler_path = os.path.join(scalers_dir, f'scaler_{ml_model.id}.joblib')
-            encoder_path = os.path.join(encoders_dir, f'encoder_{ml_model.id}.joblib')
-            
-            joblib.dump(model, model_path)
-            joblib.dump(scaler, scaler_path)
-            
-            # Save label encoders if any
-            if label_encoders:
-                joblib.dump(label_encoders, encoder_path)
-                ml_model.encoder_file.name = f'encoders/encoder_{ml_model.id}.joblib'
-            
-            ml_model.model_file.name = f'models/model_{ml_model.id}.joblib'
-            ml_model.scaler_file.name = f'scalers/scaler_{ml_model.id}.joblib'
-            ml_model.save()
-            
-            # Log successful training
-            SystemLog.objects.create(
-                level='info',
-                category='model_training',
-                source='admin_panel',
-                message=f'Model "{ml_model.name}" trained successfully',
-                user=request.user,
-                details={
-                    'model_id': str(ml_model.id),
-                    'accuracy': accuracy,
-                    'training_time': training_time,
-                    'features_used': len(ml_model.features_used)
-                }
-            )
-            
-            return Response({
-                'message': 'Model trained successfully',
-                'model': MLModelSerializer(ml_model).data,
-                'metrics': {
-                    'accuracy': accuracy,
-                    'precision': precision,
-                    'recall': recall,
-                    'f1_score': f1,
-                    'training_time': training_time
-                }
-            })
-            
+            dataset = TrainingDataset.objects.get(id=params['dataset_id'])
+        except TrainingDataset.DoesNotExist:
+            return Response({'error': 'Training dataset not found'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if dataset.dataset_type != 'csv':
+            return Response({'error': 'Only CSV files are supported for training'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        # Check the target column from the header only; the worker reads the rest
+        try:
+            columns = dataset.read_columns()
         except Exception as e:
-            logger.error(f"Error training model: {str(e)}")
-            
-            # Log the error
-            SystemLog.objects.create(
-                level='error',
-                category='model_training',
-                source='admin_panel',
-                message=f'Model training failed: {str(e)}',
-                user=request.user,
-                details={'error': str(e)}
-            )
-            
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({'error': f'Could not read dataset: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if params['target_column'] not in columns:
+            return Response({'error': f'Target column "{params["target_column"]}" not found in dataset'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        # Training runs in run_training_worker, not in this request
+        job = submit_job('train_model', {
+            'dataset_id': str(dataset.id),
+            'model_name': params['model_name'],
+            'model_type': params['model_type'],
+            'target_column': params['target_column'],
+            'test_size': params.get('test_size', 0.2),
+            'random_state': params.get('random_state', 42),
+            'description': params.get('description', ''),
+        }, user=request.user)
+        
+        return Response({
+            'message': 'Training job queued',
+            'job': TrainingJobSerializer(job).data,
+            'status_url': request.build_absolute_uri(reverse('trainingjob-detail', args=[job.id]))
+        }, status=status.HTTP_202_ACCEPTED)
+
+class TrainingJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Status of queued and finished training jobs (poll the detail endpoint)"""
+    serializer_class = TrainingJobSerializer
+    permission_classes = [IsAdmin]
+    
+    def get_queryset(self):
+        queryset = TrainingJob.objects.select_related('submitted_by', 'ml_model').order_by('-created_at')
+        
+        job_status = self.request.query_params.get('status')
+        if job_status:
+            queryset = queryset.filter(status=job_status)
+        
+        job_type = self.request.query_params.get('job_type')
+        if job_type:
+            queryset = queryset.filter(job_type=job_type)
+        
+        return queryset
+    
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        job = self.get_object()
+        if not cancel_job(job):
+            return Response({'error': f'Job is already {job.status} and cannot be cancelled'}, 
+                          status=status.HTTP_409_CONFLICT)
+        
+        job.refresh_from_db()
+        return Response({'message': 'Training job cancelled', 'job': TrainingJobSerializer(job).data})
 
 class AdminStatsView(APIView):
     permission_classes = [IsAdmin]
+    cache_key = 'admin_panel:stats'
+    cache_ttl = 300  # 5 minutes
     
     def get(self, request):
         try:
-            # Check if we have cached stats
-            cache_duration = timedelta(seconds=300)  # 5 minutes
-            recent_stats = AdminDashboardStats.objects.first()
-            
-            if recent_stats and timezone.now() - recent_stats.last_refreshed < cache_duration:
-                return Response(recent_stats.stats_data)
-            
-            # Calculate fresh stats
-            stats = self._calculate_stats(request)
-            
-            # Update or create cache
-            if recent_stats:
-                recent_stats.stats_data = stats
-                recent_stats.save()
-            else:
-                AdminDashboardStats.objects.create(stats_data=stats)
-            
+            # Shared by all admins; one of them recomputes, the rest get the cached copy
+            stats = response_cache.get_or_set(
+                self.cache_key, lambda: self._calculate_stats(request), ttl=self.cache_ttl
+            )
             return Response(stats)
             
         except Exception as e:
@@ -547,12 +325,19 @@ class AdminStatsView(APIView):
     
     def _calculate_stats(self, request):
         """Calculate all dashboard statistics"""
-        today = timezone.now().date()
+        today = timezone.localdate()
         today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
         
+        # Bring the daily rollups up to date (usually a no-op; see rollups.py)
+        refresh_stale_rollups()
+        
+        # Daily predictions and user registrations for last 7 days
+        daily_predictions = daily_counts('predictions', 7)
+        user_registrations = daily_counts('registrations', 7)
+        
         # Basic counts
         total_users = User.objects.count()
-        total_predictions = PredictionLog.objects.count()
+        total_predictions = total_count('predictions')
         total_models = MLModel.objects.count()
         flagged_predictions = PredictionLog.objects.filter(is_flagged=True).count()
         
@@ -562,9 +347,7 @@ class AdminStatsView(APIView):
             activity_type='login'
         ).values('user').distinct().count()
         
-        predictions_today = PredictionLog.objects.filter(
-            created_at__gte=today_start
-        ).count()
+        predictions_today = daily_predictions[-1]['count']
         
         # Average accuracy
         accuracy_avg_result = MLModel.objects.filter(status='trained').aggregate(
@@ -574,40 +357,6 @@ class AdminStatsView(APIView):
         
         training_datasets_count = TrainingDataset.objects.count()
         
-        # Daily predictions for last 7 days
-        daily_predictions = []
-        for i in range(6, -1, -1):
-            date = today - timedelta(days=i)
-            date_start = timezone.make_aware(datetime.combine(date, datetime.min.time()))
-            date_end = timezone.make_aware(datetime.combine(date, datetime.max.time()))
-            
-            count = PredictionLog.objects.filter(
-                created_at__gte=date_start,
-                created_at__lte=date_end
-            ).count()
-            
-            daily_predictions.append({
-                'date': date.isoformat(),
-                'count': count
-            })
-        
-        # User registrations for last 7 days
-        user_registrations = []
-        for i in range(6, -1, -1):
-            date = today - timedelta(days=i)
-            date_start = timezone.make_aware(datetime.combine(date, datetime.min.time()))
-            date_end = timezone.make_aware(datetime.combine(date, datetime.max.time()))
-            
-            count = User.objects.filter(
-                date_joined__gte=date_start,
-                date_joined__lte=date_end
-            ).count()
-            
-            user_registrations.append({
-                'date': date.isoformat(),
-                'count': count
-            })
-        
         # Model performance
         model_performance = list(MLModel.objects.filter(status='trained').values(
             'name', 'accuracy', 'f1_score', 'trained_at'
@@ -619,12 +368,14 @@ class AdminStatsView(APIView):
                 model['trained_at'] = model['trained_at'].isoformat()
         
         # Recent data - limit queries
-        recent_predictions = PredictionLog.objects.select_related('user').order_by('-created_at')[:10]
+        recent_predictions = PredictionLogSummarySerializer.summary_queryset(
+            PredictionLog.objects.order_by('-created_at')
+        )[:10]
         recent_activities = UserActivity.objects.select_related('user').order_by('-created_at')[:10]
         recent_notifications = Notification.objects.filter(is_read=False).order_by('-created_at')[:10]
         
         # Use serializers with context to properly format data
-        prediction_serializer = PredictionLogSerializer(recent_predictions, many=True, context={'request': request})
+        prediction_serializer = PredictionLogSummarySerializer(recent_predictions, many=True, context={'request': request})
         activity_serializer = UserActivitySerializer(recent_activities, many=True, context={'request': request})
         notification_serializer = NotificationSerializer(recent_notifications, many=True, context={'request': request})
         
@@ -697,6 +448,7 @@ class UserActivityView(generics.ListAPIView):
 class SystemLogView(generics.ListAPIView):
     serializer_class = SystemLogSerializer
     permission_classes = [IsAdmin]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         queryset = SystemLog.objects.select_related('user').order_by('-created_at')
@@ -722,9 +474,69 @@ class SystemLogView(generics.ListAPIView):
         
         return queryset
 
+class LogArchiveView(generics.ListAPIView):
+    """Archive files written by `manage.py archive_logs`"""
+    serializer_class = LogArchiveSerializer
+    permission_classes = [IsAdmin]
+    
+    def get_queryset(self):
+        queryset = LogArchive.objects.all()
+        source = self.request.query_params.get('source', None)
+        if source:
+            queryset = queryset.filter(source=source)
+        return queryset
+
+class ArchivedRowsView(APIView):
+    """
+    Read archived system logs or user activities.
+
+    Query parameters: source (system_logs, user_activities), start_date /
+    end_date (ISO date or datetime; end exclusive), limit (at most 1000) and
+    equality filters on the source's fields (e.g. level, category, user_id).
+    """
+    permission_classes = [IsAdmin]
+    max_limit = 1000
+    
+    def _parse_time(self, value):
+        if not value:
+            return None
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(f'Invalid date: {value}')
+            moment = datetime.combine(day, datetime.min.time())
+        return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+    
+    def get(self, request):
+        params = request.query_params
+        source = params.get('source', 'system_logs')
+        if source not in ARCHIVE_SOURCES:
+            return Response({'error': f"source must be one of {', '.join(ARCHIVE_SOURCES)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            start = self._parse_time(params.get('start_date'))
+            end = self._parse_time(params.get('end_date'))
+            limit = min(max(int(params.get('limit', 100)), 1), self.max_limit)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        filters = {key: params[key] for key in ARCHIVE_SOURCES[source].filters if params.get(key)}
+        rows = []
+        truncated = False
+        for row in read_archives(source, start, end, **filters):
+            if len(rows) == limit:
+                truncated = True
+                break
+            rows.append(row)
+        
+        return Response({'source': source, 'results': rows, 'truncated': truncated})
+
 class NotificationView(generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [IsAdmin]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         queryset = Notification.objects.select_related('related_user').order_by('-created_at')
@@ -862,59 +674,53 @@ class ReviewFlaggedPredictionView(APIView):
             return Response({'error': 'Flagged prediction not found'}, status=status.HTTP_404_NOT_FOUND)
 
 class ExportDataView(APIView):
+    """
+    Stream a table export.
+
+    Query parameters: type (predictions, users, activities, system_logs,
+    models), output (json, ndjson, csv), gzip (true/false), fields
+    (comma-separated subset of the serializer fields) and start_date /
+    end_date (YYYY-MM-DD, inclusive).
+    """
     permission_classes = [IsAdmin]
     
     def get(self, request):
-        export_type = request.query_params.get('type', 'predictions')
+        params = request.query_params
+        fields = [field.strip() for field in params.get('fields', '').split(',') if field.strip()]
         
-        if export_type == 'predictions':
-            data = PredictionLog.objects.all()
-            serializer = PredictionLogSerializer(data, many=True, context={'request': request})
-        elif export_type == 'users':
-            data = User.objects.all()
-            serializer = UserSerializer(data, many=True, context={'request': request})
-        elif export_type == 'activities':
-            data = UserActivity.objects.all()
-            serializer = UserActivitySerializer(data, many=True, context={'request': request})
-        elif export_type == 'system_logs':
-            data = SystemLog.objects.all()
-            serializer = SystemLogSerializer(data, many=True, context={'request': request})
-        elif export_type == 'models':
-            data = MLModel.objects.all()
-            serializer = MLModelSerializer(data, many=True, context={'request': request})
-        else:
-            return Response({'error': 'Invalid export type'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            export = Export(
+                params.get('type', 'predictions'),
+                output=params.get('output', 'json').lower(),
+                fields=fields,
+                start_date=params.get('start_date'),
+                end_date=params.get('end_date'),
+                compress=params.get('gzip', '').lower() in ('1', 'true', 'yes'),
+                context={'request': request}
+            )
+        except ExportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response(serializer.data)
+        response = StreamingHttpResponse(export.stream(), content_type=export.content_type)
+        response['Content-Disposition'] = f'attachment; filename="{export.filename}"'
+        return response
 
 class DashboardChartsView(APIView):
     permission_classes = [IsAdmin]
     
     def get(self, request):
-        # Get data for various charts
-        today = timezone.now().date()
+        # Get data for various charts, read from the daily rollups
+        refresh_stale_rollups()
         
         # Prediction trends for last 30 days
-        prediction_trends = []
-        for i in range(29, -1, -1):
-            date = today - timedelta(days=i)
-            date_start = timezone.make_aware(datetime.combine(date, datetime.min.time()))
-            date_end = timezone.make_aware(datetime.combine(date, datetime.max.time()))
-            
-            count = PredictionLog.objects.filter(
-                created_at__gte=date_start,
-                created_at__lte=date_end
-            ).count()
-            
-            prediction_trends.append({
-                'date': date.isoformat(),
-                'count': count
-            })
+        prediction_trends = daily_counts('predictions', 30)
         
         # User activity by type
-        activity_by_type = list(UserActivity.objects.values('activity_type').annotate(
-            count=Count('id')
-        ).order_by('-count'))
+        activity_by_type = sorted(
+            [{'activity_type': activity_type, 'count': count}
+             for activity_type, count in totals_by_dimension('activities').items()],
+            key=lambda item: -item['count']
+        )
         
         # Model performance comparison
         model_performance = list(MLModel.objects.filter(status='trained').values(
@@ -922,9 +728,10 @@ class DashboardChartsView(APIView):
         ).order_by('-accuracy'))
         
         # System logs by level
-        logs_by_level = list(SystemLog.objects.values('level').annotate(
-            count=Count('id')
-        ).order_by('level'))
+        logs_by_level = [
+            {'level': level, 'count': count}
+            for level, count in sorted(totals_by_dimension('logs').items())
+        ]
         
         charts_data = {
             'prediction_trends': prediction_trends,
@@ -935,183 +742,42 @@ class DashboardChartsView(APIView):
         
         return Response(charts_data)
 
+def sample_data_options(data, default_predictions):
+    """generate_sample_data() arguments from request data; ValueError if invalid"""
+    options = {}
+    for name, default in (('predictions', default_predictions), ('users', 5), ('days', 30)):
+        try:
+            options[name] = int(data.get(name, default))
+        except (TypeError, ValueError):
+            raise ValueError(f'{name} must be an integer')
+    
+    limit = getattr(settings, 'SAMPLE_DATA_MAX_PREDICTIONS', 100000)
+    if options['predictions'] > limit:
+        raise ValueError(f'At most {limit} predictions per request; use "manage.py seed_data --predictions" for more')
+    options['activities'] = data.get('activities', 'bulk')
+    if options['activities'] not in ACTIVITY_MODES:
+        raise ValueError(f"activities must be one of {', '.join(ACTIVITY_MODES)}")
+    return options
+
 class GenerateSampleDataView(APIView):
-    """Generate sample data for testing"""
+    """Generate sample data for testing (see admin_panel.sample_data)"""
     permission_classes = [IsAdmin]
     
     def post(self, request):
         try:
-            # Generate sample users
-            sample_users = []
-            for i in range(1, 6):
-                user, created = User.objects.get_or_create(
-                    email=f'user{i}@example.com',
-                    defaults={
-                        'name': f'User {i}',
-                        'role': 'user',
-                        'is_active': True,
-                        'is_verified': True
-                    }
-                )
-                if created:
-                    user.set_password('password123')
-                    user.save()
-                    sample_users.append(user)
-            
-            # Get or create active model
-            active_model = MLModel.objects.filter(is_active=True).first()
-            if not active_model:
-                active_model = MLModel.objects.create(
-                    name='Job Prediction Model v1.0',
-                    model_type='random_forest',
-                    accuracy=0.87,
-                    precision=0.85,
-                    recall=0.86,
-                    f1_score=0.855,
-                    is_active=True,
-                    status='trained',
-                    version='1.0.0',
-                    description='Default model for job role prediction'
-                )
-            
-            # Generate sample predictions
-            job_roles = [
-                'Software Engineer',
-                'Data Scientist', 
-                'Machine Learning Engineer',
-                'DevOps Engineer',
-                'Frontend Developer',
-                'Backend Developer',
-                'Full Stack Developer',
-                'Data Analyst',
-                'AI Engineer',
-                'Cloud Architect'
-            ]
-            
-            predictions_created = 0
-            for i in range(50):  # Create 50 sample predictions
-                # Random date within last 30 days
-                days_ago = random.randint(0, 29)
-                created_date = timezone.now() - timedelta(days=days_ago, hours=random.randint(0, 23))
-                
-                user = random.choice(sample_users) if sample_users else User.objects.first()
-                job_role = random.choice(job_roles)
-                confidence = random.uniform(0.7, 0.98)
-                
-                # Random status (mostly success, some flagged/failed)
-                status_roll = random.random()
-                if status_roll < 0.85:
-                    status = 'success'
-                    is_flagged = False
-                elif status_roll < 0.95:
-                    status = 'flagged'
-                    is_flagged = True
-                else:
-                    status = 'failed'
-                    is_flagged = False
-                
-                prediction = PredictionLog(
-                    user=user,
-                    input_data={
-                        'education': random.choice(['Bachelor\'s', 'Master\'s', 'PhD']),
-                        'experience': f"{random.randint(1, 15)} years",
-                        'skills': random.choice([
-                            ['Python', 'Django', 'React', 'PostgreSQL'],
-                            ['Java', 'Spring', 'MySQL', 'Docker'],
-                            ['Python', 'TensorFlow', 'PyTorch', 'Scikit-learn'],
-                            ['JavaScript', 'Node.js', 'MongoDB', 'AWS'],
-                            ['C++', 'Python', 'Linux', 'Git']
-                        ]),
-                        'location': random.choice(['New York', 'San Francisco', 'London', 'Berlin', 'Tokyo']),
-                        'field': random.choice(['Computer Science', 'Data Science', 'Software Engineering'])
-                    },
-                    prediction_result={
-                        'job_role': job_role,
-                        'confidence': confidence,
-                        'salary_range': f"${random.randint(70, 150)}k - ${random.randint(100, 250)}k",
-                        'top_skills': random.sample(['Python', 'SQL', 'AWS', 'Docker', 'React', 'TensorFlow'], 3)
-                    },
-                    confidence_score=confidence,
-                    model_used=active_model,
-                    model_version=active_model.version,
-                    status=status,
-                    is_flagged=is_flagged,
-                    flag_reason='Low confidence' if is_flagged else '',
-                    processing_time=random.uniform(0.5, 3.0)
-                )
-                prediction.created_at = created_date
-                prediction.save()
-                
-                # Create corresponding user activity
-                UserActivity.objects.create(
-                    user=user,
-                    activity_type='prediction',
-                    description=f'Predicted as {job_role} with {confidence:.1%} confidence',
-                    metadata={
-                        'prediction_id': str(prediction.id),
-                        'job_role': job_role,
-                        'confidence': confidence,
-                        'status': status
-                    },
-                    created_at=created_date
-                )
-                
-                predictions_created += 1
-            
-            # Create some system logs
-            log_messages = [
-                ('info', 'User login successful'),
-                ('info', 'Model prediction completed'),
-                ('warning', 'High prediction latency detected'),
-                ('error', 'Database connection timeout'),
-                ('info', 'New user registered'),
-                ('warning', 'Low confidence prediction flagged'),
-                ('info', 'Dataset uploaded successfully'),
-                ('error', 'Model training failed'),
-                ('info', 'System backup completed'),
-                ('warning', 'Memory usage above threshold')
-            ]
-            
-            for level, message in log_messages:
-                days_ago = random.randint(0, 14)
-                created_date = timezone.now() - timedelta(days=days_ago, hours=random.randint(0, 23))
-                
-                SystemLog.objects.create(
-                    level=level,
-                    category=random.choice(['system', 'database', 'api', 'prediction']),
-                    source='prediction_service',
-                    message=message,
-                    details={'timestamp': created_date.isoformat()},
-                    created_at=created_date
-                )
-            
-            # Create notifications
-            notifications = [
-                ('New Prediction Available', 'A new job prediction has been made', 'prediction', 2),
-                ('Model Training Complete', 'ML model training completed successfully', 'model', 2),
-                ('System Alert', 'High server load detected', 'system', 3),
-                ('User Registered', 'New user joined the platform', 'user', 1),
-                ('Data Export Ready', 'Prediction data export is ready for download', 'system', 2)
-            ]
-            
-            for title, message, ntype, priority in notifications:
-                days_ago = random.randint(0, 7)
-                created_date = timezone.now() - timedelta(days=days_ago, hours=random.randint(0, 23))
-                
-                Notification.objects.create(
-                    title=title,
-                    message=message,
-                    notification_type=ntype,
-                    priority=priority,
-                    is_read=random.choice([True, False]),
-                    created_at=created_date
-                )
+            options = sample_data_options(request.data, default_predictions=50)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            counts = generate_sample_data(**options)
             
             return Response({
                 'success': True,
                 'message': f'Successfully generated sample data',
                 'data': {
-                    'predictions_created': predictions_created,
+                    'predictions_created': counts['predictions'],
+                    'activities_created': counts['activities'],
                     'total_predictions': PredictionLog.objects.count(),
                     'total_users': User.objects.count(),
                     'total_models': MLModel.objects.count(),
@@ -1120,6 +786,8 @@ class GenerateSampleDataView(APIView):
                 }
             })
             
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error generating sample data: {str(e)}")
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
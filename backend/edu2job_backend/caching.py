@@ -0,0 +1,170 @@
+"""
+Two-tier cache for expensive, read-mostly API responses.
+
+Tiers (settings.CACHES):
+    'local'    in-process LocMemCache, so a hit costs no network or DB round trip
+    'default'  the shared cache (local memory, file, database or Redis; see
+               CACHE_BACKEND in settings), so workers reuse each other's results
+
+Entries carry a ``fresh_until`` time and live ``stale_ttl`` seconds past it.
+A fresh entry is returned as is. For a stale one, the first caller to take the
+key's lock (an atomic ``add`` in the shared cache) recomputes it while every
+other caller keeps getting the stale value (stale-while-revalidate). On a cold
+miss only the lock holder computes; the others wait for its result, so a burst
+of requests never stampedes the recompute.
+
+invalidate() clears both tiers of the current process and the shared tier.
+Other workers may keep serving their local copy for up to CACHE_LOCAL_TTL
+seconds.
+"""
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'tiered'
+
+
+class TieredCache:
+    def __init__(self, shared_alias='default', local_alias='local', local_ttl=5,
+                 lock_timeout=30, wait_timeout=10, wait_interval=0.05):
+        self.shared_alias = shared_alias
+        self.local_alias = local_alias
+        self.local_ttl = local_ttl
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.wait_interval = wait_interval
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.recomputes = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    @property
+    def local(self):
+        return caches[self.local_alias]
+
+    def get_or_set(self, key, compute, ttl, stale_ttl=None):
+        """
+        Return the cached result of ``compute()`` under ``key``.
+
+        ``ttl`` is how long a result is fresh; it is then served stale for up to
+        ``stale_ttl`` more seconds (default: ``ttl``) while one caller refreshes it.
+        """
+        stale_ttl = ttl if stale_ttl is None else stale_ttl
+        key = f'{KEY_PREFIX}:{key}'
+
+        entry = self._get_entry(key)
+        if entry is not None and entry['fresh_until'] > time.time():
+            self._count('hits')
+            return entry['value']
+
+        if entry is not None:
+            token = self._acquire(key)
+            if token is None:
+                # Someone else is refreshing it
+                self._count('stale_hits')
+                return entry['value']
+            try:
+                return self._recompute(key, compute, ttl, stale_ttl)
+            except Exception as e:
+                logger.warning('Refreshing %s failed, serving the stale value: %s', key, e)
+                return entry['value']
+            finally:
+                self._release(key, token)
+
+        self._count('misses')
+        token = self._acquire(key)
+        if token is not None:
+            try:
+                return self._recompute(key, compute, ttl, stale_ttl)
+            finally:
+                self._release(key, token)
+
+        entry = self._wait_for(key)
+        if entry is not None:
+            return entry['value']
+        # The lock holder is slow or died; don't keep the request waiting
+        return self._recompute(key, compute, ttl, stale_ttl)
+
+    def invalidate(self, key):
+        key = f'{KEY_PREFIX}:{key}'
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def clear(self):
+        """Empty both tiers (tests, deploys); this also clears other users of the caches"""
+        self.local.clear()
+        self.shared.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'recomputes': self.recomputes,
+        }
+
+    def _get_entry(self, key):
+        entry = self.local.get(key)
+        if entry is not None and entry['fresh_until'] > time.time():
+            return entry
+
+        # Missing or stale locally: another worker may have refreshed it
+        shared_entry = self.shared.get(key)
+        if shared_entry is not None:
+            self.local.set(key, shared_entry, timeout=self._local_timeout(shared_entry))
+            return shared_entry
+        return entry
+
+    def _local_timeout(self, entry):
+        return max(1, min(self.local_ttl, entry['expires_at'] - time.time()))
+
+    def _recompute(self, key, compute, ttl, stale_ttl):
+        value = compute()
+        now = time.time()
+        entry = {'value': value, 'fresh_until': now + ttl, 'expires_at': now + ttl + stale_ttl}
+        self.shared.set(key, entry, timeout=ttl + stale_ttl)
+        self.local.set(key, entry, timeout=self._local_timeout(entry))
+        self._count('recomputes')
+        return value
+
+    def _acquire(self, key):
+        token = uuid.uuid4().hex
+        if self.shared.add(f'{key}:lock', token, timeout=self.lock_timeout):
+            return token
+        return None
+
+    def _release(self, key, token):
+        lock_key = f'{key}:lock'
+        if self.shared.get(lock_key) == token:
+            self.shared.delete(lock_key)
+
+    def _wait_for(self, key):
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.wait_interval)
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.local.set(key, entry, timeout=self._local_timeout(entry))
+                return entry
+            if self.shared.get(f'{key}:lock') is None:
+                # The lock holder gave up (its compute raised)
+                break
+        return None
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+response_cache = TieredCache(local_ttl=getattr(settings, 'CACHE_LOCAL_TTL', 5))
@@ -81,6 +81,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'edu2job_backend.wsgi.application'
 
+# Runs the test suite with settings tests rely on (see edu2job_backend/test_runner.py)
+TEST_RUNNER = 'edu2job_backend.test_runner.TestRunner'
+
 # Database - SQLite configuration
 # Database configuration
 
@@ -92,6 +95,35 @@ DATABASES = {
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
+
+# Caches: 'local' is a per-process tier in front of 'default', the shared tier
+# (see edu2job_backend/caching.py). CACHE_BACKEND picks the shared tier:
+#   'locmem'  process memory (development)
+#   'file'    directory CACHE_LOCATION
+#   'db'      table CACHE_LOCATION (run `python manage.py createcachetable`)
+#   'redis'   Redis-compatible server at CACHE_LOCATION (needs the redis package)
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'edu2job-shared'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', os.path.join(BASE_DIR, 'cache')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'edu2job_cache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+_cache_backend, _cache_location = _CACHE_BACKENDS[CACHE_BACKEND]
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': config('CACHE_LOCATION', default=_cache_location),
+        'KEY_PREFIX': 'edu2job',
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'edu2job-local',
+    },
+}
+# Seconds a worker may serve its local copy after another worker invalidated it
+CACHE_LOCAL_TTL = config('CACHE_LOCAL_TTL', default=5, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -251,6 +283,67 @@ ALLOWED_DOC_TYPES = [
 ML_MODEL_PATH = os.path.join(BASE_DIR, 'ml_models')
 os.makedirs(ML_MODEL_PATH, exist_ok=True)
 
+# How often (seconds) each worker checks for a retrained/activated model
+ML_MODEL_POLL_INTERVAL = config('ML_MODEL_POLL_INTERVAL', default=5, cast=int)
+
+# Largest number of profiles accepted by /api/predictions/predict/batch/
+ML_BATCH_MAX_ROWS = config('ML_BATCH_MAX_ROWS', default=10000, cast=int)
+
+# Warm the prediction model when a web worker boots: 'background' (boot
+# continues, /health/ready turns ready when done), 'sync' (boot waits) or 'off'
+ML_WARMUP = config('ML_WARMUP', default='background')
+
+# Memory-map the flattened forest arrays so all workers on a host share one
+# page-cache copy instead of each holding its own
+ML_MODEL_MMAP = config('ML_MODEL_MMAP', default=True, cast=bool)
+
+# Prediction result cache: 'lru' (per worker), 'django' (the Django cache
+# named by ML_PREDICTION_CACHE_ALIAS) or 'none'
+ML_PREDICTION_CACHE_BACKEND = config('ML_PREDICTION_CACHE_BACKEND', default='lru')
+ML_PREDICTION_CACHE_SIZE = config('ML_PREDICTION_CACHE_SIZE', default=1024, cast=int)
+ML_PREDICTION_CACHE_TTL = config('ML_PREDICTION_CACHE_TTL', default=3600, cast=int)
+ML_PREDICTION_CACHE_ALIAS = config('ML_PREDICTION_CACHE_ALIAS', default='default')
+
+# Background training (python manage.py run_training_worker). Training uses at
+# most TRAINING_MAX_THREADS cores and runs niced so predictions stay fast.
+TRAINING_MAX_THREADS = config('TRAINING_MAX_THREADS', default=1, cast=int)
+TRAINING_NICE = config('TRAINING_NICE', default=10, cast=int)
+TRAINING_WORKER_POLL_INTERVAL = config('TRAINING_WORKER_POLL_INTERVAL', default=5, cast=int)
+
+# Daily rollups for the admin dashboards (python manage.py refresh_rollups).
+# Rows younger than ROLLUP_SETTLE_SECONDS are read live instead of rolled up;
+# dashboards refresh rollups older than ROLLUP_REFRESH_INTERVAL seconds.
+ROLLUP_SETTLE_SECONDS = config('ROLLUP_SETTLE_SECONDS', default=60, cast=int)
+ROLLUP_REFRESH_INTERVAL = config('ROLLUP_REFRESH_INTERVAL', default=300, cast=int)
+
+# Rows fetched per database round trip by the streaming admin exports
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Rows per chunk when profiling uploaded training datasets
+DATASET_PROFILE_CHUNK_ROWS = config('DATASET_PROFILE_CHUNK_ROWS', default=50000, cast=int)
+
+# Audit rows (UserActivity/SystemLog/Notification) from signals and views are
+# queued and written in batches by a background thread (admin_panel/audit.py).
+# AUDIT_WRITER_MODE 'sync' saves them inline (the test runner,
+# edu2job_backend.test_runner, always uses it).
+AUDIT_WRITER_MODE = config('AUDIT_WRITER_MODE', default='async')
+AUDIT_QUEUE_SIZE = config('AUDIT_QUEUE_SIZE', default=10000, cast=int)
+AUDIT_BATCH_SIZE = config('AUDIT_BATCH_SIZE', default=500, cast=int)
+AUDIT_FLUSH_INTERVAL = config('AUDIT_FLUSH_INTERVAL', default=1.0, cast=float)
+AUDIT_OVERFLOW = config('AUDIT_OVERFLOW', default='block')  # or 'drop'
+AUDIT_BLOCK_TIMEOUT = config('AUDIT_BLOCK_TIMEOUT', default=1.0, cast=float)
+
+# Most predictions one sample data API request may generate (seed_data has no limit)
+SAMPLE_DATA_MAX_PREDICTIONS = config('SAMPLE_DATA_MAX_PREDICTIONS', default=100000, cast=int)
+
+# Retention (python manage.py archive_logs): older rows are moved to gzipped
+# NDJSON files under MEDIA_ROOT/RETENTION_ARCHIVE_DIR, see admin_panel/retention.py
+SYSTEM_LOG_RETENTION_DAYS = config('SYSTEM_LOG_RETENTION_DAYS', default=90, cast=int)
+USER_ACTIVITY_RETENTION_DAYS = config('USER_ACTIVITY_RETENTION_DAYS', default=180, cast=int)
+RETENTION_BATCH_SIZE = config('RETENTION_BATCH_SIZE', default=1000, cast=int)
+RETENTION_ARCHIVE_DIR = config('RETENTION_ARCHIVE_DIR', default='archives')
+RETENTION_INTERVAL = config('RETENTION_INTERVAL', default=86400, cast=int)
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -289,6 +382,13 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        # DEBUG adds the ranked roles of every scored row (and the view's
+        # request details); nothing is formatted at other levels
+        'predictions': {
+            'handlers': ['console', 'file'],
+            'level': config('PREDICTIONS_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
     },
 }
 
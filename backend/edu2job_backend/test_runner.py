@@ -0,0 +1,24 @@
+"""
+Test runner for `python manage.py test` (settings.TEST_RUNNER).
+
+Audit rows are written synchronously during tests, so assertions can see them
+right after the request that recorded them (admin_panel.audit writes them from
+a background thread otherwise).
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    test_settings = {
+        'AUDIT_WRITER_MODE': 'sync',
+    }
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._settings_override = override_settings(**self.test_settings)
+        self._settings_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._settings_override.disable()
+        super().teardown_test_environment(**kwargs)
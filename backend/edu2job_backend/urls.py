@@ -6,6 +6,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
+from predictions.views import readiness
 
 urlpatterns = [
      path('', lambda request: JsonResponse({'status': 'ok', 'service': 'Edu2Job Backend'})),
@@ -17,6 +18,8 @@ urlpatterns = [
      path('api/predictions/',include('predictions.urls')),
     # Health check
      path('health/', lambda request: JsonResponse({'status': 'healthy'})),
+     path('health/ready', readiness, name='health_ready'),
+     path('health/ready/', readiness),
     path('api/test/', lambda request: JsonResponse({'status': 'healthy', 'message': 'Edu2Job API is running'})),
 ]
 
@@ -1,5 +1,38 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+
+# Process names that serve HTTP traffic; management commands (migrate, test,
+# the training worker, ...) never warm the model
+SERVER_COMMANDS = ('gunicorn', 'uwsgi', 'daphne', 'uvicorn')
+
+
+def is_server_process():
+    program = os.path.basename(sys.argv[0]) if sys.argv else ''
+    if program.startswith(SERVER_COMMANDS):
+        return True
+    # runserver's autoreloader runs the actual server in a child with RUN_MAIN set
+    return 'runserver' in sys.argv[1:2] and os.environ.get('RUN_MAIN') == 'true'
+
 
 class PredictionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'predictions'
\ No newline at end of file
+    name = 'predictions'
+    
+    def ready(self):
+        # Import signals
+        import predictions.signals
+        
+        # Load the saved model at worker boot rather than in the first request;
+        # /health/ready reports when it's done
+        mode = getattr(settings, 'ML_WARMUP', 'background')
+        if mode == 'off' or not is_server_process():
+            return
+        
+        from .model_registry import model_registry
+        if mode == 'sync':
+            model_registry.warm_up()
+        else:
+            model_registry.start_warm_up()
@@ -0,0 +1,203 @@
+"""
+Columnar copies of uploaded training datasets.
+
+Training used to re-parse the raw CSV (and re-infer every dtype) each time a
+model was trained on it. At ingest the profile job now also writes a columnar
+copy, which training and later profiling read instead:
+
+    <MEDIA_ROOT>/datasets/columnar/<dataset id>/
+        meta.json              row count and, per column, its kind and dtype
+        <n>.npy                one array per column, memory-mapped on read
+        <n>.categories.npy     sorted categories of a dictionary-encoded column
+
+Numeric and boolean columns keep an explicit dtype (int64, float64, bool).
+Text columns are dictionary-encoded: int32 codes (-1 for missing) plus their
+categories in sorted order, so the codes equal what LabelEncoder would assign
+and training can use them without re-encoding.
+
+Reading a column is an np.load with mmap_mode, so a projection of a few
+columns only touches those files. Parquet/Feather would need pyarrow, which is
+not a dependency; the layout follows the flat forest export instead.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+META_FILE = 'meta.json'
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_ROWS = 50000
+
+
+def column_kind(dtype):
+    """How a column with this (profiled) pandas dtype is stored"""
+    if dtype == 'bool':
+        return 'bool'
+    if dtype.startswith(('int', 'uint')):
+        return 'int64'
+    if dtype.startswith('float'):
+        return 'float64'
+    return 'category'
+
+
+def is_columnar(path):
+    return bool(path) and os.path.isfile(os.path.join(path, META_FILE))
+
+
+def write_columnar(csv_path, directory, dtypes, rows, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None):
+    """
+    Convert a CSV into a columnar dataset directory.
+
+    ``dtypes`` ({column: pandas dtype name}) and ``rows`` come from a prior
+    DatasetProfiler pass, so every chunk is parsed with the same explicit
+    dtypes. ``progress(fraction)`` is called after each chunk.
+    """
+    names = list(dtypes)
+    kinds = {name: column_kind(dtypes[name]) for name in names}
+    read_dtypes = {name: (str if kind == 'category' else kind) for name, kind in kinds.items()}
+
+    tmp_directory = f'{directory}.tmp'
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+
+    arrays = {}
+    categories = {}
+    columns = []
+    for index, name in enumerate(names):
+        kind = kinds[name]
+        dtype = np.int32 if kind == 'category' else np.dtype(kind)
+        filename = f'{index}.npy'
+        arrays[name] = np.lib.format.open_memmap(
+            os.path.join(tmp_directory, filename), mode='w+', dtype=dtype, shape=(rows,)
+        )
+        column = {'name': name, 'kind': kind, 'dtype': np.dtype(dtype).name, 'file': filename}
+        if kind == 'category':
+            categories[name] = {}
+            column['categories_file'] = f'{index}.categories.npy'
+        columns.append(column)
+
+    size = os.path.getsize(csv_path) or 1
+    offset = 0
+    with open(csv_path, 'rb') as f:
+        for chunk in pd.read_csv(f, chunksize=chunk_rows, dtype=read_dtypes):
+            end = offset + len(chunk)
+            if end > rows:
+                raise ValueError('Dataset changed since it was profiled')
+            for name in names:
+                if kinds[name] == 'category':
+                    arrays[name][offset:end] = _provisional_codes(chunk[name], categories[name])
+                else:
+                    arrays[name][offset:end] = chunk[name].to_numpy()
+            offset = end
+            if progress is not None:
+                progress(min(f.tell() / size, 1.0))
+
+    if offset != rows:
+        raise ValueError('Dataset changed since it was profiled')
+
+    for column in columns:
+        if column['kind'] == 'category':
+            sorted_categories = _sort_categories(arrays[column['name']], categories[column['name']], chunk_rows)
+            np.save(os.path.join(tmp_directory, column['categories_file']), sorted_categories)
+        arrays[column['name']].flush()
+    del arrays
+
+    meta = {'version': FORMAT_VERSION, 'rows': rows, 'columns': columns}
+    with open(os.path.join(tmp_directory, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    # Swap the finished directory in; readers never see a partial copy
+    old_directory = f'{directory}.old'
+    shutil.rmtree(old_directory, ignore_errors=True)
+    if os.path.exists(directory):
+        os.replace(directory, old_directory)
+    os.replace(tmp_directory, directory)
+    shutil.rmtree(old_directory, ignore_errors=True)
+    return meta
+
+
+def _provisional_codes(values, mapping):
+    # Codes in order of first appearance; remapped to sorted order at the end
+    chunk_codes, uniques = pd.factorize(values)
+    lookup = np.array([mapping.setdefault(value, len(mapping)) for value in uniques], dtype=np.int32)
+    if len(lookup) == 0:
+        return np.full(len(values), -1, dtype=np.int32)
+    return np.where(chunk_codes >= 0, lookup[np.maximum(chunk_codes, 0)], -1).astype(np.int32)
+
+
+def _sort_categories(codes, mapping, chunk_rows):
+    provisional = list(mapping)
+    order = sorted(range(len(provisional)), key=provisional.__getitem__)
+    remap = np.empty(len(provisional), dtype=np.int32)
+    remap[order] = np.arange(len(provisional), dtype=np.int32)
+    for start in range(0, len(codes), chunk_rows):
+        block = codes[start:start + chunk_rows]
+        present = block >= 0
+        block[present] = remap[block[present]]
+    return np.array([provisional[i] for i in order], dtype=str)
+
+
+class ColumnarDataset:
+    """Read access to a columnar dataset directory"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self._columns = {column['name']: column for column in self.meta['columns']}
+
+    @property
+    def rows(self):
+        return self.meta['rows']
+
+    @property
+    def columns(self):
+        return [column['name'] for column in self.meta['columns']]
+
+    def _check(self, columns):
+        columns = self.columns if columns is None else list(columns)
+        unknown = [name for name in columns if name not in self._columns]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(map(str, unknown))}")
+        return columns
+
+    def _load(self, column, start=None, stop=None):
+        values = np.load(os.path.join(self.directory, column['file']), mmap_mode='r')[start:stop]
+        if column['kind'] != 'category':
+            return np.array(values)
+        categories = np.load(os.path.join(self.directory, column['categories_file']))
+        return pd.Categorical.from_codes(np.array(values), categories=categories.astype(object))
+
+    def to_frame(self, columns=None):
+        """The dataset (or the projected ``columns``) as a DataFrame"""
+        columns = self._check(columns)
+        return pd.DataFrame({name: self._load(self._columns[name]) for name in columns}, columns=columns)
+
+    def iter_chunks(self, columns=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Yield (DataFrame chunk, fraction read) like dataset_profiler.iter_dataset_chunks"""
+        columns = self._check(columns)
+        for start in range(0, self.rows, chunk_rows):
+            stop = min(start + chunk_rows, self.rows)
+            chunk = pd.DataFrame({name: self._load(self._columns[name], start, stop) for name in columns},
+                                 columns=columns, index=pd.RangeIndex(start, stop))
+            yield chunk, stop / self.rows
+
+
+def encode_labels(series):
+    """
+    (codes, fitted LabelEncoder) for a categorical feature, as
+    LabelEncoder().fit_transform(series.astype(str)) would give them.
+
+    Dictionary-encoded columns without missing values reuse their codes.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and not series.isna().any():
+        series = series.cat.remove_unused_categories()
+        encoder = LabelEncoder()
+        encoder.classes_ = np.asarray(series.cat.categories, dtype=object)
+        return series.cat.codes.to_numpy(dtype=np.int64), encoder
+
+    encoder = LabelEncoder()
+    return encoder.fit_transform(series.astype(str)), encoder
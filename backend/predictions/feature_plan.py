@@ -0,0 +1,117 @@
+"""
+Compiled feature assembly for the job prediction model.
+
+A FeaturePlan is built once when the model is loaded. It turns a validated
+prediction input dict into the scaled float64 feature row the forest expects,
+without going through pandas. The rules are the ones the model was trained
+with: categorical values are mapped through ``categorical_mappings`` (unseen
+values become 0), missing columns get fixed defaults, non-numeric values
+become 0, and the StandardScaler is applied last.
+"""
+import math
+import threading
+
+import numpy as np
+
+
+def _to_float(value):
+    """Numeric conversion matching pd.to_numeric(errors='coerce') followed by fillna(0)"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if math.isnan(value) else value
+
+
+def default_feature_value(col):
+    """Value used for a feature column missing from the input"""
+    if 'skill_' in col:
+        return 5  # Default skill level
+    if 'cert_' in col:
+        return 0  # Default certification status
+    if col == 'age':
+        return 25
+    if col == 'gpa_score':
+        return 7.5
+    if col == 'total_experience_years':
+        return 3
+    if col == 'years_since_graduation':
+        return 5  # Overridden from graduation_year when available
+    return 0
+
+
+class FeaturePlan:
+    """Precompiled mapping from an input dict to a scaled feature row"""
+
+    def __init__(self, feature_columns, categorical_mappings=None, scaler=None):
+        self.feature_columns = list(feature_columns)
+        self.n_features = len(self.feature_columns)
+        categorical_mappings = categorical_mappings or {}
+
+        # (position, column, category mapping or None) for every feature
+        self._columns = [
+            (index, col, categorical_mappings.get(col))
+            for index, col in enumerate(self.feature_columns)
+        ]
+        self._defaults = np.array(
+            [default_feature_value(col) for col in self.feature_columns],
+            dtype=np.float64
+        )
+        self._graduation_index = (
+            self.feature_columns.index('years_since_graduation')
+            if 'years_since_graduation' in self.feature_columns else None
+        )
+
+        # StandardScaler parameters, applied exactly as scaler.transform does
+        self._mean = None
+        self._scale = None
+        if scaler is not None:
+            if getattr(scaler, 'with_mean', True) and getattr(scaler, 'mean_', None) is not None:
+                self._mean = np.asarray(scaler.mean_, dtype=np.float64)
+            if getattr(scaler, 'with_std', True) and getattr(scaler, 'scale_', None) is not None:
+                self._scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+        self._buffers = threading.local()
+
+    def transform(self, input_data):
+        """
+        Return the scaled (1, n_features) row for one input dict.
+
+        The row lives in a per-thread buffer that is reused by the next call on
+        the same thread, so use (or copy) it before transforming another input.
+        """
+        row = getattr(self._buffers, 'row', None)
+        if row is None:
+            row = self._buffers.row = np.empty((1, self.n_features), dtype=np.float64)
+
+        self._fill(row[0], input_data)
+        self._apply_scaler(row)
+        return row
+
+    def transform_many(self, records):
+        """Return the scaled (n_records, n_features) matrix for a list of input dicts"""
+        matrix = np.empty((len(records), self.n_features), dtype=np.float64)
+        for row, input_data in zip(matrix, records):
+            self._fill(row, input_data)
+        self._apply_scaler(matrix)
+        return matrix
+
+    def _fill(self, row, input_data):
+        row[:] = self._defaults
+        for index, col, mapping in self._columns:
+            if col in input_data:
+                value = input_data[col]
+                if mapping is not None:
+                    value = mapping.get(str(value), 0)
+                row[index] = _to_float(value)
+
+        if (self._graduation_index is not None
+                and 'years_since_graduation' not in input_data
+                and 'graduation_year' in input_data):
+            row[self._graduation_index] = 2024 - _to_float(input_data['graduation_year'])
+
+    def _apply_scaler(self, features):
+        if self._mean is not None:
+            np.subtract(features, self._mean, out=features)
+        if self._scale is not None:
+            np.divide(features, self._scale, out=features)
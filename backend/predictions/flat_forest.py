@@ -0,0 +1,202 @@
+"""
+Flattened random forest for fast inference.
+
+All trees of a fitted RandomForestClassifier (or a single DecisionTreeClassifier)
+are concatenated into a few contiguous NumPy arrays:
+
+    feature    split feature per node (0 for leaves)
+    threshold  split threshold per node
+    left/right global child index per node (leaves point at themselves)
+    value      class probabilities per node (rows sum to 1)
+    roots      index of each tree's root node
+
+predict_proba() walks every tree for every row at once with array indexing,
+so there is no per-tree Python dispatch, and stops as soon as every path has
+reached a leaf. It reproduces sklearn's
+predict_proba (same float32 split comparisons, same per-tree normalisation).
+
+The arrays are saved as plain .npy files in a directory so they load without
+unpickling the estimator. Loaded with ``mmap_mode='r'`` they are read-only
+views of the files, so every process on a host shares one page-cache copy.
+Saves replace each file atomically, which leaves existing mappings of the
+previous files intact.
+"""
+import json
+import os
+
+import numpy as np
+
+ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'value', 'roots', 'classes')
+META_FILE = 'forest.json'
+
+
+def source_fingerprint(path):
+    """Identify the estimator file a flat export was made from"""
+    stat = os.stat(path)
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def _trees(estimator):
+    estimators = getattr(estimator, 'estimators_', None)
+    return [estimator] if estimators is None else list(estimators)
+
+
+class FlatForest:
+    def __init__(self, feature, threshold, left, right, value, roots, classes, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+        self.n_estimators = len(roots)
+        self.n_classes_ = value.shape[1]
+        self._is_leaf = left == np.arange(len(left))
+
+    @staticmethod
+    def supports(estimator):
+        """True for fitted single-output tree classifiers and forests of them"""
+        trees = _trees(estimator)
+        return (
+            hasattr(estimator, 'predict_proba')
+            and all(hasattr(tree, 'tree_') for tree in trees)
+            and getattr(estimator, 'n_outputs_', 1) == 1
+        )
+
+    @classmethod
+    def from_estimator(cls, estimator):
+        """Flatten a fitted RandomForestClassifier or DecisionTreeClassifier"""
+        if not cls.supports(estimator):
+            raise ValueError(f'Cannot flatten {type(estimator).__name__}')
+
+        trees = [tree.tree_ for tree in _trees(estimator)]
+        n_classes = int(estimator.n_classes_)
+
+        node_counts = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(node_counts)[:-1]])
+
+        features, thresholds, lefts, rights, values = [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            node_ids = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :n_classes].astype(np.float64)
+            normalizer = proba.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(proba / normalizer)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            value=np.concatenate(values),
+            roots=offsets.astype(np.int32),
+            classes=np.asarray(estimator.classes_),
+            max_depth=max(tree.max_depth for tree in trees)
+        )
+
+    def predict_proba(self, X):
+        """Class probabilities for every row of X, averaged over all trees"""
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+
+        # One lane per (tree, row), tree-major so the final sum adds trees in
+        # the same order as sklearn
+        nodes = np.repeat(self.roots, n_rows)
+        offsets = np.tile(np.arange(n_rows) * n_features, self.n_estimators)
+
+        # Only lanes still on a split node take another step
+        active = np.flatnonzero(~self._is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            go_left = flat_X[offsets[active] + self.feature[current]] <= self.threshold[current]
+            nodes[active] = current = np.where(go_left, self.left[current], self.right[current])
+            active = active[~self._is_leaf[current]]
+
+        proba = self.value[nodes].reshape(self.n_estimators, n_rows, self.n_classes_)
+        return proba.sum(axis=0) / self.n_estimators
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def preload(self):
+        """Read every node array once so the first predictions don't fault pages in"""
+        for name in ('feature', 'threshold', 'left', 'right', 'value', 'roots'):
+            np.add.reduce(getattr(self, name), axis=None)
+
+    @property
+    def is_mapped(self):
+        """True when the node arrays are views of memory-mapped files"""
+        return isinstance(self.value.base, np.memmap) or isinstance(self.value, np.memmap)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ('feature', 'threshold', 'left', 'right', 'value', 'roots'))
+
+    def save(self, directory, source_path=None):
+        """Write the arrays as .npy files (each replaced atomically)"""
+        os.makedirs(directory, exist_ok=True)
+        arrays = {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'left': self.left,
+            'right': self.right,
+            'value': self.value,
+            'roots': self.roots,
+            'classes': self.classes_,
+        }
+        for name, array in arrays.items():
+            path = os.path.join(directory, f'{name}.npy')
+            with open(f'{path}.tmp', 'wb') as f:
+                np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+            os.replace(f'{path}.tmp', path)
+
+        meta = {
+            'max_depth': self.max_depth,
+            'n_estimators': self.n_estimators,
+            'n_classes': self.n_classes_,
+            'source': source_fingerprint(source_path) if source_path else None,
+        }
+        meta_path = os.path.join(directory, META_FILE)
+        with open(f'{meta_path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(f'{meta_path}.tmp', meta_path)
+
+    @classmethod
+    def load(cls, directory, source_path=None, mmap_mode=None):
+        """
+        Load a saved export, or return None if it is missing or was made from a
+        different version of ``source_path``.
+
+        ``mmap_mode='r'`` maps the arrays instead of reading them into memory.
+        """
+        meta_path = os.path.join(directory, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if source_path and meta.get('source') != source_fingerprint(source_path):
+            return None
+
+        # np.asarray drops the memmap subclass (plain ndarray views of the
+        # mapping), so indexing results are ordinary arrays
+        arrays = {
+            name: np.asarray(np.load(os.path.join(directory, f'{name}.npy'),
+                                     mmap_mode=mmap_mode, allow_pickle=False))
+            for name in ARRAY_NAMES
+        }
+        return cls(max_depth=meta['max_depth'], **arrays)
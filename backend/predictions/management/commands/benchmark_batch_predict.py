@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+import contextlib
+import io
+import time
+
+from predictions.model_registry import model_registry
+from predictions.sample_profiles import make_profiles
+
+
+class Command(BaseCommand):
+    help = 'Compare single-row and batch prediction throughput (rows/s)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000,
+                            help='Number of profiles to score')
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Rows per forest call in batch mode')
+
+    def handle(self, *args, **options):
+        n_rows = options['rows']
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            predictor = model_registry.get_predictor()
+        profiles = make_profiles(n_rows)
+
+        self.stdout.write(f'Scoring {n_rows} profiles...')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            for profile in profiles:
+                predictor.predict(profile)
+            single_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            predictor.predict_batch(profiles, chunk_size=options['chunk_size'])
+            batch_time = time.perf_counter() - start_time
+
+        self.stdout.write(f"\n{'mode':<14}{'seconds':>10}{'rows/s':>12}")
+        self.stdout.write(f"{'single-row':<14}{single_time:>10.2f}{n_rows / single_time:>12.0f}")
+        self.stdout.write(f"{'batch':<14}{batch_time:>10.2f}{n_rows / batch_time:>12.0f}")
+        self.stdout.write(self.style.SUCCESS(f'\nBatch speedup: {single_time / batch_time:.1f}x'))
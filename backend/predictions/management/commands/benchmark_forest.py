@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+import contextlib
+import io
+import os
+import time
+import joblib
+import numpy as np
+
+from predictions.flat_forest import FlatForest
+from predictions.ml_service import JobPredictionService, get_model_dir
+from predictions.sample_profiles import make_profiles
+
+
+class Command(BaseCommand):
+    help = 'Compare sklearn and flattened-forest inference (load time, latency, memory)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Number of timed single-row predictions')
+        parser.add_argument('--rows', type=int, default=5000,
+                            help='Rows in the timed batch prediction')
+
+    def handle(self, *args, **options):
+        with contextlib.redirect_stdout(io.StringIO()):
+            service = JobPredictionService()
+
+        model_path = os.path.join(get_model_dir(), 'random_forest_model.joblib')
+        start_time = time.perf_counter()
+        sklearn_model = joblib.load(model_path)
+        sklearn_load = time.perf_counter() - start_time
+
+        export_dir = os.path.join(get_model_dir(), 'flat_forest')
+        start_time = time.perf_counter()
+        forest = FlatForest.load(export_dir, source_path=model_path)
+        flat_load = time.perf_counter() - start_time
+        if forest is None:
+            forest = FlatForest.from_estimator(sklearn_model)
+
+        single = service.feature_plan.transform_many(make_profiles(1))
+        batch = service.feature_plan.transform_many(make_profiles(options['rows']))
+
+        max_diff = np.abs(forest.predict_proba(batch) - sklearn_model.predict_proba(batch)).max()
+
+        self.stdout.write(f"\n{'engine':<10}{'load (ms)':>12}{'single p50 (ms)':>18}"
+                          f"{'batch rows/s':>15}{'size (KB)':>12}")
+        rows = [
+            ('sklearn', sklearn_model, sklearn_load, os.path.getsize(model_path)),
+            ('flat', forest, flat_load, forest.nbytes),
+        ]
+        for name, engine, load_time, size in rows:
+            latencies = []
+            for _ in range(options['requests']):
+                start_time = time.perf_counter()
+                engine.predict_proba(single)
+                latencies.append((time.perf_counter() - start_time) * 1000)
+
+            start_time = time.perf_counter()
+            engine.predict_proba(batch)
+            rows_per_second = len(batch) / (time.perf_counter() - start_time)
+
+            self.stdout.write(
+                f"{name:<10}{load_time * 1000:>12.1f}{np.percentile(latencies, 50):>18.3f}"
+                f"{rows_per_second:>15.0f}{size / 1024:>12.0f}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'\nmax |Δ probability| = {max_diff:.2e}'))
@@ -0,0 +1,142 @@
+from django.core.management.base import BaseCommand
+from collections import Counter
+from datetime import timedelta
+import json
+import random
+import time
+
+from django.db import connection
+from django.db.models import Avg
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from admin_panel.bulk import bulk_insert
+from admin_panel.pagination import KeysetPagination
+from predictions.models import PredictionHistory
+from predictions.serializers import PredictionHistorySerializer
+from predictions.skill_snapshots import record_skill_snapshots
+from predictions.views import PredictionHistoryView
+from users.models import User
+from predictions.sample_profiles import SAMPLE_PROFILE
+
+ROLES = ['Data Scientist', 'Software Engineer', 'Web Developer', 'DevOps Engineer',
+         'Data Analyst', 'Machine Learning Engineer', 'Cloud Architect', 'Business Analyst']
+
+
+def legacy_listing(user):
+    """What the history listing returned before pagination: every row, with per-row user lookups"""
+    queryset = PredictionHistory.objects.filter(user=user).order_by('-created_at')
+    roles = [prediction.top_prediction for prediction in queryset]
+    most_common = Counter(roles).most_common(1)
+    return {
+        'predictions': PredictionHistorySerializer(queryset, many=True).data,
+        'statistics': {
+            'total_predictions': queryset.count(),
+            'average_confidence': round(queryset.aggregate(Avg('confidence_score'))['confidence_score__avg'] or 0, 2),
+            'most_predicted_role': {'role': most_common[0][0], 'count': most_common[0][1]} if most_common else None,
+            'last_prediction': queryset.first().created_at.isoformat() if queryset.exists() else None
+        }
+    }
+
+
+def make_history_rows(user, count, seed=0):
+    """Unsaved PredictionHistory rows shaped like real predictions, spread over a year"""
+    rng = random.Random(seed)
+    now = timezone.now()
+    input_data = json.loads(json.dumps(SAMPLE_PROFILE))
+    rows = []
+    for _ in range(count):
+        role = rng.choice(ROLES)
+        created_at = now - timedelta(minutes=rng.uniform(0, 365 * 24 * 60))
+        rows.append(PredictionHistory(
+            user=user,
+            input_data=input_data,
+            top_prediction=role,
+            confidence_score=round(rng.uniform(55, 98), 2),
+            all_predictions=[
+                {'job_role': other, 'confidence_score': round(rng.uniform(5, 90), 2),
+                 'salary_range': {'min': 600000, 'max': 1800000, 'currency': 'INR'}}
+                for other in rng.sample(ROLES, 5)
+            ],
+            missing_skills=rng.sample(['Docker', 'Kubernetes', 'Spark', 'Tableau', 'AWS', 'Go'], 3),
+            salary_range={'min': 600000, 'max': 1800000, 'currency': 'INR'},
+            market_demand='High',
+            training_required='Consider short courses in the missing skills',
+            created_at=created_at,
+            updated_at=created_at
+        ))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Compare the old full prediction history listing with keyset pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--predictions', type=int, default=10000,
+                            help='Predictions of the benchmark user')
+        parser.add_argument('--page-size', type=int, default=KeysetPagination.page_size)
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Requests per measurement (the best time is reported)')
+        parser.add_argument('--cleanup', action='store_true',
+                            help='Delete the benchmark user and predictions afterwards')
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(email='history-benchmark@example.com',
+                                             defaults={'name': 'History Benchmark'})
+        self._fill(user, options['predictions'])
+        factory = APIRequestFactory()
+        view = PredictionHistoryView.as_view()
+
+        def page(cursor=None):
+            params = {'page_size': options['page_size']}
+            if cursor:
+                params['cursor'] = cursor
+            request = factory.get('/api/predictions/history/', params)
+            force_authenticate(request, user=user)
+            response = view(request)
+            response.render()
+            return response.content
+
+        # Cursor for the last page, found outside the timing
+        last_rows = list(PredictionHistory.objects.filter(user=user).order_by('-created_at', '-id')
+                         .only('id', 'created_at')[max(options['predictions'] - options['page_size'] - 1, 0):][:1])
+        deep_cursor = KeysetPagination().encode_cursor(last_rows[0], reverse=False) if last_rows else None
+
+        results = [
+            ('full listing (before)', self._measure(lambda: JSONRenderer().render(legacy_listing(user)), options['repeat'])),
+            ('keyset, first page', self._measure(page, options['repeat'])),
+            ('keyset, last page', self._measure(lambda: page(deep_cursor), options['repeat'])),
+        ]
+
+        self.stdout.write(f"\n{'listing':<24}{'ms':>10}{'queries':>10}{'KB':>10}")
+        for label, (seconds, queries, size) in results:
+            self.stdout.write(f'{label:<24}{seconds * 1000:>10.1f}{queries:>10}{size / 1024:>10.1f}')
+
+        if options['cleanup']:
+            user.delete()
+
+    def _measure(self, fetch, repeat):
+        best = None
+        for _ in range(repeat):
+            queries = []
+
+            def count_query(execute, sql, params, many, context):
+                queries.append(sql)
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(count_query):
+                start_time = time.perf_counter()
+                body = fetch()
+                elapsed = time.perf_counter() - start_time
+            best = elapsed if best is None else min(best, elapsed)
+        return best, len(queries), len(body)
+
+    def _fill(self, user, count):
+        missing = count - PredictionHistory.objects.filter(user=user).count()
+        if missing <= 0:
+            return
+        self.stdout.write(f'Writing {missing} predictions...')
+        rows = make_history_rows(user, missing)
+        bulk_insert(PredictionHistory, rows)
+        record_skill_snapshots(rows)
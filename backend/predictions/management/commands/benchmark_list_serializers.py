@@ -0,0 +1,94 @@
+from django.core.management.base import BaseCommand
+import random
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+from admin_panel.bulk import bulk_insert
+from admin_panel.models import MLModel, PredictionLog
+from admin_panel.serializers import PredictionLogSerializer, PredictionLogSummarySerializer
+from predictions.models import PredictionHistory
+from predictions.serializers import PredictionHistoryListSerializer, PredictionHistorySerializer
+from users.models import User
+from .benchmark_history_listing import make_history_rows
+
+
+def make_log_rows(user, model, count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for history in make_history_rows(user, count, seed):
+        rows.append(PredictionLog(
+            user=user,
+            input_data=history.input_data,
+            prediction_result={
+                'job_role': history.top_prediction,
+                'confidence': history.confidence_score,
+                'all_predictions': history.all_predictions,
+                'missing_skills': history.missing_skills,
+            },
+            confidence_score=history.confidence_score / 100,
+            model_used=model,
+            model_version='1.0.0',
+            status=rng.choice(['success'] * 8 + ['flagged', 'failed']),
+            processing_time=rng.uniform(0.05, 0.5),
+            created_at=history.created_at
+        ))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Compare full and summary serializers of the prediction list views (bytes and time per 100 rows)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100,
+                            help='Rows per page')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Pages per measurement (the best time is reported)')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        user, _ = User.objects.get_or_create(email='serializer-benchmark@example.com',
+                                             defaults={'name': 'Serializer Benchmark'})
+        model = MLModel.objects.filter(name='Serializer Benchmark').first() or \
+            MLModel.objects.create(name='Serializer Benchmark', status='trained')
+
+        if PredictionHistory.objects.filter(user=user).count() < rows:
+            bulk_insert(PredictionHistory, make_history_rows(user, rows))
+        if PredictionLog.objects.filter(user=user).count() < rows:
+            bulk_insert(PredictionLog, make_log_rows(user, model, rows))
+
+        history = PredictionHistory.objects.filter(user=user).order_by('-created_at')
+        logs = PredictionLog.objects.filter(user=user).order_by('-created_at')
+        list_fields = [name for name in PredictionHistoryListSerializer.Meta.fields if name != 'formatted_date']
+        cases = [
+            ('history, full', lambda: history.select_related('user')[:rows], PredictionHistorySerializer),
+            ('history, list', lambda: history.only(*list_fields)[:rows], PredictionHistoryListSerializer),
+            ('prediction logs, full', lambda: logs.select_related('user', 'model_used', 'reviewed_by')[:rows],
+             PredictionLogSerializer),
+            ('prediction logs, summary', lambda: PredictionLogSummarySerializer.summary_queryset(logs)[:rows],
+             PredictionLogSummarySerializer),
+        ]
+
+        scale = 100 / rows
+        self.stdout.write(f"{'listing':<26}{'query ms':>10}{'serialize ms':>14}{'KB':>10}   (per 100 rows)")
+        for label, queryset, serializer_class in cases:
+            query_time, serialize_time, size = self._measure(queryset, serializer_class, options['repeat'])
+            self.stdout.write(f'{label:<26}{query_time * 1000 * scale:>10.2f}'
+                              f'{serialize_time * 1000 * scale:>14.2f}{size / 1024 * scale:>10.1f}')
+
+    def _measure(self, queryset, serializer_class, repeat):
+        best_query = best_serialize = None
+        size = 0
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            page = list(queryset())
+            query_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            body = JSONRenderer().render(serializer_class(page, many=True).data)
+            serialize_time = time.perf_counter() - start_time
+
+            best_query = query_time if best_query is None else min(best_query, query_time)
+            best_serialize = serialize_time if best_serialize is None else min(best_serialize, serialize_time)
+            size = len(body)
+        return best_query, best_serialize, size
@@ -0,0 +1,87 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework.test import APIClient
+from unittest import mock
+import contextlib
+import io
+import time
+import numpy as np
+
+from predictions.ml_service import JobPredictionService
+from predictions.model_registry import model_registry
+from predictions.prediction_cache import PredictionCache, LRUBackend
+from predictions.sample_profiles import SAMPLE_PROFILE
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark /api/predictions/predict/ latency with and without the model registry'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Number of timed requests per mode')
+        parser.add_argument('--warmup', type=int, default=3,
+                            help='Untimed requests before each mode')
+
+    def handle(self, *args, **options):
+        n_requests = options['requests']
+        warmup = options['warmup']
+
+        self.stdout.write(f'Benchmarking {n_requests} requests per mode...')
+
+        # Make sure artifacts exist on disk before timing anything
+        with contextlib.redirect_stdout(io.StringIO()):
+            model_registry.get_predictor()
+
+        results = {}
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email='benchmark-predict@edu2job.local',
+                name='Benchmark User',
+                password=None
+            )
+            client = APIClient()
+            client.force_authenticate(user=user)
+
+            # The same profile is posted every time, so the result cache is
+            # only enabled for the mode that measures it
+            with mock.patch('predictions.views.prediction_cache', PredictionCache()):
+                # Before: every request constructs (and loads) its own service
+                with mock.patch('predictions.views.get_predictor', JobPredictionService):
+                    results['per-request load'] = self._run(client, n_requests, warmup)
+
+                # After: every request shares the registry's predictor
+                results['shared registry'] = self._run(client, n_requests, warmup)
+
+            # Repeat submissions served from the prediction cache
+            with mock.patch('predictions.views.prediction_cache', PredictionCache(LRUBackend())):
+                results['cached result'] = self._run(client, n_requests, warmup)
+
+            # Leave no benchmark rows behind
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"\n{'mode':<20}{'p50 (ms)':>12}{'p99 (ms)':>12}{'mean (ms)':>12}")
+        for mode, latencies in results.items():
+            self.stdout.write(
+                f"{mode:<20}{np.percentile(latencies, 50):>12.1f}"
+                f"{np.percentile(latencies, 99):>12.1f}{np.mean(latencies):>12.1f}"
+            )
+
+        speedup = np.percentile(results['per-request load'], 50) / np.percentile(results['shared registry'], 50)
+        self.stdout.write(self.style.SUCCESS(f'\np50 speedup: {speedup:.1f}x'))
+
+    def _run(self, client, n_requests, warmup):
+        latencies = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(warmup + n_requests):
+                start_time = time.perf_counter()
+                response = client.post('/api/predictions/predict/', SAMPLE_PROFILE, format='json')
+                elapsed = (time.perf_counter() - start_time) * 1000
+
+                if response.status_code != 200:
+                    raise RuntimeError(f'Prediction request failed: {response.status_code} {response.data}')
+                if i >= warmup:
+                    latencies.append(elapsed)
+        return latencies
@@ -0,0 +1,102 @@
+from django.core.management.base import BaseCommand
+from unittest import mock
+import contextlib
+import io
+import logging
+import os
+import time
+import numpy as np
+
+from predictions.ml_service import top_k
+from predictions.model_registry import model_registry
+from predictions.sample_profiles import make_profiles
+
+
+def argsort_top5(service, probabilities):
+    """The former ranking: full argsort and inverse_transform of every row"""
+    top_indices = np.argsort(probabilities, axis=1)[:, -5:][:, ::-1]
+    top_jobs = service.label_encoder.inverse_transform(top_indices.ravel()).reshape(top_indices.shape)
+    return top_jobs, np.take_along_axis(probabilities, top_indices, axis=1) * 100
+
+
+def partial_top5(service, probabilities):
+    top_indices, top_probabilities = top_k(probabilities)
+    return service.class_names[top_indices], top_probabilities * 100
+
+
+def print_row(input_data, top_jobs, top_confidences):
+    """The former per-request debug output"""
+    print(f"🔍 Making prediction with input data keys: {list(input_data.keys())}")
+    print(f"🎯 Top predictions: {list(zip(top_jobs, top_confidences))}")
+
+
+class Command(BaseCommand):
+    help = 'Per-row prediction overhead outside the forest (ranking, class names, logging, result dicts)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000,
+                            help='Profiles scored per timed run')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timed runs per measurement (the best is reported)')
+
+    def handle(self, *args, **options):
+        n_rows = options['rows']
+        repeat = options['repeat']
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            service = model_registry.get_predictor()
+        profiles = list(make_profiles(n_rows))
+
+        # The forest runs once here; every timing below reuses its output
+        probabilities = service._predict_proba(service.feature_plan.transform_many(profiles))
+        rows = [probabilities[i:i + 1] for i in range(n_rows)]
+        logger = logging.getLogger('predictions.ml_service')
+
+        def best(run):
+            timings = []
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start_time)
+            return min(timings) / n_rows * 1e6
+
+        def print_rows():
+            top_jobs, top_confidences = argsort_top5(service, probabilities)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for profile, jobs, confidences in zip(profiles, top_jobs, top_confidences):
+                    print_row(profile, jobs, confidences)
+
+        def log_rows():
+            top_indices, top_probabilities = top_k(probabilities)
+            service._log_top_predictions(top_indices, top_probabilities * 100)
+
+        results = [
+            ('top-5, one row at a time',
+             best(lambda: [argsort_top5(service, row) for row in rows]),
+             best(lambda: [partial_top5(service, row) for row in rows])),
+            ('top-5, whole matrix',
+             best(lambda: argsort_top5(service, probabilities)),
+             best(lambda: partial_top5(service, probabilities))),
+        ]
+        # Logging at the default INFO level: the ranked roles are never formatted
+        level = logger.level
+        logger.setLevel(logging.INFO)
+        try:
+            results.append(('debug output', best(print_rows), best(log_rows)))
+        finally:
+            logger.setLevel(level)
+
+        self.stdout.write(f"\n{'stage (us/row)':<28}{'before':>10}{'after':>10}{'speedup':>10}")
+        for stage, before, after in results:
+            self.stdout.write(f"{stage:<28}{before:>10.2f}{after:>10.2f}{before / after:>9.1f}x")
+
+        # Whole predict()/predict_batch() with the forest replaced by its precomputed output
+        def stub_proba(features):
+            return probabilities[:len(features)]
+
+        with mock.patch.object(service, '_predict_proba', stub_proba):
+            single = best(lambda: [service.predict(profile) for profile in profiles])
+            batch = best(lambda: service.predict_batch(profiles))
+
+        self.stdout.write(f"\n{'predict() without the forest':<38}{single:>10.2f} us/row")
+        self.stdout.write(f"{'predict_batch() without the forest':<38}{batch:>10.2f} us/row")
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+import os
+import time
+
+from predictions.ml_service import get_model_dir
+from predictions.synthetic_data import DEFAULT_CHUNK_SIZE, write_synthetic_data
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic job prediction training dataset of any size (CSV or Parquet)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000,
+                            help='Number of rows to generate')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Random seed (same seed and chunk size give the same data)')
+        parser.add_argument('--output', default=None,
+                            help='Output file (default: ml_model/saved_model/synthetic_data.csv)')
+        parser.add_argument('--format', choices=['csv', 'parquet'], default=None,
+                            help='Output format (default: from the file extension)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Rows generated and written per chunk')
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('--rows and --chunk-size must be positive')
+
+        output = options['output'] or os.path.join(get_model_dir(), 'synthetic_data.csv')
+
+        self.stdout.write(f"Generating {options['rows']:,} rows (seed {options['seed']}) -> {output}")
+        start_time = time.perf_counter()
+        try:
+            summary = write_synthetic_data(
+                output,
+                n_samples=options['rows'],
+                seed=options['seed'],
+                chunk_size=options['chunk_size'],
+                output_format=options['format']
+            )
+        except (ImportError, ValueError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - start_time
+
+        self.stdout.write(f"\n{'job role':<20}{'rows':>12}")
+        for role, count in sorted(summary['job_roles'].items(), key=lambda item: -item[1]):
+            self.stdout.write(f'{role:<20}{count:>12,}')
+
+        size_mb = os.path.getsize(output) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f"\nWrote {summary['rows']:,} rows ({size_mb:.1f} MB, {summary['format']}) "
+            f"in {elapsed:.1f}s ({summary['rows'] / elapsed:,.0f} rows/s)"
+        ))
@@ -0,0 +1,107 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from unittest import mock
+import contextlib
+import gc
+import io
+import multiprocessing
+import os
+
+from predictions.flat_forest import FlatForest
+from predictions.ml_service import JobPredictionService
+from predictions.sample_profiles import SAMPLE_PROFILE
+
+# How each simulated worker holds the model
+MODES = {
+    'joblib': 'unpickled sklearn forest (previous behaviour)',
+    'flat': 'flat arrays read into private memory',
+    'mmap': 'flat arrays memory-mapped (shared page cache)',
+}
+
+
+def read_memory(pid):
+    """RSS and PSS in KB for a process, from /proc/<pid>/smaps_rollup"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup', 'r', encoding='utf-8') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key.lower()] = int(rest.split()[0])
+    return values
+
+
+def _load_service(mode):
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'joblib':
+            # Skip the flat export entirely (and don't write one)
+            with mock.patch.object(FlatForest, 'load', return_value=None), \
+                    mock.patch.object(FlatForest, 'save'):
+                service = JobPredictionService()
+            service.forest = None
+        else:
+            with override_settings(ML_MODEL_MMAP=(mode == 'mmap')):
+                service = JobPredictionService()
+
+        # Touch every page a real worker would after serving traffic
+        service.predict(SAMPLE_PROFILE)
+    gc.collect()
+    return service
+
+
+def _worker(mode, ready, done):
+    service = _load_service(mode)
+    ready.release()
+    done.wait()
+    del service
+
+
+class Command(BaseCommand):
+    help = 'Report per-worker RSS/PSS with the model held via joblib, flat arrays or memory-mapped arrays'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Number of simulated worker processes per mode')
+        parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES),
+                            help='Modes to measure')
+
+    def handle(self, *args, **options):
+        if not os.path.exists('/proc/self/smaps_rollup'):
+            raise CommandError('This report needs /proc/<pid>/smaps_rollup (Linux 4.14+)')
+
+        n_workers = options['workers']
+
+        # Make sure the artifacts (and the flat export) exist before forking
+        _load_service('mmap')
+        gc.collect()
+
+        # Fork like gunicorn does (without --preload): workers share the
+        # imported code, then each loads the model itself
+        context = multiprocessing.get_context('fork')
+
+        self.stdout.write(f'Measuring {n_workers} workers per mode...\n')
+        self.stdout.write(f"{'mode':<8}{'RSS/worker (MB)':>18}{'PSS/worker (MB)':>18}{'total PSS (MB)':>17}")
+
+        for mode in options['modes']:
+            ready = context.Semaphore(0)
+            done = context.Event()
+            workers = [context.Process(target=_worker, args=(mode, ready, done)) for _ in range(n_workers)]
+            for worker in workers:
+                worker.start()
+
+            try:
+                for _ in workers:
+                    if not ready.acquire(timeout=120):
+                        raise CommandError(f'Timed out waiting for {mode} workers to load the model')
+                memory = [read_memory(worker.pid) for worker in workers]
+            finally:
+                done.set()
+                for worker in workers:
+                    worker.join(timeout=30)
+
+            rss = sum(m['rss'] for m in memory) / len(memory) / 1024
+            pss = sum(m['pss'] for m in memory) / len(memory) / 1024
+            self.stdout.write(f'{mode:<8}{rss:>18.1f}{pss:>18.1f}{pss * n_workers:>17.1f}')
+
+        self.stdout.write('')
+        for mode in options['modes']:
+            self.stdout.write(f'  {mode:<8}{MODES[mode]}')
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('predictions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionFeedback',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('rating', models.IntegerField(choices=[(1, '1 Star'), (2, '2 Stars'), (3, '3 Stars'), (4, '4 Stars'), (5, '5 Stars')])),
+                ('comment', models.TextField(blank=True)),
+                ('user_email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_reviewed', models.BooleanField(default=False)),
+                ('admin_notes', models.TextField(blank=True)),
+                ('prediction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feedbacks', to='predictions.predictionhistory')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Prediction Feedback',
+                'verbose_name_plural': 'Prediction Feedbacks',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_at', 'rating'], name='predictions_created_77102e_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0002_prediction_feedback'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='predictionhistory',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='predictions_user_id_f93aaa_idx'),
+        ),
+    ]
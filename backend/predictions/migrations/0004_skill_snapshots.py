@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_skill_snapshots(apps, schema_editor):
+    """Snapshot the skill levels of predictions saved before this migration"""
+    PredictionHistory = apps.get_model('predictions', 'PredictionHistory')
+    SkillSnapshot = apps.get_model('predictions', 'SkillSnapshot')
+
+    rows = []
+    history = PredictionHistory.objects.values_list('id', 'user_id', 'input_data', 'created_at')
+    for prediction_id, user_id, input_data, created_at in history.iterator(chunk_size=2000):
+        for key, value in (input_data or {}).items():
+            if not key.startswith('skill_') or isinstance(value, bool):
+                continue
+            try:
+                level = float(value)
+            except (TypeError, ValueError):
+                continue
+            rows.append(SkillSnapshot(user_id=user_id, prediction_id=prediction_id, skill=key[len('skill_'):],
+                                      level=level, created_at=created_at))
+        if len(rows) >= 5000:
+            SkillSnapshot.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    SkillSnapshot.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('predictions', '0003_history_user_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+                ('level', models.FloatField()),
+                ('created_at', models.DateTimeField()),
+                ('prediction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_snapshots', to='predictions.predictionhistory')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['user', 'skill', 'created_at'], name='predictions_user_id_ac403e_idx')],
+                'unique_together': {('prediction', 'skill')},
+            },
+        ),
+        migrations.RunPython(backfill_skill_snapshots, migrations.RunPython.noop),
+    ]
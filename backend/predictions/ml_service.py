@@ -9,32 +9,143 @@ from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 from django.conf import settings
-import traceback
+import logging
+import uuid
+
+from .columnar import ColumnarDataset, encode_labels, is_columnar
+from .feature_plan import FeaturePlan
+from .flat_forest import FlatForest
+from .role_knowledge import RoleKnowledge, salary_range
+from .synthetic_data import write_synthetic_data
+
+GENERATION_STAMP = 'model_generation'
+ROLE_GENERATION_STAMP = 'role_generation'
+FLAT_FOREST_DIR = 'flat_forest'
+TOP_K = 5
+
+logger = logging.getLogger(__name__)
+
+
+def get_model_dir():
+    """Directory holding the active model artifacts"""
+    return os.path.join(settings.BASE_DIR, 'ml_model', 'saved_model')
+
+
+def _read_stamp(model_dir, name):
+    stamp_path = os.path.join(model_dir or get_model_dir(), name)
+    try:
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _bump_stamp(model_dir, name):
+    model_dir = model_dir or get_model_dir()
+    os.makedirs(model_dir, exist_ok=True)
+    generation = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    
+    stamp_path = os.path.join(model_dir, name)
+    tmp_path = f"{stamp_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(generation)
+    os.replace(tmp_path, stamp_path)
+    return generation
+
+
+def read_model_generation(model_dir=None):
+    """Return the current generation stamp of the model directory (None if never stamped)"""
+    return _read_stamp(model_dir, GENERATION_STAMP)
+
+
+def bump_model_generation(model_dir=None):
+    """Mark the model directory as changed so running workers reload it"""
+    return _bump_stamp(model_dir, GENERATION_STAMP)
+
+
+def read_role_generation(model_dir=None):
+    """Return the stamp of the last JobRole change (None if roles never changed)"""
+    return _read_stamp(model_dir, ROLE_GENERATION_STAMP)
+
+
+def bump_role_generation(model_dir=None):
+    """Mark the job roles as changed so running workers rebuild their role details"""
+    return _bump_stamp(model_dir, ROLE_GENERATION_STAMP)
+
+
+def top_k(probabilities, k=TOP_K):
+    """
+    (indices, probabilities) of the k most likely classes of every row of a
+    probability matrix, most likely first.
+
+    np.argpartition selects the k columns in linear time and only those k are
+    sorted, instead of argsorting every row. Equal probabilities are ranked
+    by class index, highest first, as the former argsort ranking did; the few
+    rows with a tie across the k-th place are argsorted in full so the same
+    classes are kept.
+    """
+    probabilities = np.atleast_2d(probabilities)
+    n_rows, n_classes = probabilities.shape
+    k = min(k, n_classes)
+    rows = np.arange(n_rows)[:, None]
+    tied = None
+    if k < n_classes:
+        # Positions n-k-1 and n-k hold the (k+1)-th and k-th most likely class
+        partition = np.argpartition(probabilities, (n_classes - k - 1, n_classes - k), axis=1)
+        candidates = partition[:, n_classes - k:]
+        tied = (probabilities[rows[:, 0], partition[:, n_classes - k - 1]]
+                == probabilities[rows[:, 0], partition[:, n_classes - k]])
+    else:
+        candidates = np.broadcast_to(np.arange(n_classes), probabilities.shape)
+    values = probabilities[rows, candidates]
+    indices = candidates[rows, np.lexsort((-candidates, -values))]
+
+    if tied is not None and tied.any():
+        indices[tied] = np.argsort(probabilities[tied], axis=1, kind='stable')[:, ::-1][:, :k]
+    return indices, probabilities[rows, indices]
+
+
+def _atomic_dump(obj, path):
+    """joblib.dump through a temporary file so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
 
 class JobPredictionService:
-    def __init__(self):
+    def __init__(self, model_dir=None, auto_load=True):
         self.model = None
+        self.forest = None
         self.scaler = None
         self.label_encoder = None
         self.feature_columns = None
         self.salary_data = {}
         self.categorical_mappings = {}
+        self.feature_plan = None
+        self.role_knowledge = None
+        self.role_records = None
+        self.class_names = None
+        self.role_generation = None
         self.model_loaded = False
         self.model_info = {}
+        self.generation = None
         
         # Get the absolute base directory
         self.base_dir = settings.BASE_DIR
-        self.model_dir = os.path.join(self.base_dir, 'ml_model', 'saved_model')
+        self.model_dir = model_dir or get_model_dir()
         
         # Ensure directories exist
         os.makedirs(self.model_dir, exist_ok=True)
         
-        print(f"Looking for model files at: {self.model_dir}")
-        print(f"Model directory exists: {os.path.exists(self.model_dir)}")
+        if not auto_load:
+            # Caller will train or load explicitly (e.g. retraining)
+            return
+        
+        logger.debug('Looking for model files at %s (exists: %s)', self.model_dir, os.path.exists(self.model_dir))
         
         # Try to load existing model
         if not self.load_model():
-            print("Model not loaded, attempting to train...")
+            logger.info('Model not loaded, attempting to train')
             self.train_initial_model()
     
     def load_model(self):
@@ -45,20 +156,30 @@ class JobPredictionService:
             encoder_path = os.path.join(self.model_dir, 'label_encoder.joblib')
             metadata_path = os.path.join(self.model_dir, 'model_metadata.json')
             
-            print(f"Model path exists: {os.path.exists(model_path)}")
-            print(f"Scaler path exists: {os.path.exists(scaler_path)}")
-            print(f"Encoder path exists: {os.path.exists(encoder_path)}")
-            print(f"Metadata path exists: {os.path.exists(metadata_path)}")
+            logger.debug('Model files exist: model=%s scaler=%s encoder=%s metadata=%s',
+                         os.path.exists(model_path), os.path.exists(scaler_path),
+                         os.path.exists(encoder_path), os.path.exists(metadata_path))
             
             if not all([os.path.exists(model_path), 
                        os.path.exists(scaler_path), 
                        os.path.exists(encoder_path),
                        os.path.exists(metadata_path)]):
-                print("❌ Model files not found. Need to train model first.")
+                logger.info('Model files not found in %s; the model needs training', self.model_dir)
                 return False
             
-            # Load the model and preprocessing objects
-            self.model = joblib.load(model_path)
+            # Read the stamp first: if the files change while loading, the
+            # stamp we keep is the older one and the next check reloads
+            self.generation = read_model_generation(self.model_dir)
+            
+            # Load the model and preprocessing objects. The flattened forest
+            # export loads without unpickling the estimator; fall back to the
+            # joblib file when the export is missing or out of date.
+            self.forest = FlatForest.load(
+                os.path.join(self.model_dir, FLAT_FOREST_DIR),
+                source_path=model_path,
+                mmap_mode='r' if getattr(settings, 'ML_MODEL_MMAP', True) else None
+            )
+            self.model = joblib.load(model_path) if self.forest is None else None
             self.scaler = joblib.load(scaler_path)
             self.label_encoder = joblib.load(encoder_path)
             
@@ -80,23 +201,29 @@ class JobPredictionService:
                 'version': metadata.get('version', '1.0.0')
             }
             
+            self._compile_inference()
+
+            # Artifacts saved before the export existed: write it now so the
+            # next load can skip the joblib file
+            if self.model is not None and self.forest is not None:
+                try:
+                    self.forest.save(os.path.join(self.model_dir, FLAT_FOREST_DIR), source_path=model_path)
+                except OSError as e:
+                    logger.warning('Could not export flat forest: %s', e)
+
             self.model_loaded = True
-            print("✅ Model loaded successfully")
-            print(f"   Features: {len(self.feature_columns)}")
-            print(f"   Job Roles: {len(self.label_encoder.classes_)}")
+            logger.info('Model loaded: %d features, %d job roles',
+                        len(self.feature_columns), len(self.label_encoder.classes_))
             return True
             
         except Exception as e:
-            print(f"❌ Error loading model: {str(e)}")
-            print(f"Error details: {traceback.format_exc()}")
+            logger.exception('Loading the model from %s failed', self.model_dir)
             self.model_loaded = False
             return False
     
     def train_initial_model(self):
         """Train initial model with sample data or existing dataset"""
-        print("\n" + "="*60)
-        print("TRAINING NEW JOB PREDICTION MODEL")
-        print("="*60)
+        logger.info('Training a new job prediction model')
         
         try:
             # Check if dataset exists
@@ -110,11 +237,11 @@ class JobPredictionService:
             for path in dataset_paths:
                 if os.path.exists(path):
                     dataset_path = path
-                    print(f"✅ Found dataset at: {path}")
+                    logger.info('Found dataset at %s', path)
                     break
             
             if dataset_path is None:
-                print("❌ No dataset found. Creating synthetic data for initial training...")
+                logger.info('No dataset found; creating synthetic data for initial training')
                 # Create synthetic data for initial model
                 dataset_path = self.create_synthetic_data()
             
@@ -122,151 +249,33 @@ class JobPredictionService:
             accuracy = self.train_model(dataset_path)
             
             if accuracy > 0:
-                print(f"\n🎉 Model training completed successfully!")
-                print(f"📊 Model Accuracy: {accuracy:.2%}")
+                logger.info('Model training completed, accuracy %.2f%%', accuracy * 100)
                 self.model_loaded = True
             else:
-                print("❌ Model training failed, creating fallback model...")
+                logger.warning('Model training failed, creating fallback model')
                 self.create_fallback_model()
                 
         except Exception as e:
-            print(f"❌ Model training failed: {str(e)}")
-            print(f"Error details: {traceback.format_exc()}")
+            logger.exception('Model training failed')
             # Create a minimal working model even if training fails
             self.create_fallback_model()
     
-    def create_synthetic_data(self):
+    def create_synthetic_data(self, n_samples=1000, seed=42):
         """Create synthetic training data for initial model"""
-        print("Creating synthetic training data...")
-        
-        n_samples = 1000
+        logger.debug('Creating synthetic training data')
         
-        # Generate synthetic data
-        np.random.seed(42)
-        
-        data = {
-            'age': np.random.randint(22, 45, n_samples),
-            'gender': np.random.choice(['Male', 'Female', 'Other'], n_samples),
-            'highest_degree': np.random.choice(['High School', 'Bachelor', 'Master', 'PhD'], n_samples),
-            'degree_field': np.random.choice(['Computer Science', 'Engineering', 'Business', 'Science'], n_samples),
-            'institution_tier': np.random.choice(['Tier 1', 'Tier 2', 'Tier 3'], n_samples),
-            'gpa_score': np.round(np.random.uniform(6.0, 9.8, n_samples), 1),
-            'graduation_year': np.random.randint(2010, 2024, n_samples),
-            'years_since_graduation': 2024 - np.random.randint(2010, 2024, n_samples),
-            'total_experience_years': np.round(np.random.uniform(0, 15, n_samples), 1),
-            'additional_certs_count': np.random.randint(0, 10, n_samples),
-            'online_courses_completed': np.random.randint(0, 20, n_samples),
-            'research_publications': np.random.randint(0, 5, n_samples),
-            'professional_network_size': np.random.randint(50, 1000, n_samples),
-            'industry': np.random.choice(['Technology', 'Finance', 'Healthcare', 'Education'], n_samples),
-            'current_role_level': np.random.choice(['Entry', 'Mid', 'Senior', 'Lead'], n_samples),
-            'remote_work_percentage': np.random.randint(0, 101, n_samples),
-            
-            # Skills (0-10 scale)
-            'skill_python': np.random.randint(0, 11, n_samples),
-            'skill_java': np.random.randint(0, 11, n_samples),
-            'skill_javascript': np.random.randint(0, 11, n_samples),
-            'skill_sql': np.random.randint(0, 11, n_samples),
-            'skill_machine_learning': np.random.randint(0, 11, n_samples),
-            'skill_data_analysis': np.random.randint(0, 11, n_samples),
-            'skill_react': np.random.randint(0, 11, n_samples),
-            'skill_aws': np.random.randint(0, 11, n_samples),
-            'skill_communication': np.random.randint(3, 11, n_samples),
-            'skill_leadership': np.random.randint(3, 11, n_samples),
-            'skill_problem_solving': np.random.randint(3, 11, n_samples),
-            'skill_teamwork': np.random.randint(3, 11, n_samples),
-            
-            # Certifications
-            'cert_aws': np.random.choice([True, False], n_samples, p=[0.3, 0.7]),
-            'cert_google_cloud': np.random.choice([True, False], n_samples, p=[0.2, 0.8]),
-            'cert_azure': np.random.choice([True, False], n_samples, p=[0.2, 0.8]),
-            'cert_data_science': np.random.choice([True, False], n_samples, p=[0.25, 0.75]),
-            
-            # Calculated scores
-            'education_score': np.round(np.random.uniform(60, 100, n_samples), 1),
-            'tech_skill_score': np.round(np.random.uniform(50, 95, n_samples), 1),
-            'soft_skill_score': np.round(np.random.uniform(60, 100, n_samples), 1),
-            'overall_profile_score': np.round(np.random.uniform(65, 95, n_samples), 1)
-        }
-        
-        # Create DataFrame
-        df = pd.DataFrame(data)
-        
-        # Determine job role based on skills
-        def assign_job_role(row):
-            python = row['skill_python']
-            ml = row['skill_machine_learning']
-            data_analysis = row['skill_data_analysis']
-            java = row['skill_java']
-            js = row['skill_javascript']
-            react = row['skill_react']
-            aws = row['skill_aws']
-            sql = row['skill_sql']
-            
-            if ml >= 8 and python >= 8:
-                return 'Data Scientist'
-            elif ml >= 7 and python >= 7:
-                return 'ML Engineer'
-            elif data_analysis >= 7 and sql >= 7:
-                return 'Data Analyst'
-            elif (java >= 7 or js >= 7) and react >= 6:
-                return 'Software Engineer'
-            elif aws >= 7 and python >= 6:
-                return 'Cloud Engineer'
-            elif sql >= 6 and data_analysis >= 6:
-                return 'Business Analyst'
-            elif row['skill_leadership'] >= 7:
-                return 'Product Manager'
-            elif row['skill_problem_solving'] >= 8:
-                return 'Systems Analyst'
-            else:
-                return 'IT Consultant'
-        
-        df['predicted_job_role'] = df.apply(assign_job_role, axis=1)
-        
-        # Add salary data based on job role
-        salary_ranges = {
-            'Data Scientist': (80000, 150000),
-            'ML Engineer': (90000, 160000),
-            'Data Analyst': (60000, 120000),
-            'Software Engineer': (70000, 140000),
-            'Cloud Engineer': (90000, 170000),
-            'Business Analyst': (65000, 130000),
-            'Product Manager': (85000, 160000),
-            'IT Consultant': (70000, 140000),
-            'Systems Analyst': (60000, 120000)
-        }
-        
-        def assign_salary(row):
-            role = row['predicted_job_role']
-            min_salary, max_salary = salary_ranges.get(role, (50000, 100000))
-            exp_multiplier = 1 + (row['total_experience_years'] * 0.05)
-            skill_multiplier = 1 + (row['overall_profile_score'] - 70) / 100
-            
-            base_salary = np.random.uniform(min_salary, max_salary)
-            adjusted_salary = base_salary * exp_multiplier * skill_multiplier
-            
-            return {
-                'salary_min_usd': int(adjusted_salary * 0.8),
-                'salary_max_usd': int(adjusted_salary * 1.2)
-            }
-        
-        salaries = df.apply(assign_salary, axis=1)
-        df['salary_min_usd'] = [s['salary_min_usd'] for s in salaries]
-        df['salary_max_usd'] = [s['salary_max_usd'] for s in salaries]
-        
-        # Save synthetic data
+        # Generated and written in chunks, so large sizes don't need the whole
+        # dataset in memory
         synthetic_path = os.path.join(self.model_dir, 'synthetic_data.csv')
-        df.to_csv(synthetic_path, index=False)
-        print(f"✅ Synthetic data saved to: {synthetic_path}")
-        print(f"   Samples: {n_samples}")
-        print(f"   Job Roles: {df['predicted_job_role'].nunique()}")
+        summary = write_synthetic_data(synthetic_path, n_samples=n_samples, seed=seed)
+        logger.info('Synthetic data saved to %s: %d samples, %d job roles',
+                    synthetic_path, summary['rows'], len(summary['job_roles']))
         
         return synthetic_path
     
     def create_fallback_model(self):
         """Create a fallback model for emergency use"""
-        print("Creating fallback model...")
+        logger.debug('Creating fallback model')
         
         # Create minimal training data
         n_samples = 100
@@ -324,18 +333,14 @@ class JobPredictionService:
             'version': '1.0.0-fallback'
         }
         
+        self._compile_inference()
         self.model_loaded = True
-        print("✅ Fallback model created successfully")
+        logger.info('Fallback model created')
     
     def train_model(self, dataset_path):
         """Train model with given dataset"""
         try:
-            print(f"\n📊 Loading dataset from: {dataset_path}")
-            
-            # Load dataset
-            df = pd.read_csv(dataset_path)
-            print(f"✅ Dataset loaded. Shape: {df.shape}")
-            print(f"Columns: {list(df.columns)[:15]}...")  # Print first 15 columns
+            logger.debug('Loading dataset from %s', dataset_path)
             
             # Prepare features and target
             # Drop columns that shouldn't be used as features
@@ -350,28 +355,43 @@ class JobPredictionService:
                 'competition_level', 'remote_availability_score', 'location_adjusted_salary_multiplier'
             ]
             
+            # Load dataset: a CSV, or a columnar dataset directory (predictions.columnar)
+            # read without the dropped columns other than the target and salaries
+            if is_columnar(dataset_path):
+                columnar = ColumnarDataset(dataset_path)
+                keep = {'predicted_job_role', 'salary_min_usd', 'salary_max_usd'}
+                df = columnar.to_frame([col for col in columnar.columns
+                                        if col not in columns_to_drop or col in keep])
+                if 'predicted_job_role' in df.columns:
+                    df['predicted_job_role'] = df['predicted_job_role'].astype(object)
+            else:
+                df = pd.read_csv(dataset_path)
+            logger.debug('Dataset loaded. Shape: %s, first columns: %s', df.shape, list(df.columns)[:15])
+            
             # Only drop columns that exist
             columns_to_drop = [col for col in columns_to_drop if col in df.columns]
             df_features = df.drop(columns=columns_to_drop)
             
-            print(f"📈 Features shape after dropping columns: {df_features.shape}")
+            logger.debug('Features shape after dropping columns: %s', df_features.shape)
             
             # Handle missing values
             numeric_cols = df_features.select_dtypes(include=[np.number]).columns
             df_features[numeric_cols] = df_features[numeric_cols].fillna(df_features[numeric_cols].mean())
             
             # Fill categorical columns with mode
-            categorical_cols = df_features.select_dtypes(include=['object']).columns
+            categorical_cols = df_features.select_dtypes(include=['object', 'category']).columns
             for col in categorical_cols:
                 mode_value = df_features[col].mode()
-                df_features[col] = df_features[col].fillna(mode_value[0] if not mode_value.empty else 'Unknown')
+                fill_value = mode_value[0] if not mode_value.empty else 'Unknown'
+                if isinstance(df_features[col].dtype, pd.CategoricalDtype) and fill_value not in df_features[col].cat.categories:
+                    df_features[col] = df_features[col].cat.add_categories([fill_value])
+                df_features[col] = df_features[col].fillna(fill_value)
             
-            # Encode categorical variables
+            # Encode categorical variables (dictionary-encoded columns keep their codes)
             self.categorical_mappings = {}
             
             for col in categorical_cols:
-                le = LabelEncoder()
-                df_features[col] = le.fit_transform(df_features[col].astype(str))
+                df_features[col], le = encode_labels(df_features[col])
                 # Convert numpy types to Python types for JSON serialization
                 class_mapping = {}
                 for class_name, class_value in zip(le.classes_, le.transform(le.classes_)):
@@ -381,7 +401,7 @@ class JobPredictionService:
             
             # Prepare target variable
             if 'predicted_job_role' not in df.columns:
-                print("❌ Target column 'predicted_job_role' not found in dataset")
+                logger.warning("Target column 'predicted_job_role' not found in dataset")
                 # Create synthetic target
                 np.random.seed(42)
                 job_roles = ['Data Scientist', 'Software Engineer', 'Data Analyst', 'ML Engineer', 
@@ -391,7 +411,7 @@ class JobPredictionService:
             self.label_encoder = LabelEncoder()
             y = self.label_encoder.fit_transform(df['predicted_job_role'])
             
-            print(f"🎯 Target classes: {self.label_encoder.classes_}")
+            logger.debug('Target classes: %s', self.label_encoder.classes_)
             
             # Extract salary data
             if 'salary_min_usd' in df.columns and 'salary_max_usd' in df.columns:
@@ -421,11 +441,7 @@ class JobPredictionService:
             
             # Save feature columns
             self.feature_columns = df_features.columns.tolist()
-            print(f"🔧 Feature columns ({len(self.feature_columns)}):")
-            for i, col in enumerate(self.feature_columns[:20]):  # Show first 20
-                print(f"   {i+1:2d}. {col}")
-            if len(self.feature_columns) > 20:
-                print(f"   ... and {len(self.feature_columns) - 20} more")
+            logger.debug('Feature columns (%d): %s', len(self.feature_columns), self.feature_columns)
             
             # Scale features
             self.scaler = StandardScaler()
@@ -436,17 +452,17 @@ class JobPredictionService:
                 X, y, test_size=0.2, random_state=42, stratify=y
             )
             
-            print(f"📊 Training samples: {X_train.shape[0]}, Test samples: {X_test.shape[0]}")
+            logger.debug('Training samples: %d, test samples: %d', X_train.shape[0], X_test.shape[0])
             
             # Train model
-            print("🤖 Training Random Forest model...")
+            logger.debug('Training Random Forest model')
             self.model = RandomForestClassifier(
                 n_estimators=200,
                 max_depth=20,
                 min_samples_split=5,
                 min_samples_leaf=2,
                 random_state=42,
-                n_jobs=-1,
+                n_jobs=getattr(settings, 'TRAINING_MAX_THREADS', 1),
                 class_weight='balanced'
             )
             
@@ -456,9 +472,9 @@ class JobPredictionService:
             y_pred = self.model.predict(X_test)
             accuracy = accuracy_score(y_test, y_pred)
             
-            print(f"\n📋 Classification Report:")
-            print(classification_report(y_test, y_pred, 
-                                       target_names=self.label_encoder.classes_))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Classification report:\n%s', classification_report(
+                    y_test, y_pred, target_names=self.label_encoder.classes_))
             
             # Save model
             self.model_info = {
@@ -472,13 +488,13 @@ class JobPredictionService:
             }
             
             self.save_model()
+            self._compile_inference()
             self.model_loaded = True
             
             return accuracy
             
         except Exception as e:
-            print(f"❌ Error during model training: {str(e)}")
-            print(f"Error details: {traceback.format_exc()}")
+            logger.exception('Training the model on %s failed', dataset_path)
             return 0
     
     def save_model(self):
@@ -488,9 +504,17 @@ class JobPredictionService:
             os.makedirs(self.model_dir, exist_ok=True)
             
             # Save model and preprocessing objects
-            joblib.dump(self.model, os.path.join(self.model_dir, 'random_forest_model.joblib'))
-            joblib.dump(self.scaler, os.path.join(self.model_dir, 'scaler.joblib'))
-            joblib.dump(self.label_encoder, os.path.join(self.model_dir, 'label_encoder.joblib'))
+            model_path = os.path.join(self.model_dir, 'random_forest_model.joblib')
+            _atomic_dump(self.model, model_path)
+            _atomic_dump(self.scaler, os.path.join(self.model_dir, 'scaler.joblib'))
+            _atomic_dump(self.label_encoder, os.path.join(self.model_dir, 'label_encoder.joblib'))
+            
+            # Export the forest as flat arrays for fast loading and inference
+            if FlatForest.supports(self.model):
+                FlatForest.from_estimator(self.model).save(
+                    os.path.join(self.model_dir, FLAT_FOREST_DIR),
+                    source_path=model_path
+                )
             
             # Prepare metadata with proper type conversion for JSON serialization
             metadata = {
@@ -505,149 +529,156 @@ class JobPredictionService:
             }
             
             metadata_path = os.path.join(self.model_dir, 'model_metadata.json')
-            with open(metadata_path, 'w', encoding='utf-8') as f:
+            with open(f"{metadata_path}.tmp", 'w', encoding='utf-8') as f:
                 json.dump(metadata, f, indent=2, ensure_ascii=False)
+            os.replace(f"{metadata_path}.tmp", metadata_path)
+            
+            # Tell other workers a new model is on disk
+            self.generation = bump_model_generation(self.model_dir)
             
-            print(f"💾 Model saved to: {self.model_dir}")
-            print(f"📄 Metadata saved to: {metadata_path}")
+            logger.info('Model saved to %s', self.model_dir)
             
         except Exception as e:
-            print(f"❌ Error saving model: {str(e)}")
-            print(f"Error details: {traceback.format_exc()}")
+            logger.exception('Saving the model to %s failed', self.model_dir)
     
     def predict(self, input_data):
         """Make job prediction based on input features"""
-        if not self.model_loaded or self.model is None:
+        if not self.model_loaded or (self.model is None and self.forest is None):
             return {
                 'success': False,
                 'error': 'Model not loaded. Please train or load model first.'
             }
         
         try:
-            print(f"🔍 Making prediction with input data keys: {list(input_data.keys())}")
-            
-            # Create a copy of input data to avoid modifying original
-            processed_data = input_data.copy()
-            
-            # Encode categorical variables using stored mappings
-            for col, mapping in self.categorical_mappings.items():
-                if col in processed_data:
-                    value = str(processed_data[col])
-                    if value in mapping:
-                        processed_data[col] = mapping[value]
-                    else:
-                        # Default encoding for unseen values
-                        processed_data[col] = 0
-            
-            # Convert input data to DataFrame
-            input_df = pd.DataFrame([processed_data])
-            
-            print(f"📊 Input data sample (first 10 items): {dict(list(processed_data.items())[:10])}")
-            
-            # Add missing columns with default values
-            for col in self.feature_columns:
-                if col not in input_df.columns:
-                    # Provide default values for missing columns
-                    if 'skill_' in col:
-                        input_df[col] = 5  # Default skill level
-                    elif 'cert_' in col:
-                        input_df[col] = 0  # Default certification status
-                    elif col in ['age', 'gpa_score', 'total_experience_years']:
-                        # Use reasonable defaults for key features
-                        if col == 'age':
-                            input_df[col] = 25
-                        elif col == 'gpa_score':
-                            input_df[col] = 7.5
-                        elif col == 'total_experience_years':
-                            input_df[col] = 3
-                    elif col == 'years_since_graduation':
-                        # Calculate from graduation year if available
-                        if 'graduation_year' in processed_data:
-                            input_df[col] = 2024 - processed_data['graduation_year']
-                        else:
-                            input_df[col] = 5
-                    else:
-                        input_df[col] = 0
-            
-            # Ensure correct column order
-            input_df = input_df[self.feature_columns]
-            
-            # Convert all columns to numeric
-            input_df = input_df.apply(pd.to_numeric, errors='coerce')
-            input_df = input_df.fillna(0)
-            
-            print(f"📊 Input shape for prediction: {input_df.shape}")
-            print(f"📊 Input data types: {input_df.dtypes.tolist()}")
-            print(f"📊 First few values: {input_df.iloc[0].tolist()[:10]}")
-            
-            # Scale features
-            scaled_features = self.scaler.transform(input_df)
+            # Assemble the scaled feature row (no pandas on the request path)
+            scaled_features = self.feature_plan.transform(input_data)
             
             # Get predictions with probabilities
-            probabilities = self.model.predict_proba(scaled_features)[0]
+            probabilities = self._predict_proba(scaled_features)
             
             # Get top 5 predictions
-            top_indices = np.argsort(probabilities)[-5:][::-1]
-            top_jobs = self.label_encoder.inverse_transform(top_indices)
-            top_confidences = probabilities[top_indices] * 100  # Convert to percentage
-            
-            print(f"🎯 Top predictions: {list(zip(top_jobs, top_confidences))}")
-            
-            # Prepare predictions list
-            predictions = []
-            for i, (job, confidence) in enumerate(zip(top_jobs, top_confidences)):
-                job_info = {
-                    'rank': i + 1,
-                    'job_role': str(job),
-                    'confidence_score': round(float(confidence), 2),
-                    'salary_range': self._get_salary_range(job),
-                    'market_demand': self._get_market_demand(confidence),
-                    'required_skills': self._get_required_skills(job),
-                    'growth_outlook': self._get_growth_outlook(job)
-                }
-                predictions.append(job_info)
-            
-            # Identify missing skills for top prediction
-            missing_skills = self._identify_missing_skills(input_data, predictions[0])
-            
-            # Calculate training requirements
-            training_months = self._calculate_training_months(len(missing_skills))
+            top_indices, top_probabilities = top_k(probabilities)
+            top_confidences = top_probabilities * 100  # Convert to percentage
+            self._log_top_predictions(top_indices, top_confidences)
             
-            return {
-                'success': True,
-                'top_prediction': predictions[0]['job_role'],
-                'confidence_score': predictions[0]['confidence_score'],
-                'all_predictions': predictions,
-                'missing_skills': missing_skills[:3],  # Top 3 missing skills
-                'salary_range': predictions[0]['salary_range'],
-                'market_demand': predictions[0]['market_demand'],
-                'training_required': f"Estimated {training_months} months of focused training",
-                'training_months': training_months,
-                'model_version': self.get_model_version(),
-                'model_accuracy': f"{self.get_model_accuracy()*100:.1f}%"
-            }
+            return self._build_result(input_data, self.role_records[top_indices[0]], top_confidences[0])
             
         except Exception as e:
-            print(f"❌ Prediction error: {str(e)}")
-            print(f"Error details: {traceback.format_exc()}")
+            logger.exception('Prediction failed')
             return {
                 'success': False,
                 'error': f"Prediction error: {str(e)}"
             }
     
-    def _get_salary_range(self, job_role):
-        """Get salary range for a job role"""
-        default_range = {'min': 40000, 'max': 120000, 'currency': 'USD'}
+    def predict_batch(self, records, chunk_size=1000):
+        """
+        Make job predictions for many validated input dicts.
+        
+        Features for each chunk are assembled into one matrix and the forest
+        is called once per chunk instead of once per row. Returns one result
+        dict per record, in input order.
+        """
+        if not self.model_loaded or (self.model is None and self.forest is None):
+            return [{
+                'success': False,
+                'error': 'Model not loaded. Please train or load model first.'
+            } for _ in records]
         
-        if job_role in self.salary_data:
-            salary = self.salary_data[job_role]
-            return {
-                'min': int(salary.get('salary_min_usd', 40000)),
-                'max': int(salary.get('salary_max_usd', 120000)),
-                'currency': 'USD'
-            }
+        results = []
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start:start + chunk_size]
+            
+            features = self.feature_plan.transform_many(chunk)
+            probabilities = self._predict_proba(features)
+            
+            # Top 5 for every row, highest first
+            top_indices, top_probabilities = top_k(probabilities)
+            top_records = self.role_records[top_indices]
+            top_confidences = top_probabilities * 100
+            self._log_top_predictions(top_indices, top_confidences)
+            
+            for input_data, roles, confidences in zip(chunk, top_records, top_confidences):
+                results.append(self._build_result(input_data, roles, confidences))
+        
+        return results
+    
+    def warm_up(self):
+        """Run one dummy prediction (all default features) through the full inference path"""
+        if not self.model_loaded:
+            return False
+        if self.forest is not None:
+            self.forest.preload()
+        self._predict_proba(self.feature_plan.transform({}))
+        return True
+    
+    def _compile_inference(self):
+        """Precompile feature assembly and the flattened forest for the current model"""
+        self.feature_plan = FeaturePlan(self.feature_columns, self.categorical_mappings, self.scaler)
+        
+        if self.model is not None:
+            self.forest = FlatForest.from_estimator(self.model) if FlatForest.supports(self.model) else None
         
-        return default_range
+        self.refresh_role_knowledge()
+    
+    def refresh_role_knowledge(self):
+        """Rebuild the per-role details (e.g. after a JobRole changed)"""
+        # Stamp first: a change made while building triggers another rebuild
+        role_generation = read_role_generation(self.model_dir)
+        knowledge = RoleKnowledge.build(self.label_encoder.classes_, self.salary_data)
+        self.role_knowledge = knowledge
+        # Name and record of every class, in label encoder order
+        self.class_names = np.asarray([str(name) for name in self.label_encoder.classes_], dtype=object)
+        self.role_records = knowledge.records_for(self.class_names)
+        self.role_generation = role_generation
+    
+    def _predict_proba(self, features):
+        """Class probabilities from the flattened forest (or the raw estimator)"""
+        estimator = self.forest if self.forest is not None else self.model
+        return estimator.predict_proba(features)
+    
+    def _log_top_predictions(self, top_indices, top_confidences):
+        """Debug log of the ranked classes of each scored row (built only when DEBUG is enabled)"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        for indices, confidences in zip(top_indices, top_confidences):
+            top = [(name, round(float(confidence), 2))
+                   for name, confidence in zip(self.class_names[indices], confidences)]
+            logger.debug('Top predictions: %s', top, extra={'top_predictions': top})
+    
+    def _build_result(self, input_data, top_records, top_confidences):
+        """Turn the records of the top predicted roles into the prediction response dict"""
+        predictions = []
+        for i, (record, confidence) in enumerate(zip(top_records, top_confidences)):
+            job_info = {
+                'rank': i + 1,
+                'job_role': record.name,
+                'confidence_score': round(float(confidence), 2),
+                'salary_range': salary_range(record),
+                'market_demand': self._get_market_demand(confidence),
+                'required_skills': list(record.required_skills),
+                'growth_outlook': record.growth_outlook
+            }
+            predictions.append(job_info)
+        
+        # Identify missing skills for top prediction
+        missing_skills = self._identify_missing_skills(input_data, predictions[0])
+        
+        # Calculate training requirements
+        training_months = self._calculate_training_months(len(missing_skills))
+        
+        return {
+            'success': True,
+            'top_prediction': predictions[0]['job_role'],
+            'confidence_score': predictions[0]['confidence_score'],
+            'all_predictions': predictions,
+            'missing_skills': missing_skills[:3],  # Top 3 missing skills
+            'salary_range': predictions[0]['salary_range'],
+            'market_demand': predictions[0]['market_demand'],
+            'training_required': f"Estimated {training_months} months of focused training",
+            'training_months': training_months,
+            'model_version': self.get_model_version(),
+            'model_accuracy': f"{self.get_model_accuracy()*100:.1f}%"
+        }
     
     def _get_market_demand(self, confidence):
         """Determine market demand based on confidence"""
@@ -660,64 +691,9 @@ class JobPredictionService:
         else:
             return 'Low'
     
-    def _get_required_skills(self, job_role):
-        """Get required skills for a job role"""
-        skill_mapping = {
-            'business_analyst': ['SQL', 'Excel', 'Power BI', 'Communication', 'Analytical Thinking'],
-            'data_analyst': ['SQL', 'Excel', 'Python', 'Statistics', 'Data Visualization'],
-            'data_scientist': ['Python', 'Machine Learning', 'Statistics', 'SQL', 'Data Visualization'],
-            'devops_engineer': ['AWS', 'Docker', 'Kubernetes', 'CI/CD', 'Linux'],
-            'financial_analyst': ['Excel', 'Financial Modeling', 'Accounting', 'Analysis', 'Communication'],
-            'frontend_developer': ['JavaScript', 'React', 'HTML/CSS', 'TypeScript', 'UI/UX'],
-            'ml_engineer': ['Python', 'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch'],
-            'product_manager': ['Product Strategy', 'Market Research', 'Agile', 'Communication', 'Leadership'],
-            'software_engineer': ['JavaScript', 'React', 'Node.js', 'Python', 'System Design'],
-            'ui_designer': ['Figma', 'UI Design', 'Prototyping', 'Visual Design', 'User Research'],
-            'ux_designer': ['User Research', 'Wireframing', 'Prototyping', 'Usability Testing', 'Figma'],
-            'Data Scientist': ['Python', 'Machine Learning', 'Statistics', 'SQL', 'Data Visualization'],
-            'Software Engineer': ['JavaScript', 'React', 'Node.js', 'Python', 'System Design'],
-            'Data Analyst': ['SQL', 'Excel', 'Python', 'Statistics', 'Data Visualization'],
-            'ML Engineer': ['Python', 'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch'],
-            'DevOps Engineer': ['AWS', 'Docker', 'Kubernetes', 'CI/CD', 'Linux'],
-            'Business Analyst': ['SQL', 'Excel', 'Power BI', 'Communication', 'Analytical Thinking'],
-            'Product Manager': ['Product Strategy', 'Market Research', 'Agile', 'Communication', 'Leadership'],
-            'Cloud Engineer': ['AWS', 'Azure', 'Docker', 'Kubernetes', 'Networking']
-        }
-        
-        return skill_mapping.get(str(job_role).lower(), ['Technical Skills', 'Problem Solving', 'Communication'])
-    
-    def _get_growth_outlook(self, job_role):
-        """Get growth outlook for a job role"""
-        growth_mapping = {
-            'business_analyst': 'Medium',
-            'data_analyst': 'High',
-            'data_scientist': 'Very High',
-            'devops_engineer': 'High',
-            'financial_analyst': 'Medium',
-            'frontend_developer': 'High',
-            'ml_engineer': 'Very High',
-            'product_manager': 'Medium',
-            'software_engineer': 'High',
-            'ui_designer': 'Medium',
-            'ux_designer': 'High',
-            'Data Scientist': 'Very High',
-            'ML Engineer': 'Very High',
-            'AI Engineer': 'Very High',
-            'Cloud Engineer': 'High',
-            'DevOps Engineer': 'High',
-            'Software Engineer': 'High',
-            'Data Analyst': 'High',
-            'Product Manager': 'Medium',
-            'Business Analyst': 'Medium',
-            'IT Consultant': 'Medium',
-            'Systems Analyst': 'Medium'
-        }
-        
-        return growth_mapping.get(str(job_role).lower(), 'Moderate')
-    
     def _identify_missing_skills(self, input_data, top_prediction):
         """Identify missing skills for the top predicted job"""
-        required_skills = self._get_required_skills(top_prediction['job_role'])
+        required_skills = top_prediction['required_skills']
         user_skills = []
         
         # Extract user skills from input data
@@ -792,7 +768,7 @@ class JobPredictionService:
             }
             
         except Exception as e:
-            print(f"❌ Retraining failed: {str(e)}")
+            logger.exception('Retraining failed')
             return {
                 'success': False,
                 'error': f"Retraining failed: {str(e)}"
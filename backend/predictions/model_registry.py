@@ -0,0 +1,282 @@
+"""
+Process-wide registry for the job prediction model.
+
+Loading the model means four joblib loads plus the metadata JSON. The
+registry does that once per worker process and hands the same read-only
+JobPredictionService to every request thread. It only loads saved artifacts:
+when there are none, the predictor it returns is not loaded (the views answer
+503) and a model has to be trained with ``manage.py train_model`` or a retrain
+job, never inside a request.
+
+Web workers warm the registry at boot (see predictions.apps): the model is
+loaded and one dummy prediction is run before /health/ready reports ready.
+
+When a model is retrained, the model directory's generation stamp changes.
+Each worker notices the new stamp on a later request, loads the new artifacts
+in a background thread and swaps the shared reference. Requests never wait
+for that load, and in-flight predictions finish on the predictor they already
+hold.
+
+Saving or deleting a JobRole bumps a separate role stamp in the same
+directory; each worker then rebuilds only the role details of its predictor.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from .ml_service import (
+    JobPredictionService, bump_role_generation, get_model_dir, read_model_generation, read_role_generation
+)
+from .prediction_cache import prediction_cache
+
+logger = logging.getLogger(__name__)
+
+
+def load_saved_service():
+    """A JobPredictionService with the saved artifacts loaded; model_loaded is False when there are none"""
+    predictor = JobPredictionService(auto_load=False)
+    predictor.load_model()
+    return predictor
+
+
+class ModelRegistry:
+    """Owns the loaded prediction model for the current process"""
+
+    def __init__(self, service_factory=load_saved_service, model_dir=None, poll_interval=None):
+        self._service_factory = service_factory
+        self._model_dir = model_dir
+        self._predictor = None
+        self._lock = threading.Lock()
+
+        # Hot-swap state
+        if poll_interval is None:
+            poll_interval = getattr(settings, 'ML_MODEL_POLL_INTERVAL', 5)
+        self.poll_interval = poll_interval
+        self.generation = None
+        self._next_check = 0
+        self._refresh_thread = None
+
+        # Load statistics (useful for status endpoints and benchmarks)
+        self.load_count = 0
+        self.load_time = None
+        self.loaded_at = None
+
+        # Warm-up state (reported by /health/ready)
+        self.warm = False
+        self.warmup_time = None
+        self.warmup_error = None
+        self._warmup_thread = None
+
+    @property
+    def model_dir(self):
+        return self._model_dir or get_model_dir()
+
+    def get_predictor(self):
+        """Return the shared predictor, loading it on first use"""
+        predictor = self._predictor
+        if predictor is not None:
+            self.check_for_update()
+            return predictor
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if self._predictor is None:
+                generation = read_model_generation(self.model_dir)
+                predictor = self._load()
+                if predictor.model_loaded:
+                    self._install(predictor, generation)
+                return predictor
+            return self._predictor
+
+    def warm_up(self):
+        """
+        Load the predictor and run a dummy prediction through it, so the first
+        real request pays for neither. Returns True when the model is warm.
+        """
+        start_time = time.perf_counter()
+        try:
+            predictor = self.get_predictor()
+            if not predictor.model_loaded:
+                raise RuntimeError('Prediction model could not be loaded')
+            predictor.warm_up()
+        except Exception as e:
+            self.warmup_error = str(e)
+            logger.exception('Prediction model warm-up failed')
+            return False
+
+        self.warmup_time = time.perf_counter() - start_time
+        self.warmup_error = None
+        self.warm = True
+        logger.info('Prediction model warm after %.2fs', self.warmup_time)
+        return True
+
+    def start_warm_up(self):
+        """Run warm_up() in a daemon thread; returns the thread (None if one is already running)"""
+        with self._lock:
+            if self._warmup_thread is not None and self._warmup_thread.is_alive():
+                return None
+            self._warmup_thread = threading.Thread(target=self.warm_up, name='model-warm-up', daemon=True)
+            self._warmup_thread.start()
+            return self._warmup_thread
+
+    def is_warming_up(self):
+        return self._warmup_thread is not None and self._warmup_thread.is_alive()
+
+    def status(self):
+        """Readiness details for health checks"""
+        predictor = self._predictor
+        return {
+            'ready': predictor is not None and self.warm,
+            'loaded': predictor is not None,
+            'warm': self.warm,
+            'warming_up': self.is_warming_up(),
+            'model_version': predictor.model_info.get('version') if predictor is not None else None,
+            'generation': self.generation,
+            'load_time': round(self.load_time, 4) if self.load_time is not None else None,
+            'warmup_time': round(self.warmup_time, 4) if self.warmup_time is not None else None,
+            'loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+            'error': self.warmup_error,
+        }
+
+    def check_for_update(self, force=False):
+        """
+        Start a background reload if the model directory has a new generation.
+
+        Checks are throttled to one every ``poll_interval`` seconds. A changed
+        job-role stamp rebuilds the current predictor's role details in place.
+        Returns the reload thread when one was started, otherwise None.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return None
+        self._next_check = now + self.poll_interval
+
+        predictor = self._predictor
+        if predictor is not None and hasattr(predictor, 'role_generation'):
+            if read_role_generation(self.model_dir) != predictor.role_generation:
+                self.refresh_role_knowledge()
+
+        generation = read_model_generation(self.model_dir)
+        if generation == self.generation:
+            return None
+
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return None
+            self._refresh_thread = threading.Thread(
+                target=self._refresh,
+                args=(generation,),
+                name='model-hot-swap',
+                daemon=True
+            )
+            self._refresh_thread.start()
+            return self._refresh_thread
+
+    def install(self, predictor, generation=None):
+        """Make an already loaded predictor the shared one"""
+        if generation is None:
+            generation = read_model_generation(self.model_dir)
+        with self._lock:
+            self._install(predictor, generation)
+
+    def reload(self):
+        """Load the artifacts from disk again and install the result"""
+        generation = read_model_generation(self.model_dir)
+        predictor = self._load()
+        if predictor.model_loaded:
+            self.install(predictor, generation)
+        return predictor
+
+    def refresh_role_knowledge(self):
+        """Rebuild the loaded predictor's per-role details and drop cached results"""
+        predictor = self._predictor
+        if predictor is None or not hasattr(predictor, 'refresh_role_knowledge'):
+            return
+        predictor.refresh_role_knowledge()
+        prediction_cache.invalidate()
+        logger.info('Rebuilt job role details for role generation %s', predictor.role_generation)
+
+    def publish_role_change(self):
+        """
+        Stamp a JobRole change in the model directory, so every worker rebuilds
+        its role details on its next check, and rebuild this process's now.
+        """
+        bump_role_generation(self.model_dir)
+        self.refresh_role_knowledge()
+
+    def clear(self):
+        """Forget the shared predictor; the next request loads it again"""
+        with self._lock:
+            self._predictor = None
+            self.generation = None
+            self.warm = False
+
+    def is_loaded(self):
+        return self._predictor is not None
+
+    def _refresh(self, generation):
+        try:
+            predictor = self._load()
+        except Exception:
+            logger.exception('Background model reload failed')
+            return
+
+        if not predictor.model_loaded:
+            logger.warning('Background model reload produced no model; keeping current model')
+            return
+
+        # Warm the new model before it takes traffic
+        try:
+            if hasattr(predictor, 'warm_up'):
+                predictor.warm_up()
+        except Exception:
+            logger.exception('Warm-up of the reloaded model failed; keeping current model')
+            return
+
+        # The files changed again while we were loading; the next check retries
+        if read_model_generation(self.model_dir) != generation:
+            logger.info('Model generation changed during reload; retrying later')
+            return
+
+        with self._lock:
+            self._install(predictor, generation)
+        logger.info('Hot-swapped prediction model to generation %s', generation)
+
+    def _load(self):
+        start_time = time.perf_counter()
+        predictor = self._service_factory()
+        self.load_time = time.perf_counter() - start_time
+        self.load_count += 1
+        return predictor
+
+    def _install(self, predictor, generation):
+        # A single reference assignment, so readers never see a half-built model
+        replaced = self._predictor is not None and self._predictor is not predictor
+        self._predictor = predictor
+        self.generation = generation
+        self.loaded_at = timezone.now()
+        self._next_check = time.monotonic() + self.poll_interval
+        if replaced:
+            prediction_cache.invalidate()
+
+    def _after_fork_in_child(self):
+        # Threads don't survive fork: drop a lock a loading thread may have held
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._warmup_thread = None
+
+
+model_registry = ModelRegistry()
+
+# gunicorn --preload forks workers after the app (and possibly a warm-up) started
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=model_registry._after_fork_in_child)
+
+
+def get_predictor():
+    """Shortcut for the process-wide predictor"""
+    return model_registry.get_predictor()
@@ -28,10 +28,36 @@ class PredictionHistory(models.Model):
         verbose_name = 'Prediction History'
         verbose_name_plural = 'Prediction Histories'
         ordering = ['-created_at']
+        indexes = [
+            # Per-user history pages (keyset on created_at, id)
+            models.Index(fields=['user', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"Prediction for {self.user.email} - {self.top_prediction}"
 
+class SkillSnapshot(models.Model):
+    """One skill_* level from a prediction's input, kept for per-user skill trends"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skill_snapshots')
+    prediction = models.ForeignKey(PredictionHistory, on_delete=models.CASCADE, related_name='skill_snapshots')
+    
+    # Input key without the skill_ prefix, e.g. 'machine_learning'
+    skill = models.CharField(max_length=100)
+    level = models.FloatField()
+    
+    # The prediction's created_at
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['created_at']
+        unique_together = ('prediction', 'skill')
+        indexes = [
+            models.Index(fields=['user', 'skill', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.skill}={self.level} for {self.user_id} at {self.created_at}"
+
 class MLModelVersion(models.Model):
     version = models.CharField(max_length=50, unique=True)
     accuracy_score = models.FloatField()
@@ -137,6 +163,10 @@ class PredictionFeedback(models.Model):
         verbose_name = 'Prediction Feedback'
         verbose_name_plural = 'Prediction Feedbacks'
         ordering = ['-created_at']
+        indexes = [
+            # Timeline and rating aggregates in FeedbackStatsView
+            models.Index(fields=['created_at', 'rating']),
+        ]
     
     def __str__(self):
         return f"Feedback for {self.prediction.top_prediction} - {self.rating} stars"
\ No newline at end of file
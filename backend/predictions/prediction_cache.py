@@ -0,0 +1,204 @@
+"""
+Cache for single-profile prediction results.
+
+Users tend to submit the same form several times, and every submission used to
+re-run the forest and rebuild the salary/skills/outlook details. Results are
+cached under a hash of the validated PredictionInputSerializer data plus the
+version of the model and of the job-role details that produced them:
+
+    prediction:<model generation>:<role generation>:<model version>:<sha256 of the input>
+
+A retrained model gets a new generation stamp and a JobRole change a new role
+stamp, so entries built from the previous model or roles are never served
+again. The in-process LRU backend is also
+cleared whenever the registry installs a new predictor (see model_registry).
+
+Backends (settings.ML_PREDICTION_CACHE_BACKEND):
+    'lru'     per-process LRU (ML_PREDICTION_CACHE_SIZE entries)
+    'django'  the Django cache named by ML_PREDICTION_CACHE_ALIAS, shared by
+              all workers when that cache is (e.g. Redis or Memcached)
+    'none'    caching disabled
+Entries expire after ML_PREDICTION_CACHE_TTL seconds with either backend.
+"""
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+KEY_PREFIX = 'prediction'
+
+
+def _canonical_value(value):
+    # 8 and 8.0 are the same feature value; bools stay bools
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    return str(value)
+
+
+def canonical_input(input_data):
+    """Stable JSON text for a validated input dict (sorted keys, normalised numbers)"""
+    return json.dumps(
+        {str(key): _canonical_value(value) for key, value in input_data.items()},
+        sort_keys=True,
+        separators=(',', ':')
+    )
+
+
+def model_cache_version(predictor):
+    """Identifies the model and role details a predictor serves; changes on every retrain or JobRole change"""
+    generation = getattr(predictor, 'generation', None) or 'none'
+    role_generation = getattr(predictor, 'role_generation', None) or 'none'
+    return f"{generation}:{role_generation}:{predictor.model_info.get('version', '')}"
+
+
+def make_key(input_data, model_version):
+    digest = hashlib.sha256(canonical_input(input_data).encode('utf-8')).hexdigest()
+    return f'{KEY_PREFIX}:{model_version}:{digest}'
+
+
+class LRUBackend:
+    """Thread-safe in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries=1024, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DjangoCacheBackend:
+    """Stores entries in a configured Django cache"""
+
+    def __init__(self, alias='default', ttl=3600):
+        self.alias = alias
+        self.ttl = ttl
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        self.cache.set(key, value, timeout=self.ttl or None)
+
+    def clear(self):
+        # Keys carry the model version, so stale entries are simply never read
+        # again; clearing would wipe unrelated data from a shared cache
+        pass
+
+
+class PredictionCache:
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def predict(self, predictor, input_data):
+        """Return predictor.predict(input_data), served from the cache when possible"""
+        if not self.enabled:
+            return predictor.predict(input_data)
+
+        key = make_key(input_data, model_cache_version(predictor))
+        result = self.backend.get(key)
+        if result is not None:
+            self._count(hit=True)
+            return copy.deepcopy(result)
+
+        self._count(hit=False)
+        result = predictor.predict(input_data)
+        # Failures are not cached so a transient error is retried next time
+        if result.get('success'):
+            self.backend.set(key, copy.deepcopy(result))
+        return result
+
+    def invalidate(self):
+        """Drop entries of the previous model (called when a new model is installed)"""
+        if self.enabled:
+            self.backend.clear()
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            'backend': type(self.backend).__name__ if self.enabled else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if isinstance(self.backend, LRUBackend):
+            stats['entries'] = len(self.backend)
+            stats['evictions'] = self.backend.evictions
+        return stats
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+def build_prediction_cache():
+    """Create the cache described by the ML_PREDICTION_CACHE_* settings"""
+    backend_name = getattr(settings, 'ML_PREDICTION_CACHE_BACKEND', 'lru')
+    ttl = getattr(settings, 'ML_PREDICTION_CACHE_TTL', 3600)
+
+    if backend_name == 'lru':
+        backend = LRUBackend(getattr(settings, 'ML_PREDICTION_CACHE_SIZE', 1024), ttl)
+    elif backend_name == 'django':
+        backend = DjangoCacheBackend(getattr(settings, 'ML_PREDICTION_CACHE_ALIAS', 'default'), ttl)
+    elif backend_name in ('none', '', None):
+        backend = None
+    else:
+        raise ValueError(f'Unknown ML_PREDICTION_CACHE_BACKEND: {backend_name!r}')
+    return PredictionCache(backend)
+
+
+prediction_cache = build_prediction_cache()
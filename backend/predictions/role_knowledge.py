@@ -0,0 +1,171 @@
+"""
+Per-role details attached to every prediction (salary, skills, outlook).
+
+The service used to rebuild two literal dicts for every one of the five
+predicted roles and look them up with ``str(job_role).lower()``, which never
+matched the Title Case role names the model is trained on, so most roles got
+the generic skills and outlook. A RoleKnowledge index is built once when the
+model is loaded, from (lowest precedence first):
+
+    1. the built-in tables below
+    2. the model metadata's salary_data (per-role means from the training set)
+    3. the JobRole table, as curated in the admin (non-empty fields only)
+
+Role names are normalized ('Data Scientist', 'data_scientist' and
+'data-scientist' are the same role) and each role becomes an immutable
+RoleRecord. ``records_for(classes)`` lines the records up with the label
+encoder's classes, so the top-k class indices of a prediction (or of a whole
+batch) select their records with one array gather.
+"""
+import logging
+import re
+from collections import namedtuple
+
+import numpy as np
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SKILLS = ('Technical Skills', 'Problem Solving', 'Communication')
+DEFAULT_SALARY = (40000, 120000, 'USD')
+DEFAULT_OUTLOOK = 'Moderate'
+
+ROLE_SKILLS = {
+    'business_analyst': ('SQL', 'Excel', 'Power BI', 'Communication', 'Analytical Thinking'),
+    'cloud_engineer': ('AWS', 'Azure', 'Docker', 'Kubernetes', 'Networking'),
+    'data_analyst': ('SQL', 'Excel', 'Python', 'Statistics', 'Data Visualization'),
+    'data_scientist': ('Python', 'Machine Learning', 'Statistics', 'SQL', 'Data Visualization'),
+    'devops_engineer': ('AWS', 'Docker', 'Kubernetes', 'CI/CD', 'Linux'),
+    'financial_analyst': ('Excel', 'Financial Modeling', 'Accounting', 'Analysis', 'Communication'),
+    'frontend_developer': ('JavaScript', 'React', 'HTML/CSS', 'TypeScript', 'UI/UX'),
+    'ml_engineer': ('Python', 'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch'),
+    'product_manager': ('Product Strategy', 'Market Research', 'Agile', 'Communication', 'Leadership'),
+    'software_engineer': ('JavaScript', 'React', 'Node.js', 'Python', 'System Design'),
+    'ui_designer': ('Figma', 'UI Design', 'Prototyping', 'Visual Design', 'User Research'),
+    'ux_designer': ('User Research', 'Wireframing', 'Prototyping', 'Usability Testing', 'Figma'),
+}
+
+ROLE_OUTLOOK = {
+    'ai_engineer': 'Very High',
+    'business_analyst': 'Medium',
+    'cloud_engineer': 'High',
+    'data_analyst': 'High',
+    'data_scientist': 'Very High',
+    'devops_engineer': 'High',
+    'financial_analyst': 'Medium',
+    'frontend_developer': 'High',
+    'it_consultant': 'Medium',
+    'ml_engineer': 'Very High',
+    'product_manager': 'Medium',
+    'software_engineer': 'High',
+    'systems_analyst': 'Medium',
+    'ui_designer': 'Medium',
+    'ux_designer': 'High',
+}
+
+# JobRole.growth_projection (percent) at or above which a role gets each outlook
+GROWTH_OUTLOOK_THRESHOLDS = ((20, 'Very High'), (10, 'High'), (5, 'Medium'))
+
+RoleRecord = namedtuple('RoleRecord', ['name', 'required_skills', 'salary', 'growth_outlook', 'demand_level'])
+
+
+def normalize_role(name):
+    """Lookup key of a role name: lower case, runs of other characters as '_'"""
+    return re.sub(r'[^0-9a-z]+', '_', str(name).lower()).strip('_')
+
+
+def outlook_for_growth(growth_projection):
+    for threshold, outlook in GROWTH_OUTLOOK_THRESHOLDS:
+        if growth_projection >= threshold:
+            return outlook
+    return 'Low'
+
+
+def salary_range(record):
+    minimum, maximum, currency = record.salary
+    return {'min': minimum, 'max': maximum, 'currency': currency}
+
+
+def _builtin_fields(key, name):
+    return {
+        'name': str(name),
+        'required_skills': ROLE_SKILLS.get(key, DEFAULT_SKILLS),
+        'salary': DEFAULT_SALARY,
+        'growth_outlook': ROLE_OUTLOOK.get(key, DEFAULT_OUTLOOK),
+        'demand_level': None,
+    }
+
+
+def _job_role_rows():
+    from .models import JobRole
+    try:
+        return list(JobRole.objects.values(
+            'name', 'avg_salary_min', 'avg_salary_max', 'salary_currency',
+            'demand_level', 'required_skills', 'growth_projection'
+        ))
+    except DatabaseError as e:
+        # e.g. loaded before migrations ran: the built-in details still apply
+        logger.warning('Job roles not available for the role index: %s', e)
+        return []
+
+
+class RoleKnowledge:
+    """Immutable role records keyed by normalized role name"""
+
+    def __init__(self, records):
+        self._records = dict(records)
+
+    @classmethod
+    def build(cls, role_names=(), salary_data=None, job_roles=None):
+        """
+        Index ``role_names`` (the model's classes) plus every role in the
+        other sources. ``job_roles`` are JobRole value dicts; they are read
+        from the database when None.
+        """
+        names = {}
+        for name in list(role_names) + list(salary_data or {}):
+            names.setdefault(normalize_role(name), str(name))
+
+        fields = {key: _builtin_fields(key, name) for key, name in names.items()}
+
+        for name, salary in (salary_data or {}).items():
+            fields[normalize_role(name)]['salary'] = (
+                int(salary.get('salary_min_usd', DEFAULT_SALARY[0])),
+                int(salary.get('salary_max_usd', DEFAULT_SALARY[1])),
+                'USD'
+            )
+
+        for row in (_job_role_rows() if job_roles is None else job_roles):
+            key = normalize_role(row['name'])
+            role = fields.setdefault(key, _builtin_fields(key, row['name']))
+            if row.get('required_skills'):
+                role['required_skills'] = tuple(str(skill) for skill in row['required_skills'])
+            if row.get('avg_salary_max'):
+                role['salary'] = (int(row.get('avg_salary_min') or 0), int(row['avg_salary_max']),
+                                  row.get('salary_currency') or 'USD')
+            if row.get('growth_projection'):
+                role['growth_outlook'] = outlook_for_growth(row['growth_projection'])
+            role['demand_level'] = row.get('demand_level') or None
+
+        return cls({key: RoleRecord(**role) for key, role in fields.items()})
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, name):
+        return normalize_role(name) in self._records
+
+    def get(self, name):
+        """The record of ``name``, or a record with the default details"""
+        key = normalize_role(name)
+        record = self._records.get(key)
+        if record is None:
+            return RoleRecord(**_builtin_fields(key, name))
+        return record
+
+    def records_for(self, classes):
+        """Object array of records aligned with ``classes`` (gather it with class indices)"""
+        records = np.empty(len(classes), dtype=object)
+        for index, name in enumerate(classes):
+            records[index] = self.get(name)
+        return records
@@ -0,0 +1,50 @@
+"""
+Prediction inputs shared by the tests and the benchmark commands.
+"""
+import random
+
+from .serializers import PredictionInputSerializer
+
+# A complete, valid payload for PredictionInputSerializer
+SAMPLE_PROFILE = {
+    'age': 27,
+    'gender': 'Female',
+    'highest_degree': 'Master',
+    'degree_field': 'Computer Science',
+    'institution_tier': 'Tier 1',
+    'gpa_score': 8.4,
+    'graduation_year': 2020,
+    'total_experience_years': 4,
+    'current_role_level': 'Mid',
+    'industry': 'Technology',
+    'skill_python': 9,
+    'skill_sql': 7,
+    'skill_machine_learning': 8,
+    'skill_data_analysis': 8,
+    'skill_communication': 7,
+    'skill_leadership': 5,
+    'skill_problem_solving': 8,
+    'skill_teamwork': 7,
+    'cert_aws': True,
+    'online_courses_completed': 6,
+}
+
+
+def make_profiles(n_rows, seed=42):
+    """Validated variations of SAMPLE_PROFILE with randomized skill levels"""
+    rng = random.Random(seed)
+    skills = [field for field in PredictionInputSerializer().fields if field.startswith('skill_')]
+
+    payloads = []
+    for _ in range(n_rows):
+        profile = dict(SAMPLE_PROFILE)
+        profile['age'] = rng.randint(21, 45)
+        profile['gpa_score'] = round(rng.uniform(6.0, 9.8), 1)
+        profile['total_experience_years'] = round(rng.uniform(0, 15), 1)
+        for skill in skills:
+            profile[skill] = rng.randint(0, 10)
+        payloads.append(profile)
+
+    serializer = PredictionInputSerializer(data=payloads, many=True)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
@@ -32,6 +32,22 @@ class PredictionHistorySerializer(serializers.ModelSerializer):
     def get_formatted_date(self, obj):
         return obj.created_at.strftime("%b %d, %Y %I:%M %p")
 
+class PredictionHistoryListSerializer(serializers.ModelSerializer):
+    """
+    Row of the history listing: only what the table shows. The full record
+    (all_predictions, missing_skills, ...) comes from the detail endpoint and
+    the user block is sent once per page, not per row.
+    """
+    formatted_date = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = PredictionHistory
+        fields = ('id', 'top_prediction', 'confidence_score', 'input_data', 'created_at', 'formatted_date')
+        read_only_fields = fields
+    
+    def get_formatted_date(self, obj):
+        return obj.created_at.strftime("%b %d, %Y %I:%M %p")
+
 class PredictionInputSerializer(serializers.Serializer):
     # Personal Information
     age = serializers.IntegerField(min_value=18, max_value=70, required=True)
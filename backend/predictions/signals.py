@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from edu2job_backend.caching import response_cache
+from .models import JobRole, MLModelVersion, PredictionFeedback, PredictionHistory
+from .skill_snapshots import record_skill_snapshots
+
+
+# Drop cached responses whose data changed (cache keys are defined on the views)
+@receiver([post_save, post_delete], sender=JobRole)
+def invalidate_job_roles(sender, **kwargs):
+    from .model_registry import model_registry
+    from .views import JobRolesListView
+    response_cache.invalidate(JobRolesListView.cache_key)
+    # Predictions carry the roles' salary, skills and outlook: every worker
+    # rebuilds them once the change is committed
+    transaction.on_commit(model_registry.publish_role_change)
+
+@receiver([post_save, post_delete], sender=MLModelVersion)
+def invalidate_model_status(sender, **kwargs):
+    from .views import MLModelStatusView
+    response_cache.invalidate(MLModelStatusView.cache_key)
+
+@receiver([post_save, post_delete], sender=PredictionFeedback)
+def invalidate_feedback_stats(sender, **kwargs):
+    from .views import FeedbackStatsView
+    response_cache.invalidate(FeedbackStatsView.cache_key)
+
+# Skill levels of each new prediction feed the per-user skill trends
+# (PredictionHistory.objects.bulk_create() callers record them themselves)
+@receiver(post_save, sender=PredictionHistory)
+def record_prediction_skills(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_skill_snapshots([instance])
@@ -0,0 +1,87 @@
+"""
+Per-user skill trends from SkillSnapshot rows.
+
+UserStatisticsView used to load every PredictionHistory of the user and parse
+each input_data blob to find how every skill_* level moved. Each prediction's
+skill levels are now also written as SkillSnapshot rows when it is saved
+(the post_save receiver in predictions.signals; bulk_create callers call
+record_skill_snapshots() themselves), and skill_trends() reads the number of
+points and first and last level of every skill with two queries over the
+(user, skill, created_at) index.
+"""
+from django.db.models import Count, Max, Min, Q
+
+from .models import SkillSnapshot
+
+SKILL_PREFIX = 'skill_'
+
+
+def snapshot_rows(prediction):
+    """Unsaved SkillSnapshot rows for the numeric skill_* values of ``prediction``'s input"""
+    rows = []
+    for key, value in (prediction.input_data or {}).items():
+        if not key.startswith(SKILL_PREFIX) or isinstance(value, bool):
+            continue
+        try:
+            level = float(value)
+        except (TypeError, ValueError):
+            continue
+        rows.append(SkillSnapshot(
+            user_id=prediction.user_id,
+            prediction=prediction,
+            skill=key[len(SKILL_PREFIX):],
+            level=level,
+            created_at=prediction.created_at
+        ))
+    return rows
+
+
+def record_skill_snapshots(predictions, batch_size=1000):
+    """Write the snapshots of saved ``predictions`` (skipping ones already written)"""
+    rows = [row for prediction in predictions for row in snapshot_rows(prediction)]
+    SkillSnapshot.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+    return len(rows)
+
+
+def skill_label(skill):
+    return skill.replace('_', ' ').title()
+
+
+def skill_trends(user):
+    """
+    [{'skill', 'trend', 'change', 'data_points'}] for skills ``user`` entered
+    in at least two predictions, comparing the oldest level with the latest.
+    """
+    snapshots = SkillSnapshot.objects.filter(user=user)
+    spans = list(snapshots.values('skill')
+                 .annotate(data_points=Count('id'), first_at=Min('created_at'), last_at=Max('created_at'))
+                 .filter(data_points__gte=2)
+                 .order_by('skill'))
+    if not spans:
+        return []
+
+    # Then seek the boundary rows of each skill. (A correlated subquery in the
+    # grouped query would run once per snapshot rather than once per skill.)
+    # Every OR term carries the full index prefix so each one is an index seek.
+    boundaries = Q()
+    for span in spans:
+        boundaries |= Q(user=user, skill=span['skill'], created_at__in=(span['first_at'], span['last_at']))
+    first = {}
+    last = {}
+    for skill, created_at, level in (SkillSnapshot.objects.filter(boundaries)
+                                     .order_by('skill', 'created_at', 'id')
+                                     .values_list('skill', 'created_at', 'level')):
+        first.setdefault(skill, level)
+        last[skill] = level
+
+    trends = []
+    for span in spans:
+        skill = span['skill']
+        change = last[skill] - first[skill]
+        trends.append({
+            'skill': skill_label(skill),
+            'trend': 'improving' if change > 0 else 'declining' if change < 0 else 'stable',
+            'change': round(change, 2),
+            'data_points': span['data_points']
+        })
+    return trends
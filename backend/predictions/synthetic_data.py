@@ -0,0 +1,204 @@
+"""
+Vectorized synthetic training data for the job prediction model.
+
+Profiles are drawn column by column with NumPy, job roles are assigned with a
+single np.select over the skill columns, and salaries are computed with array
+arithmetic. Large datasets are produced in chunks and streamed to CSV or
+Parquet, so memory stays bounded by ``chunk_size`` rows whatever the size.
+
+Data is reproducible for a given seed and chunk size. A dataset that fits in
+one chunk is identical to what the original row-by-row generator produced
+with ``np.random.seed(seed)``.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 100000
+
+# Salary band (min, max USD) per job role
+SALARY_RANGES = {
+    'Data Scientist': (80000, 150000),
+    'ML Engineer': (90000, 160000),
+    'Data Analyst': (60000, 120000),
+    'Software Engineer': (70000, 140000),
+    'Cloud Engineer': (90000, 170000),
+    'Business Analyst': (65000, 130000),
+    'Product Manager': (85000, 160000),
+    'IT Consultant': (70000, 140000),
+    'Systems Analyst': (60000, 120000)
+}
+DEFAULT_SALARY_RANGE = (50000, 100000)
+
+
+def generate_profiles(n_samples, rng):
+    """Random candidate profiles (no labels) drawn from a np.random.RandomState"""
+    return pd.DataFrame({
+        'age': rng.randint(22, 45, n_samples),
+        'gender': rng.choice(['Male', 'Female', 'Other'], n_samples),
+        'highest_degree': rng.choice(['High School', 'Bachelor', 'Master', 'PhD'], n_samples),
+        'degree_field': rng.choice(['Computer Science', 'Engineering', 'Business', 'Science'], n_samples),
+        'institution_tier': rng.choice(['Tier 1', 'Tier 2', 'Tier 3'], n_samples),
+        'gpa_score': np.round(rng.uniform(6.0, 9.8, n_samples), 1),
+        'graduation_year': rng.randint(2010, 2024, n_samples),
+        'years_since_graduation': 2024 - rng.randint(2010, 2024, n_samples),
+        'total_experience_years': np.round(rng.uniform(0, 15, n_samples), 1),
+        'additional_certs_count': rng.randint(0, 10, n_samples),
+        'online_courses_completed': rng.randint(0, 20, n_samples),
+        'research_publications': rng.randint(0, 5, n_samples),
+        'professional_network_size': rng.randint(50, 1000, n_samples),
+        'industry': rng.choice(['Technology', 'Finance', 'Healthcare', 'Education'], n_samples),
+        'current_role_level': rng.choice(['Entry', 'Mid', 'Senior', 'Lead'], n_samples),
+        'remote_work_percentage': rng.randint(0, 101, n_samples),
+
+        # Skills (0-10 scale)
+        'skill_python': rng.randint(0, 11, n_samples),
+        'skill_java': rng.randint(0, 11, n_samples),
+        'skill_javascript': rng.randint(0, 11, n_samples),
+        'skill_sql': rng.randint(0, 11, n_samples),
+        'skill_machine_learning': rng.randint(0, 11, n_samples),
+        'skill_data_analysis': rng.randint(0, 11, n_samples),
+        'skill_react': rng.randint(0, 11, n_samples),
+        'skill_aws': rng.randint(0, 11, n_samples),
+        'skill_communication': rng.randint(3, 11, n_samples),
+        'skill_leadership': rng.randint(3, 11, n_samples),
+        'skill_problem_solving': rng.randint(3, 11, n_samples),
+        'skill_teamwork': rng.randint(3, 11, n_samples),
+
+        # Certifications
+        'cert_aws': rng.choice([True, False], n_samples, p=[0.3, 0.7]),
+        'cert_google_cloud': rng.choice([True, False], n_samples, p=[0.2, 0.8]),
+        'cert_azure': rng.choice([True, False], n_samples, p=[0.2, 0.8]),
+        'cert_data_science': rng.choice([True, False], n_samples, p=[0.25, 0.75]),
+
+        # Calculated scores
+        'education_score': np.round(rng.uniform(60, 100, n_samples), 1),
+        'tech_skill_score': np.round(rng.uniform(50, 95, n_samples), 1),
+        'soft_skill_score': np.round(rng.uniform(60, 100, n_samples), 1),
+        'overall_profile_score': np.round(rng.uniform(65, 95, n_samples), 1)
+    })
+
+
+def assign_job_roles(df):
+    """Job role per row from its skills; the first matching rule wins"""
+    python = df['skill_python'].to_numpy()
+    ml = df['skill_machine_learning'].to_numpy()
+    data_analysis = df['skill_data_analysis'].to_numpy()
+    java = df['skill_java'].to_numpy()
+    js = df['skill_javascript'].to_numpy()
+    react = df['skill_react'].to_numpy()
+    aws = df['skill_aws'].to_numpy()
+    sql = df['skill_sql'].to_numpy()
+
+    rules = [
+        ('Data Scientist', (ml >= 8) & (python >= 8)),
+        ('ML Engineer', (ml >= 7) & (python >= 7)),
+        ('Data Analyst', (data_analysis >= 7) & (sql >= 7)),
+        ('Software Engineer', ((java >= 7) | (js >= 7)) & (react >= 6)),
+        ('Cloud Engineer', (aws >= 7) & (python >= 6)),
+        ('Business Analyst', (sql >= 6) & (data_analysis >= 6)),
+        ('Product Manager', df['skill_leadership'].to_numpy() >= 7),
+        ('Systems Analyst', df['skill_problem_solving'].to_numpy() >= 8),
+    ]
+    return np.select(
+        [condition for _, condition in rules],
+        [role for role, _ in rules],
+        default='IT Consultant'
+    ).astype(object)
+
+
+def assign_salaries(df, roles, rng):
+    """(salary_min_usd, salary_max_usd) arrays, scaled by experience and profile score"""
+    roles = pd.Series(np.asarray(roles, dtype=object))
+    min_salary = roles.map({role: band[0] for role, band in SALARY_RANGES.items()})
+    max_salary = roles.map({role: band[1] for role, band in SALARY_RANGES.items()})
+    min_salary = min_salary.fillna(DEFAULT_SALARY_RANGE[0]).to_numpy(dtype=np.float64)
+    max_salary = max_salary.fillna(DEFAULT_SALARY_RANGE[1]).to_numpy(dtype=np.float64)
+    exp_multiplier = 1 + (df['total_experience_years'].to_numpy() * 0.05)
+    skill_multiplier = 1 + (df['overall_profile_score'].to_numpy() - 70) / 100
+
+    base_salary = rng.uniform(min_salary, max_salary)
+    adjusted_salary = base_salary * exp_multiplier * skill_multiplier
+
+    # int() truncation, as before
+    return (adjusted_salary * 0.8).astype(np.int64), (adjusted_salary * 1.2).astype(np.int64)
+
+
+def generate_synthetic_frame(n_samples, rng):
+    """One labelled chunk of synthetic training data"""
+    df = generate_profiles(n_samples, rng)
+    df['predicted_job_role'] = assign_job_roles(df)
+    df['salary_min_usd'], df['salary_max_usd'] = assign_salaries(df, df['predicted_job_role'], rng)
+    return df
+
+
+def iter_synthetic_chunks(n_samples, seed=42, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield DataFrames of at most ``chunk_size`` rows, ``n_samples`` rows in total"""
+    rng = np.random.RandomState(seed)
+    remaining = n_samples
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield generate_synthetic_frame(size, rng)
+        remaining -= size
+
+
+def generate_synthetic_data(n_samples=1000, seed=42):
+    """The whole dataset as one DataFrame (use write_synthetic_data for large sizes)"""
+    return generate_synthetic_frame(n_samples, np.random.RandomState(seed))
+
+
+def _output_format(path, output_format):
+    if output_format:
+        return output_format
+    return 'parquet' if os.path.splitext(path)[1].lower() in ('.parquet', '.pq') else 'csv'
+
+
+def write_synthetic_data(path, n_samples=1000, seed=42, chunk_size=DEFAULT_CHUNK_SIZE, output_format=None):
+    """
+    Stream a synthetic dataset to ``path`` chunk by chunk.
+
+    ``output_format`` is 'csv' or 'parquet' (default: from the file extension).
+    Parquet needs pyarrow. Returns the number of rows and rows per job role.
+    """
+    if n_samples < 1:
+        raise ValueError('n_samples must be at least 1')
+
+    output_format = _output_format(path, output_format)
+    if output_format not in ('csv', 'parquet'):
+        raise ValueError(f'Unsupported output format: {output_format}')
+
+    if output_format == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('Writing Parquet requires pyarrow (pip install pyarrow)')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    # Write next to the target and rename, so readers never see a partial file
+    tmp_path = f'{path}.tmp'
+    role_counts = {}
+    rows = 0
+    writer = None
+    try:
+        for index, chunk in enumerate(iter_synthetic_chunks(n_samples, seed, chunk_size)):
+            if output_format == 'csv':
+                chunk.to_csv(tmp_path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+            else:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+
+            rows += len(chunk)
+            for role, count in chunk['predicted_job_role'].value_counts().items():
+                role_counts[role] = role_counts.get(role, 0) + int(count)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    os.replace(tmp_path, path)
+    return {'path': path, 'rows': rows, 'format': output_format, 'job_roles': role_counts}
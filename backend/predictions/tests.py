@@ -1,3 +1,1002 @@
-from django.test import TestCase
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from rest_framework import status
+from unittest import mock, skipUnless
+
+from .ml_service import JobPredictionService, bump_model_generation, top_k
+from .model_registry import ModelRegistry, model_registry
+import numpy as np
+import pandas as pd
+
+from .models import PredictionHistory, MLModelVersion, PredictionFeedback, SkillSnapshot, JobRole
+from .feature_plan import FeaturePlan
+from .flat_forest import FlatForest
+from .role_knowledge import ROLE_SKILLS, ROLE_OUTLOOK
+from .synthetic_data import (
+    SALARY_RANGES, assign_job_roles, assign_salaries, generate_profiles,
+    generate_synthetic_data, write_synthetic_data
+)
+from .prediction_cache import PredictionCache, LRUBackend, DjangoCacheBackend, make_key, model_cache_version
+from .sample_profiles import SAMPLE_PROFILE, make_profiles
+from admin_panel.training_jobs import claim_next_job, run_job
+from edu2job_backend.caching import response_cache
+
+User = get_user_model()
+
+
+class TrainedModelMixin:
+    """Trains one small model into a temporary directory per test class"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.model_dir = tempfile.mkdtemp()
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.service = JobPredictionService(model_dir=cls.model_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.model_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def load_service(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return JobPredictionService(model_dir=self.model_dir)
+
+
+class FakeService:
+    def __init__(self, model_loaded=True):
+        self.model_loaded = model_loaded
+
+
+class FeaturePlanTests(TrainedModelMixin, TestCase):
+    def reference_features(self, input_data):
+        """The original pandas feature pipeline, used as ground truth"""
+        processed = dict(input_data)
+        for col, mapping in self.service.categorical_mappings.items():
+            if col in processed:
+                processed[col] = mapping.get(str(processed[col]), 0)
+        input_df = pd.DataFrame([processed])
+        for col in self.service.feature_columns:
+            if col not in input_df.columns:
+                if 'skill_' in col:
+                    input_df[col] = 5
+                elif col == 'years_since_graduation':
+                    input_df[col] = 2024 - processed['graduation_year'] if 'graduation_year' in processed else 5
+                else:
+                    input_df[col] = {'age': 25, 'gpa_score': 7.5, 'total_experience_years': 3}.get(col, 0)
+        input_df = input_df[self.service.feature_columns].apply(pd.to_numeric, errors='coerce').fillna(0)
+        return self.service.scaler.transform(input_df)
+
+    def test_matches_pandas_pipeline(self):
+        """Test the compiled plan reproduces the pandas + scaler features"""
+        profiles = make_profiles(5) + [
+            {'gender': 'Unknown', 'graduation_year': 2018, 'skill_python': 'n/a'},
+            {},
+        ]
+        plan = self.service.feature_plan
+
+        for profile in profiles:
+            np.testing.assert_array_equal(plan.transform(profile), self.reference_features(profile))
+
+        expected = np.vstack([self.reference_features(profile) for profile in profiles])
+        np.testing.assert_array_equal(plan.transform_many(profiles), expected)
+
+    def test_unscaled_plan_applies_defaults(self):
+        """Test defaults and categorical mappings without a scaler"""
+        plan = FeaturePlan(
+            ['age', 'skill_sql', 'cert_aws', 'gender', 'years_since_graduation'],
+            {'gender': {'Female': 0, 'Male': 1}}
+        )
+
+        row = plan.transform({'gender': 'Male', 'graduation_year': 2020})
+
+        self.assertEqual(row.tolist(), [[25.0, 5.0, 0.0, 1.0, 4.0]])
+
+    def test_predict_does_not_use_pandas(self):
+        """Test single predictions run without touching pandas"""
+        with mock.patch('predictions.ml_service.pd', None), contextlib.redirect_stdout(io.StringIO()):
+            result = self.service.predict(make_profiles(1)[0])
+
+        self.assertTrue(result['success'])
+
+
+class FlatForestTests(TrainedModelMixin, TestCase):
+    def setUp(self):
+        import joblib
+        import os
+        self.model_path = os.path.join(self.model_dir, 'random_forest_model.joblib')
+        self.sklearn_model = joblib.load(self.model_path)
+
+    def test_matches_sklearn_predict_proba(self):
+        """Test flattened inference matches sklearn to 1e-9"""
+        forest = FlatForest.from_estimator(self.sklearn_model)
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(500, self.sklearn_model.n_features_in_)) * 2
+        X = np.vstack([X, self.service.feature_plan.transform_many(make_profiles(50))])
+
+        np.testing.assert_allclose(
+            forest.predict_proba(X), self.sklearn_model.predict_proba(X), rtol=0, atol=1e-9
+        )
+        np.testing.assert_array_equal(forest.predict(X), self.sklearn_model.predict(X))
+
+    def test_matches_single_decision_tree(self):
+        """Test a lone DecisionTreeClassifier flattens too"""
+        from sklearn.tree import DecisionTreeClassifier
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(300, 6))
+        y = (X[:, 0] + X[:, 1] > 0).astype(int) + (X[:, 2] > 1)
+        tree = DecisionTreeClassifier(max_depth=6, random_state=0).fit(X, y)
+
+        np.testing.assert_allclose(
+            FlatForest.from_estimator(tree).predict_proba(X), tree.predict_proba(X), rtol=0, atol=1e-9
+        )
+
+    def test_save_and_load_round_trip(self):
+        """Test the exported arrays load back to the same forest"""
+        export_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, export_dir, ignore_errors=True)
+        forest = FlatForest.from_estimator(self.sklearn_model)
+        forest.save(export_dir, source_path=self.model_path)
+
+        loaded = FlatForest.load(export_dir, source_path=self.model_path)
+        X = self.service.feature_plan.transform_many(make_profiles(20))
+
+        np.testing.assert_array_equal(loaded.predict_proba(X), forest.predict_proba(X))
+
+    def test_stale_export_is_ignored(self):
+        """Test an export made from a different estimator file is not used"""
+        export_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, export_dir, ignore_errors=True)
+        FlatForest.from_estimator(self.sklearn_model).save(export_dir, source_path=self.model_path)
+
+        other_path = f'{export_dir}/other.joblib'
+        with open(other_path, 'wb') as f:
+            f.write(b'different model')
+
+        self.assertIsNone(FlatForest.load(export_dir, source_path=other_path))
+
+    def test_service_loads_flat_export(self):
+        """Test a loaded service serves from the export without unpickling the forest"""
+        service = self.load_service()
+
+        self.assertIsNone(service.model)
+        self.assertIsNotNone(service.forest)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(service.predict(make_profiles(1)[0])['success'])
+
+    def test_service_maps_forest_arrays(self):
+        """Test ML_MODEL_MMAP loads read-only mapped arrays with identical predictions"""
+        X = self.service.feature_plan.transform_many(make_profiles(20))
+
+        with override_settings(ML_MODEL_MMAP=True):
+            mapped = self.load_service().forest
+        with override_settings(ML_MODEL_MMAP=False):
+            in_memory = self.load_service().forest
+
+        self.assertTrue(mapped.is_mapped)
+        self.assertFalse(mapped.value.flags.writeable)
+        self.assertFalse(in_memory.is_mapped)
+        np.testing.assert_array_equal(mapped.predict_proba(X), in_memory.predict_proba(X))
+
+
+def reference_job_role(row):
+    """The original row-wise labelling rules"""
+    if row['skill_machine_learning'] >= 8 and row['skill_python'] >= 8:
+        return 'Data Scientist'
+    elif row['skill_machine_learning'] >= 7 and row['skill_python'] >= 7:
+        return 'ML Engineer'
+    elif row['skill_data_analysis'] >= 7 and row['skill_sql'] >= 7:
+        return 'Data Analyst'
+    elif (row['skill_java'] >= 7 or row['skill_javascript'] >= 7) and row['skill_react'] >= 6:
+        return 'Software Engineer'
+    elif row['skill_aws'] >= 7 and row['skill_python'] >= 6:
+        return 'Cloud Engineer'
+    elif row['skill_sql'] >= 6 and row['skill_data_analysis'] >= 6:
+        return 'Business Analyst'
+    elif row['skill_leadership'] >= 7:
+        return 'Product Manager'
+    elif row['skill_problem_solving'] >= 8:
+        return 'Systems Analyst'
+    return 'IT Consultant'
+
+
+class SyntheticDataTests(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+
+    def test_roles_match_row_wise_rules(self):
+        """Test np.select labelling agrees with the original if/elif chain"""
+        df = generate_profiles(2000, np.random.RandomState(0))
+
+        expected = [reference_job_role(row) for _, row in df.iterrows()]
+
+        self.assertEqual(list(assign_job_roles(df)), expected)
+
+    def test_salaries_match_row_wise_draws(self):
+        """Test vectorized salaries equal the original per-row computation"""
+        df = generate_profiles(500, np.random.RandomState(1))
+        roles = assign_job_roles(df)
+
+        salary_min, salary_max = assign_salaries(df, roles, np.random.RandomState(2))
+
+        rng = np.random.RandomState(2)
+        for i, (_, row) in enumerate(df.iterrows()):
+            low, high = SALARY_RANGES[roles[i]]
+            salary = (rng.uniform(low, high) * (1 + row['total_experience_years'] * 0.05)
+                      * (1 + (row['overall_profile_score'] - 70) / 100))
+            self.assertEqual(salary_min[i], int(salary * 0.8))
+            self.assertEqual(salary_max[i], int(salary * 1.2))
+
+    def test_chunked_csv_is_complete_and_reproducible(self):
+        """Test streaming in chunks writes every row once, with one header, deterministically"""
+        first = f'{self.output_dir}/first.csv'
+        second = f'{self.output_dir}/second.csv'
+
+        summary = write_synthetic_data(first, n_samples=2500, seed=7, chunk_size=1000)
+        write_synthetic_data(second, n_samples=2500, seed=7, chunk_size=1000)
+
+        df = pd.read_csv(first)
+        self.assertEqual(len(df), 2500)
+        self.assertEqual(summary['rows'], 2500)
+        self.assertEqual(sum(summary['job_roles'].values()), 2500)
+        self.assertEqual(df['predicted_job_role'].value_counts().to_dict(), summary['job_roles'])
+        with open(first, 'rb') as a, open(second, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_single_chunk_matches_in_memory_generation(self):
+        """Test a dataset that fits in one chunk equals generate_synthetic_data"""
+        path = f'{self.output_dir}/small.csv'
+        write_synthetic_data(path, n_samples=300, seed=3)
+
+        expected = generate_synthetic_data(300, seed=3)
+        expected.to_csv(f'{self.output_dir}/expected.csv', index=False)
+
+        pd.testing.assert_frame_equal(pd.read_csv(path), pd.read_csv(f'{self.output_dir}/expected.csv'))
+
+    @skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_parquet_output(self):
+        """Test Parquet output has the same rows as CSV"""
+        path = f'{self.output_dir}/data.parquet'
+        write_synthetic_data(path, n_samples=1500, seed=5, chunk_size=600)
+
+        self.assertEqual(len(pd.read_parquet(path)), 1500)
+
+    def test_management_command(self):
+        """Test generate_synthetic_data writes the requested size"""
+        path = f'{self.output_dir}/command.csv'
+        call_command('generate_synthetic_data', rows=1200, seed=11, chunk_size=500, output=path, stdout=io.StringIO())
+
+        self.assertEqual(len(pd.read_csv(path)), 1200)
+
+
+class ModelRegistryTests(TestCase):
+    def test_loads_once_and_shares_predictor(self):
+        """Test repeated lookups reuse the same predictor"""
+        factory = mock.Mock(side_effect=FakeService)
+        registry = ModelRegistry(service_factory=factory)
+
+        first = registry.get_predictor()
+        second = registry.get_predictor()
+
+        self.assertIs(first, second)
+        self.assertEqual(factory.call_count, 1)
+        self.assertEqual(registry.load_count, 1)
+
+    def test_concurrent_first_use_loads_once(self):
+        """Test threads racing on first use trigger a single load"""
+        factory = mock.Mock(side_effect=FakeService)
+        registry = ModelRegistry(service_factory=factory)
+        barrier = threading.Barrier(8)
+        seen = []
+
+        def worker():
+            barrier.wait()
+            seen.append(registry.get_predictor())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(factory.call_count, 1)
+        self.assertEqual(len({id(predictor) for predictor in seen}), 1)
+
+    def test_failed_load_is_not_cached(self):
+        """Test a predictor without a model is retried on the next request"""
+        factory = mock.Mock(side_effect=lambda: FakeService(model_loaded=False))
+        registry = ModelRegistry(service_factory=factory)
+
+        registry.get_predictor()
+        registry.get_predictor()
+
+        self.assertEqual(factory.call_count, 2)
+        self.assertFalse(registry.is_loaded())
+
+    def test_missing_model_is_not_trained_on_request(self):
+        """Test a request without saved model files gets 503 instead of training a model inline"""
+        model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, model_dir, ignore_errors=True)
+        user = get_user_model().objects.create_user(
+            email='nomodel@test.com', name='No Model', password='testpass123'
+        )
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        with mock.patch('predictions.ml_service.get_model_dir', return_value=model_dir), \
+                mock.patch.object(JobPredictionService, 'train_initial_model') as train_initial_model, \
+                mock.patch('predictions.views.model_registry', ModelRegistry()):
+            response = client.post('/api/predictions/predict/', SAMPLE_PROFILE, format='json')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['error'], 'Prediction model is not ready')
+        train_initial_model.assert_not_called()
+        self.assertEqual(os.listdir(model_dir), [])
+
+    def test_install_replaces_predictor(self):
+        """Test installing a retrained predictor swaps the shared one"""
+        registry = ModelRegistry(service_factory=FakeService)
+        old = registry.get_predictor()
+        new = FakeService()
+
+        registry.install(new)
+
+        self.assertIs(registry.get_predictor(), new)
+        self.assertIsNot(registry.get_predictor(), old)
+
+
+class ModelHotSwapTests(TestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.model_dir, ignore_errors=True)
+        self.registry = ModelRegistry(
+            service_factory=FakeService,
+            model_dir=self.model_dir,
+            poll_interval=60
+        )
+
+    def test_new_generation_is_swapped_in_background(self):
+        """Test a bumped generation loads and swaps without blocking requests"""
+        old = self.registry.get_predictor()
+        generation = bump_model_generation(self.model_dir)
+
+        # The request that notices the change still gets the old model
+        self.assertIs(self.registry.get_predictor(), old)
+
+        thread = self.registry.check_for_update(force=True)
+        self.assertIsNotNone(thread)
+        thread.join(timeout=5)
+
+        self.assertIsNot(self.registry.get_predictor(), old)
+        self.assertEqual(self.registry.generation, generation)
+        self.assertEqual(self.registry.load_count, 2)
+
+    def test_unchanged_generation_does_not_reload(self):
+        """Test polling without a new generation leaves the model alone"""
+        bump_model_generation(self.model_dir)
+        predictor = self.registry.get_predictor()
+
+        self.assertIsNone(self.registry.check_for_update(force=True))
+        self.assertIs(self.registry.get_predictor(), predictor)
+        self.assertEqual(self.registry.load_count, 1)
+
+    def test_checks_are_throttled(self):
+        """Test the generation stamp is not re-read on every request"""
+        self.registry.get_predictor()
+        self.registry.check_for_update(force=True)
+        bump_model_generation(self.model_dir)
+
+        self.assertIsNone(self.registry.check_for_update())
+
+    def test_failed_reload_keeps_current_model(self):
+        """Test a reload that yields no model keeps serving the old one"""
+        old = self.registry.get_predictor()
+        self.registry._service_factory = lambda: FakeService(model_loaded=False)
+        bump_model_generation(self.model_dir)
+
+        self.registry.check_for_update(force=True).join(timeout=5)
+
+        self.assertIs(self.registry.get_predictor(), old)
+
+
+class WarmUpTests(TrainedModelMixin, TestCase):
+    def test_readiness_reports_warming_then_ready(self):
+        """Test /health/ready is 503 until the model is loaded and warm, then 200 with details"""
+        registry = ModelRegistry(service_factory=self.load_service)
+
+        with mock.patch('predictions.views.model_registry', registry):
+            response = self.client.get('/health/ready')
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.json()['status'], 'warming_up')
+
+            registry._warmup_thread.join(timeout=30)
+            response = self.client.get('/health/ready')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body['warm'])
+        self.assertEqual(body['model_version'], self.service.model_info['version'])
+        self.assertIsNotNone(body['load_time'])
+        self.assertIsNotNone(body['warmup_time'])
+
+    def test_readiness_reports_failed_warm_up(self):
+        """Test a model that cannot be loaded keeps the worker out of rotation"""
+        registry = ModelRegistry(service_factory=lambda: FakeService(model_loaded=False))
+        registry.warm_up()
+
+        with mock.patch('predictions.views.model_registry', registry):
+            response = self.client.get('/health/ready')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], 'failed')
+        self.assertIn('could not be loaded', response.json()['error'])
+
+    def test_service_warm_up_runs_dummy_prediction(self):
+        """Test warm_up exercises predict_proba once"""
+        service = self.load_service()
+        with mock.patch.object(service, '_predict_proba', wraps=service._predict_proba) as predict_proba:
+            self.assertTrue(service.warm_up())
+        predict_proba.assert_called_once()
+
+    def test_app_ready_warms_only_server_processes(self):
+        """Test the AppConfig warm-up runs under gunicorn but not for management commands"""
+        from django.apps import apps
+        config = apps.get_app_config('predictions')
+
+        with mock.patch('predictions.model_registry.model_registry.start_warm_up') as start_warm_up:
+            with mock.patch('sys.argv', ['manage.py', 'migrate']):
+                config.ready()
+            start_warm_up.assert_not_called()
+
+            with mock.patch('sys.argv', ['/usr/bin/gunicorn', 'edu2job_backend.wsgi:application']):
+                config.ready()
+            start_warm_up.assert_called_once()
+
+
+class PredictJobViewTests(TrainedModelMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='predict@test.com',
+            name='Predict User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.registry = ModelRegistry(service_factory=self.load_service)
+
+    def test_predict_uses_shared_predictor(self):
+        """Test predictions don't reload the model per request"""
+        with mock.patch('predictions.views.get_predictor', self.registry.get_predictor), \
+                contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(3):
+                response = self.client.post('/api/predictions/predict/', SAMPLE_PROFILE, format='json')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.registry.load_count, 1)
+        self.assertTrue(response.data['success'])
+        self.assertEqual(len(response.data['predictions']), 5)
+
+    def test_resubmitted_form_is_served_from_cache(self):
+        """Test resubmitting the same form doesn't run the model again"""
+        predictor = self.load_service()
+        cache = PredictionCache(LRUBackend())
+
+        with mock.patch('predictions.views.get_predictor', lambda: predictor), \
+                mock.patch('predictions.views.prediction_cache', cache), \
+                mock.patch.object(predictor, 'predict', wraps=predictor.predict) as predict, \
+                contextlib.redirect_stdout(io.StringIO()):
+            responses = [
+                self.client.post('/api/predictions/predict/', SAMPLE_PROFILE, format='json')
+                for _ in range(3)
+            ]
+
+        self.assertEqual(predict.call_count, 1)
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(responses[0].data['predictions'], responses[2].data['predictions'])
+        self.assertEqual(PredictionHistory.objects.filter(user=self.user).count(), 3)
+
+
+class CountingPredictor:
+    """Stands in for JobPredictionService and counts predict() calls"""
+
+    def __init__(self, generation='gen-1', version='1.0.0'):
+        self.generation = generation
+        self.model_info = {'version': version}
+        self.model_loaded = True
+        self.calls = 0
+
+    def predict(self, input_data):
+        self.calls += 1
+        return {'success': True, 'top_prediction': 'Data Scientist', 'all_predictions': [{'rank': 1}]}
+
+
+class PredictionCacheTests(TestCase):
+    def test_key_ignores_field_order_and_number_format(self):
+        """Test equivalent inputs share a key and the model version is part of it"""
+        first = make_key({'age': 27, 'gpa_score': 8.4, 'gender': 'Female'}, 'gen-1:1.0.0')
+        second = make_key({'gender': 'Female', 'gpa_score': 8.40, 'age': 27.0}, 'gen-1:1.0.0')
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, make_key({'age': 27, 'gpa_score': 8.4, 'gender': 'Female'}, 'gen-2:1.0.0'))
+
+    def test_repeat_prediction_is_served_from_cache(self):
+        """Test the second identical request hits the cache and gets its own copy"""
+        cache = PredictionCache(LRUBackend(max_entries=10, ttl=60))
+        predictor = CountingPredictor()
+
+        first = cache.predict(predictor, SAMPLE_PROFILE)
+        first['all_predictions'].append('mutated')
+        second = cache.predict(predictor, dict(SAMPLE_PROFILE))
+
+        self.assertEqual(predictor.calls, 1)
+        self.assertEqual(second['all_predictions'], [{'rank': 1}])
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_new_model_generation_misses(self):
+        """Test entries of a previous model are not served (Django cache backend)"""
+        cache = PredictionCache(DjangoCacheBackend(ttl=60))
+
+        cache.predict(CountingPredictor(generation='gen-1'), SAMPLE_PROFILE)
+        retrained = CountingPredictor(generation='gen-2')
+        cache.predict(retrained, SAMPLE_PROFILE)
+
+        self.assertEqual(retrained.calls, 1)
+        self.assertEqual(cache.stats()['hits'], 0)
+
+    def test_lru_evicts_and_expires_entries(self):
+        """Test the LRU drops the least recently used entry and expired entries"""
+        backend = LRUBackend(max_entries=2, ttl=60)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')
+        backend.set('c', 3)
+
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.evictions, 1)
+
+        with mock.patch('predictions.prediction_cache.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(backend.get('a'))
+
+    def test_failed_predictions_are_not_cached(self):
+        """Test an unsuccessful result is recomputed next time"""
+        cache = PredictionCache(LRUBackend())
+        predictor = CountingPredictor()
+        predictor.predict = mock.Mock(return_value={'success': False, 'error': 'boom'})
+
+        cache.predict(predictor, SAMPLE_PROFILE)
+        cache.predict(predictor, SAMPLE_PROFILE)
+
+        self.assertEqual(predictor.predict.call_count, 2)
+
+    def test_hot_swap_invalidates_local_cache(self):
+        """Test installing a new predictor clears the in-process cache"""
+        cache = PredictionCache(LRUBackend())
+        registry = ModelRegistry(service_factory=CountingPredictor, model_dir=tempfile.gettempdir())
+
+        with mock.patch('predictions.model_registry.prediction_cache', cache):
+            cache.predict(registry.get_predictor(), SAMPLE_PROFILE)
+            self.assertEqual(len(cache.backend), 1)
+            registry.install(CountingPredictor(generation='gen-2'))
+
+        self.assertEqual(len(cache.backend), 0)
+
+
+class BatchPredictionTests(TrainedModelMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='batch@test.com',
+            name='Batch User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        patcher = mock.patch('predictions.views.get_predictor', lambda: self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_batch_matches_single_predictions(self):
+        """Test predict_batch gives the same results as predict row by row"""
+        profiles = make_profiles(25)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            single = [self.service.predict(profile) for profile in profiles]
+            batch = self.service.predict_batch(profiles, chunk_size=10)
+
+        self.assertEqual(len(batch), len(single))
+        for expected, actual in zip(single, batch):
+            self.assertEqual(actual['top_prediction'], expected['top_prediction'])
+            self.assertEqual(
+                [p['confidence_score'] for p in actual['all_predictions']],
+                [p['confidence_score'] for p in expected['all_predictions']]
+            )
+
+    def test_batch_endpoint_saves_history_in_bulk(self):
+        """Test a JSON list is scored and stored as prediction history"""
+        payload = [SAMPLE_PROFILE, dict(SAMPLE_PROFILE, skill_python=2)]
+
+        response = self.client.post('/api/predictions/predict/batch/', payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(PredictionHistory.objects.filter(user=self.user).count(), 2)
+        self.assertIsNotNone(response.data['results'][0]['prediction_id'])
+
+    def test_batch_history_is_saved_atomically(self):
+        """Test a failure while saving skill snapshots leaves no history rows"""
+        payload = [SAMPLE_PROFILE, dict(SAMPLE_PROFILE, skill_python=2)]
+
+        with mock.patch('predictions.views.record_skill_snapshots', side_effect=DatabaseError('disk full')):
+            response = self.client.post('/api/predictions/predict/batch/', payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertFalse(PredictionHistory.objects.exists())
+
+    def test_batch_endpoint_accepts_csv_upload(self):
+        """Test profiles can be uploaded as CSV; empty cells are treated as missing"""
+        header = ','.join(SAMPLE_PROFILE)
+        row = ','.join(str(value) for value in SAMPLE_PROFILE.values())
+        blank_row = row.replace('Mid', '')
+        upload = SimpleUploadedFile('cohort.csv', f'{header}\n{row}\n{blank_row}\n'.encode())
+
+        response = self.client.post(
+            '/api/predictions/predict/batch/?save_history=false',
+            {'file': upload},
+            format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['details'][0]['row'], 1)
+        self.assertIn('current_role_level', response.data['details'][0]['errors'])
+
+        upload = SimpleUploadedFile('cohort.csv', f'{header}\n{row}\n{row}\n'.encode())
+        response = self.client.post(
+            '/api/predictions/predict/batch/?save_history=false',
+            {'file': upload},
+            format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertFalse(PredictionHistory.objects.exists())
+
+    def test_batch_endpoint_accepts_ndjson_upload(self):
+        """Test profiles can be uploaded one JSON object per line"""
+        lines = '\n'.join(json.dumps(SAMPLE_PROFILE) for _ in range(3))
+        upload = SimpleUploadedFile('cohort.ndjson', lines.encode())
+
+        response = self.client.post('/api/predictions/predict/batch/', {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+
+
+class RoleKnowledgeTests(TrainedModelMixin, TestCase):
+    def test_trained_roles_get_their_details(self):
+        """Test Title Case class names find their skills, outlook and salary"""
+        knowledge = self.service.role_knowledge
+        salaries = self.service.salary_data
+
+        for name in self.service.label_encoder.classes_:
+            record = knowledge.get(name)
+            key = name.lower().replace(' ', '_')
+            self.assertEqual(record.name, name)
+            self.assertEqual(record.growth_outlook, ROLE_OUTLOOK[key])
+            self.assertEqual(record.salary[1], int(salaries[name]['salary_max_usd']))
+            if key in ROLE_SKILLS:
+                self.assertEqual(record.required_skills, ROLE_SKILLS[key])
+        self.assertIs(knowledge.get('data-scientist'), knowledge.get('Data Scientist'))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = self.service.predict(make_profiles(1)[0])
+        for prediction in result['all_predictions']:
+            record = knowledge.get(prediction['job_role'])
+            self.assertEqual(prediction['required_skills'], list(record.required_skills))
+            self.assertEqual(prediction['growth_outlook'], record.growth_outlook)
+
+    def test_job_role_change_reaches_every_worker(self):
+        """Test a saved JobRole is rebuilt here at once and in other workers on their next check"""
+        local, other = self.load_service(), self.load_service()
+        other_registry = ModelRegistry(service_factory=lambda: other, model_dir=self.model_dir)
+        other_registry.get_predictor()
+        cache_version = model_cache_version(other)
+        data_scientist = list(other.class_names).index('Data Scientist')
+        self.addCleanup(os.remove, os.path.join(self.model_dir, 'role_generation'))
+
+        with mock.patch.object(model_registry, '_predictor', local), \
+                mock.patch.object(model_registry, '_model_dir', self.model_dir), \
+                self.captureOnCommitCallbacks(execute=True):
+            JobRole.objects.create(
+                name='data scientist', category='Data Science',
+                avg_salary_min=95000, avg_salary_max=185000,
+                required_skills=['Python', 'Causal Inference'],
+                growth_projection=12, demand_level='High'
+            )
+
+        record = local.role_records[data_scientist]
+        self.assertEqual(record.name, 'Data Scientist')
+        self.assertEqual(record.required_skills, ('Python', 'Causal Inference'))
+        self.assertEqual(record.salary, (95000, 185000, 'USD'))
+        self.assertEqual(record.growth_outlook, 'High')
+        self.assertEqual(record.demand_level, 'High')
+
+        # The other worker keeps its details until it checks the stamp
+        self.assertEqual(other.role_records[data_scientist].required_skills, ROLE_SKILLS['data_scientist'])
+        other_registry.check_for_update(force=True)
+        self.assertEqual(other.role_records[data_scientist], record)
+        self.assertNotEqual(model_cache_version(other), cache_version)
+
+
+class TopKTests(TrainedModelMixin, TestCase):
+    def test_matches_full_sort(self):
+        """Test the partial selection ranks like a full argsort of every row"""
+        rng = np.random.default_rng(0)
+        probabilities = rng.random((200, 9))
+        probabilities[:, 3] = probabilities[:, 7]  # ties rank the higher class first
+
+        indices, values = top_k(probabilities, k=5)
+
+        expected = np.argsort(probabilities, axis=1, kind='stable')[:, -5:][:, ::-1]
+        np.testing.assert_array_equal(indices, expected)
+        np.testing.assert_array_equal(values, np.take_along_axis(probabilities, expected, axis=1))
+        self.assertEqual(top_k(probabilities[:1], k=20)[0].shape, (1, 9))
+
+    def test_predict_logs_instead_of_printing(self):
+        """Test predictions write nothing to stdout and log ranked roles at DEBUG"""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), \
+                self.assertLogs('predictions.ml_service', 'DEBUG') as logs:
+            result = self.service.predict(make_profiles(1)[0])
+
+        self.assertEqual(stdout.getvalue(), '')
+        top = logs.records[0].top_predictions
+        self.assertEqual(top[0], (result['top_prediction'], result['confidence_score']))
+        self.assertEqual(len(top), 5)
+
+
+class RetrainJobTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='retrain@test.com',
+            name='Retrain Admin',
+            password='testpass123',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_retrain_is_queued_and_run_by_worker(self):
+        """Test retraining returns 202 and the worker records metrics with capped threads"""
+        response = self.client.post('/api/predictions/model/retrain/', {'notes': 'nightly'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(MLModelVersion.objects.exists())
+
+        seen_threads = []
+
+        class FakeTrainer:
+            model_loaded = True
+
+            def __init__(self, auto_load=True):
+                pass
+
+            def retrain_model(self, **params):
+                from threadpoolctl import threadpool_info
+                seen_threads.extend(pool['num_threads'] for pool in threadpool_info())
+                print('training on synthetic data')
+                return {'success': True, 'accuracy': 0.91, 'total_samples': 100,
+                        'features_used': ['age'], 'model_path': '/tmp'}
+
+        with mock.patch('admin_panel.training_jobs.JobPredictionService', FakeTrainer), \
+                override_settings(TRAINING_MAX_THREADS=1):
+            job = run_job(claim_next_job('test-worker'))
+
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.metrics['accuracy'], 0.91)
+        self.assertIn('training on synthetic data', job.logs)
+        self.assertTrue(all(threads == 1 for threads in seen_threads))
+        self.assertEqual(MLModelVersion.objects.get().notes, 'nightly')
+
+        status_response = self.client.get(response.data['status_url'])
+        self.assertEqual(status_response.data['status'], 'succeeded')
+        self.assertIn('model_version', status_response.data['result'])
+
+
+class FeedbackStatsTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.admin = User.objects.create_user(
+            email='feedback-admin@test.com',
+            name='Feedback Admin',
+            password='testpass123',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin)
+
+        prediction = PredictionHistory.objects.create(
+            user=self.admin, top_prediction='Data Scientist', confidence_score=0.8
+        )
+        now = timezone.now()
+        # (days ago, rating, comment, reviewed)
+        rows = [
+            (0, 5, '', True), (0, 4, 'great', False), (2, 1, 'bad wrong', False),
+            (2, 2, 'bad not useful', False), (9, 3, 'not wrong', True), (45, 5, '', True),
+        ]
+        for days_ago, rating, comment, reviewed in rows:
+            feedback = PredictionFeedback.objects.create(
+                prediction=prediction, user=self.admin, rating=rating,
+                comment=comment, is_reviewed=reviewed
+            )
+            PredictionFeedback.objects.filter(pk=feedback.pk).update(created_at=now - timedelta(days=days_ago))
+
+    def test_stats_use_constant_number_of_queries(self):
+        """Test the stats are built from a fixed query budget whatever the data spread"""
+        # summary aggregate, recent feedback, low-rated comments, timeline
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/predictions/feedback/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        stats = response.data['statistics']
+        self.assertEqual(stats['total_feedback'], 6)
+        self.assertEqual(stats['average_rating'], round(20 / 6, 2))
+        self.assertEqual(stats['rating_distribution'][5], {'count': 2, 'percentage': 33.33})
+        self.assertEqual(stats['feedback_with_comments']['count'], 4)
+        self.assertEqual(stats['unreviewed_feedback'], 3)
+        self.assertEqual(stats['low_ratings'], 2)
+        self.assertEqual(len(response.data['recent_feedback']), 6)
+        self.assertCountEqual(response.data['common_issues'], [
+            {'word': 'bad', 'count': 2}, {'word': 'wrong', 'count': 2}, {'word': 'not', 'count': 2}
+        ])
+
+    def test_timeline_covers_last_30_days(self):
+        """Test the timeline has one entry per local day, with empty days zeroed"""
+        response = self.client.get('/api/predictions/feedback/stats/')
+        timeline = response.data['timeline_data']
+
+        self.assertEqual(len(timeline), 30)
+        self.assertEqual(timeline[-1]['date'], timezone.localdate().isoformat())
+        by_date = {entry['date']: entry for entry in timeline}
+        today = timezone.localdate()
+        self.assertEqual(by_date[today.isoformat()]['count'], 2)
+        self.assertEqual(by_date[today.isoformat()]['average_rating'], 4.5)
+        self.assertEqual(by_date[(today - timedelta(days=2)).isoformat()]['average_rating'], 1.5)
+        self.assertEqual(by_date[(today - timedelta(days=1)).isoformat()],
+                         {'date': (today - timedelta(days=1)).isoformat(), 'count': 0, 'average_rating': 0})
+        # The 45-day-old entry is outside the window
+        self.assertEqual(sum(entry['count'] for entry in timeline), 5)
+
+    def test_stats_cache_is_invalidated_by_new_feedback(self):
+        """Test cached stats are served until feedback changes"""
+        self.client.get('/api/predictions/feedback/stats/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/predictions/feedback/stats/')
+        self.assertEqual(response.data['statistics']['total_feedback'], 6)
+
+        PredictionFeedback.objects.create(
+            prediction=PredictionHistory.objects.get(), user=self.admin, rating=5
+        )
+        response = self.client.get('/api/predictions/feedback/stats/')
+        self.assertEqual(response.data['statistics']['total_feedback'], 7)
+
+
+class PredictionHistoryListTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='history@test.com', name='History User', password='testpass123')
+        other = User.objects.create_user(email='other@test.com', name='Other', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        
+        now = timezone.now()
+        roles = ['Data Scientist'] * 5 + ['Web Developer'] * 3 + ['DevOps Engineer'] * 4
+        for i, role in enumerate(roles):
+            history = PredictionHistory.objects.create(
+                user=self.user, top_prediction=role, confidence_score=60 + i,
+                input_data={'degree_field': 'CS'}, all_predictions=[{'job_role': role}] * 5
+            )
+            PredictionHistory.objects.filter(pk=history.pk).update(created_at=now - timedelta(hours=i // 2))
+        PredictionHistory.objects.create(user=other, top_prediction='Other Role', confidence_score=99)
+    
+    def test_pages_and_statistics_in_constant_queries(self):
+        """Test each page is two queries whatever its size, with the statistics from one GROUP BY"""
+        for page_size in (2, 10):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(f'/api/predictions/history/?page_size={page_size}')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(queries), 2)
+            self.assertEqual(len(response.data['predictions']), page_size)
+        
+        self.assertEqual(response.data['user'], {'email': 'history@test.com', 'name': 'History User'})
+        self.assertNotIn('all_predictions', response.data['predictions'][0])
+        self.assertNotIn('all_predictions', queries[0]['sql'])
+        self.assertEqual(response.data['statistics'], {
+            'total_predictions': 12,
+            'average_confidence': 65.5,
+            'most_predicted_role': {'role': 'Data Scientist', 'count': 5},
+            'last_prediction': PredictionHistory.objects.filter(user=self.user).first().created_at.isoformat()
+        })
+    
+    def test_cursor_walks_every_prediction_once(self):
+        """Test next links cover the user's predictions newest first without repeats"""
+        expected = [str(pk) for pk in PredictionHistory.objects.filter(user=self.user)
+                    .order_by('-created_at', '-id').values_list('id', flat=True)]
+        seen = []
+        url = '/api/predictions/history/?page_size=5'
+        while url:
+            response = self.client.get(url)
+            seen += [row['id'] for row in response.data['predictions']]
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+        
+        detail = self.client.get(f'/api/predictions/history/{seen[0]}/')
+        self.assertEqual(len(detail.data['all_predictions']), 5)
+
+
+class UserStatisticsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='skills@test.com', name='Skills User', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+    
+    def make_prediction(self, days_ago, role, **skills):
+        history = PredictionHistory.objects.create(
+            user=self.user, top_prediction=role, confidence_score=70,
+            input_data={'degree_field': 'CS', **{f'skill_{name}': level for name, level in skills.items()}}
+        )
+        created_at = timezone.now() - timedelta(days=days_ago)
+        PredictionHistory.objects.filter(pk=history.pk).update(created_at=created_at)
+        SkillSnapshot.objects.filter(prediction=history).update(created_at=created_at)
+        return history
+    
+    def test_snapshots_are_written_on_save(self):
+        """Test single and bulk saves both record the numeric skill levels"""
+        history = self.make_prediction(0, 'Data Scientist', python=7, sql='5', machine_learning='n/a')
+        self.assertEqual(
+            sorted(SkillSnapshot.objects.filter(prediction=history).values_list('skill', 'level')),
+            [('python', 7.0), ('sql', 5.0)]
+        )
+        
+        from .skill_snapshots import record_skill_snapshots
+        bulk = [PredictionHistory(user=self.user, top_prediction='Analyst', confidence_score=60,
+                                  input_data={'skill_python': 3}) for _ in range(3)]
+        PredictionHistory.objects.bulk_create(bulk)
+        self.assertEqual(record_skill_snapshots(bulk), 3)
+        record_skill_snapshots(bulk)
+        self.assertEqual(SkillSnapshot.objects.filter(user=self.user, skill='python').count(), 4)
+    
+    def test_statistics_from_indexed_queries(self):
+        """Test trends compare oldest with latest level, in a fixed number of queries"""
+        self.make_prediction(3, 'Data Scientist', python=4, sql=6, java=5)
+        self.make_prediction(2, 'Web Developer', python=6, sql=6)
+        self.make_prediction(1, 'Data Scientist', python=8, sql=3)
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/predictions/user-statistics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 5)
+        
+        statistics = response.data['statistics']
+        self.assertEqual(statistics['skill_trends'], [
+            {'skill': 'Python', 'trend': 'improving', 'change': 4.0, 'data_points': 3},
+            {'skill': 'Sql', 'trend': 'declining', 'change': -3.0, 'data_points': 3},
+        ])
+        self.assertEqual(statistics['most_predicted_role'], {'role': 'Data Scientist', 'count': 2})
+        self.assertEqual(statistics['latest_prediction']['role'], 'Data Scientist')
+        self.assertEqual([point['role'] for point in statistics['prediction_timeline']],
+                         ['Data Scientist', 'Web Developer', 'Data Scientist'])
+        
+        self.make_prediction(0, 'Web Developer', python=9)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/predictions/user-statistics/')
+        self.assertEqual(len(queries), 5)
@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     # Prediction endpoints
     path('predict/', views.PredictJobView.as_view(), name='predict_job'),
+    path('predict/batch/', views.PredictBatchView.as_view(), name='predict_batch'),
     path('history/', views.PredictionHistoryView.as_view(), name='prediction_history'),
     path('history/save/', views.SavePredictionHistoryView.as_view(), name='save_prediction_history'),
     path('history/<uuid:pk>/', views.PredictionDetailView.as_view(), name='prediction_detail'),
@@ -12,6 +13,7 @@ urlpatterns = [
     # Model management
     path('model/status/', views.MLModelStatusView.as_view(), name='model_status'),
     path('model/retrain/', views.RetrainModelView.as_view(), name='retrain_model'),
+    path('model/retrain/<uuid:job_id>/', views.RetrainJobStatusView.as_view(), name='retrain_job_status'),
     
     # Job roles and skills
     path('job-roles/', views.JobRolesListView.as_view(), name='job_roles_list'),
@@ -1,6 +1,8 @@
 import os
+import io
+import csv
 import json
-import traceback
+import logging
 import numpy as np
 from django.conf import settings
 from rest_framework import status, generics, permissions
@@ -9,20 +11,32 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.decorators import api_view, permission_classes
 from django.utils import timezone
-from django.db.models import Count, Avg, Max, Min
+from django.urls import reverse
+from django.http import JsonResponse
+from django.db import transaction
+from django.db.models import Count, Avg, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
 from collections import Counter
 from datetime import datetime, timedelta
 
 from .models import PredictionHistory, MLModelVersion, JobRole, Skill, PredictionFeedback
 from .serializers import (
-    PredictionHistorySerializer, PredictionInputSerializer,
+    PredictionHistorySerializer, PredictionHistoryListSerializer, PredictionInputSerializer,
     MLModelVersionSerializer, RetrainModelSerializer, JobRoleSerializer,
     PredictionFeedbackSerializer, PredictionFeedbackInputSerializer
 )
 from users.models import User
-from .ml_service import JobPredictionService
+from .model_registry import model_registry, get_predictor
+from .prediction_cache import prediction_cache
+from .skill_snapshots import record_skill_snapshots, skill_trends
+from edu2job_backend.caching import response_cache
+from admin_panel.models import TrainingJob
+from admin_panel.serializers import TrainingJobSerializer
+from admin_panel.training_jobs import submit_job
 
-# Import UserActivity and SystemLog from admin_panel
+# Import UserActivity and SystemLog from admin_panel; audit_writer batches their INSERTs
+from admin_panel.audit import audit_writer
+from admin_panel.pagination import KeysetPagination
 try:
     from admin_panel.models import UserActivity, SystemLog, Notification
 except ImportError:
@@ -31,23 +45,25 @@ except ImportError:
         @staticmethod
         def objects():
             return type('obj', (), {
-                'create': lambda **kwargs: print(f"Would create UserActivity: {kwargs}")
+                'create': lambda **kwargs: logger.debug('Would create UserActivity: %s', kwargs)
             })()
     
     class SystemLog:
         @staticmethod
         def objects():
             return type('obj', (), {
-                'create': lambda **kwargs: print(f"Would create SystemLog: {kwargs}")
+                'create': lambda **kwargs: logger.debug('Would create SystemLog: %s', kwargs)
             })()
     
     class Notification:
         @staticmethod
         def objects():
             return type('obj', (), {
-                'create': lambda **kwargs: print(f"Would create Notification: {kwargs}")
+                'create': lambda **kwargs: logger.debug('Would create Notification: %s', kwargs)
             })()
 
+logger = logging.getLogger(__name__)
+
 class PredictJobView(APIView):
     permission_classes = [IsAuthenticated]
     
@@ -63,11 +79,10 @@ class PredictJobView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             input_data = input_serializer.validated_data
-            print(f"📋 Received input data with {len(input_data)} fields")
             
-            # Initialize prediction service
+            # Get the shared prediction service (loaded once per worker)
             try:
-                predictor = JobPredictionService()
+                predictor = get_predictor()
             except Exception as e:
                 return Response({
                     'success': False,
@@ -83,11 +98,9 @@ class PredictJobView(APIView):
                     'details': 'Please try again in a few moments or contact administrator'
                 }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
             
-            print(f"✅ Model is loaded. Making prediction...")
-            
             # Make prediction
             try:
-                prediction_result = predictor.predict(input_data)
+                prediction_result = prediction_cache.predict(predictor, input_data)
                 
                 if not prediction_result.get('success', False):
                     return Response({
@@ -97,8 +110,7 @@ class PredictJobView(APIView):
                     }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
                 
             except Exception as e:
-                print(f"❌ Prediction processing error: {str(e)}")
-                print(f"Error details: {traceback.format_exc()}")
+                logger.exception('Prediction processing failed')
                 return Response({
                     'success': False,
                     'error': 'Prediction processing failed',
@@ -120,11 +132,10 @@ class PredictJobView(APIView):
                     training_required=prediction_result.get('training_required', '')
                 )
                 saved_prediction_id = str(history.id)
-                print(f"💾 Prediction saved to history with ID: {saved_prediction_id}")
                 
                 # Try to create user activity log
                 try:
-                    UserActivity.objects.create(
+                    audit_writer.record(UserActivity(
                         user=request.user,
                         activity_type='prediction',
                         description=f'Made prediction: {history.top_prediction} with {history.confidence_score}% confidence',
@@ -133,12 +144,12 @@ class PredictJobView(APIView):
                             'confidence': history.confidence_score,
                             'job_role': history.top_prediction
                         }
-                    )
+                    ))
                 except Exception as e:
-                    print(f"⚠️ Failed to create UserActivity: {str(e)}")
+                    logger.warning('Failed to create UserActivity: %s', e)
                 
             except Exception as e:
-                print(f"⚠️ Failed to save prediction history: {str(e)}")
+                logger.warning('Failed to save prediction history: %s', e)
                 # Continue even if history save fails
             
             # Prepare response
@@ -178,12 +189,18 @@ class PredictJobView(APIView):
                 'message': 'Prediction completed successfully'
             }
             
-            print(f"✅ Prediction completed successfully for user: {request.user.email}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Prediction completed', extra={
+                    'user_id': request.user.id,
+                    'prediction_id': saved_prediction_id,
+                    'input_fields': len(input_data),
+                    'top_prediction': prediction_result['top_prediction'],
+                    'confidence': prediction_result['confidence_score'],
+                })
             return Response(response_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            print(f"❌ General prediction error: {str(e)}")
-            print(f"Error details: {traceback.format_exc()}")
+            logger.exception('Prediction request failed')
             return Response({
                 'success': False,
                 'error': 'Prediction failed',
@@ -234,6 +251,178 @@ class PredictJobView(APIView):
         return strengths if strengths else ['Well-rounded profile']
 
 
+class PredictBatchView(APIView):
+    """Score many candidate profiles in one call"""
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        try:
+            try:
+                profiles = self._read_profiles(request)
+            except ValueError as e:
+                return Response({
+                    'success': False,
+                    'error': 'Invalid batch input',
+                    'details': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            max_rows = getattr(settings, 'ML_BATCH_MAX_ROWS', 10000)
+            if not profiles:
+                return Response({
+                    'success': False,
+                    'error': 'Invalid batch input',
+                    'details': 'No profiles provided'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if len(profiles) > max_rows:
+                return Response({
+                    'success': False,
+                    'error': 'Invalid batch input',
+                    'details': f'A batch can contain at most {max_rows} profiles'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Validate every profile; reject the batch if any row is invalid
+            input_serializer = PredictionInputSerializer(data=profiles, many=True)
+            if not input_serializer.is_valid():
+                row_errors = [
+                    {'row': index, 'errors': errors}
+                    for index, errors in enumerate(input_serializer.errors) if errors
+                ]
+                return Response({
+                    'success': False,
+                    'error': 'Invalid input data',
+                    'details': row_errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            input_rows = input_serializer.validated_data
+            
+            try:
+                predictor = get_predictor()
+            except Exception as e:
+                return Response({
+                    'success': False,
+                    'error': 'Prediction service initialization failed',
+                    'details': str(e)
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            
+            if not predictor.model_loaded:
+                return Response({
+                    'success': False,
+                    'error': 'Prediction model is not ready',
+                    'details': 'Please try again in a few moments or contact administrator'
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            
+            results = predictor.predict_batch(input_rows)
+            failed = [index for index, result in enumerate(results) if not result.get('success')]
+            if failed:
+                return Response({
+                    'success': False,
+                    'error': 'Prediction failed',
+                    'details': results[failed[0]].get('error', 'Unknown error')
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            
+            # Save prediction history in bulk
+            save_history = str(request.query_params.get('save_history', 'true')).lower() != 'false'
+            prediction_ids = [None] * len(results)
+            if save_history:
+                histories = [
+                    PredictionHistory(
+                        user=request.user,
+                        input_data=input_data,
+                        top_prediction=result['top_prediction'],
+                        confidence_score=result['confidence_score'],
+                        all_predictions=result['all_predictions'],
+                        missing_skills=result.get('missing_skills', []),
+                        salary_range=result.get('salary_range', {}),
+                        market_demand=result.get('market_demand', 'Medium'),
+                        training_required=result.get('training_required', '')
+                    )
+                    for input_data, result in zip(input_rows, results)
+                ]
+                # History rows and their skill snapshots are saved together or not at all
+                with transaction.atomic():
+                    PredictionHistory.objects.bulk_create(histories, batch_size=500)
+                    # bulk_create() sends no post_save, so snapshot the skill levels here
+                    record_skill_snapshots(histories)
+                    
+                    try:
+                        with transaction.atomic():
+                            audit_writer.record(UserActivity(
+                                user=request.user,
+                                activity_type='prediction',
+                                description=f'Made batch prediction for {len(histories)} profiles',
+                                metadata={'batch_size': len(histories)}
+                            ))
+                    except Exception as e:
+                        logger.warning('Failed to create UserActivity: %s', e)
+                prediction_ids = [str(history.id) for history in histories]
+            
+            return Response({
+                'success': True,
+                'count': len(results),
+                'results': [
+                    {
+                        'row': index,
+                        'prediction_id': prediction_id,
+                        'top_prediction': result['top_prediction'],
+                        'confidence_score': result['confidence_score'],
+                        'predictions': result['all_predictions'],
+                        'missing_skills': result.get('missing_skills', []),
+                        'salary_range': result.get('salary_range', {}),
+                        'market_demand': result.get('market_demand', 'Medium'),
+                        'training_required': result.get('training_required', '')
+                    }
+                    for index, (prediction_id, result) in enumerate(zip(prediction_ids, results))
+                ],
+                'model_info': {
+                    'version': predictor.get_model_version(),
+                    'accuracy': predictor.get_model_accuracy(),
+                    'last_trained': predictor.get_last_trained_date(),
+                    'status': 'active'
+                },
+                'timestamp': timezone.now().isoformat()
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.exception('Batch prediction request failed')
+            return Response({
+                'success': False,
+                'error': 'Batch prediction failed',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def _read_profiles(self, request):
+        """Read profiles from a JSON list/object or an uploaded CSV/NDJSON file"""
+        upload = request.FILES.get('file')
+        if upload is not None:
+            extension = os.path.splitext(upload.name)[1].lower()
+            text = io.TextIOWrapper(upload.file, encoding='utf-8-sig')
+            
+            if extension == '.csv':
+                # Empty cells fall back to the serializer defaults
+                return [
+                    {key: value for key, value in row.items() if key and value not in ('', None)}
+                    for row in csv.DictReader(text)
+                ]
+            if extension in ('.ndjson', '.jsonl'):
+                profiles = []
+                for line_number, line in enumerate(text, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        profiles.append(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f'Line {line_number} is not valid JSON: {e}')
+                return profiles
+            raise ValueError('Unsupported file type. Upload a .csv or .ndjson file')
+        
+        data = request.data
+        if isinstance(data, dict):
+            data = data.get('profiles')
+        if not isinstance(data, list):
+            raise ValueError('Expected a list of profiles or {"profiles": [...]}')
+        return data
+
+
 class SavePredictionHistoryView(APIView):
     """Save prediction to history (alternative endpoint)"""
     permission_classes = [IsAuthenticated]
@@ -266,7 +455,7 @@ class SavePredictionHistoryView(APIView):
             
             # Try to create user activity log
             try:
-                UserActivity.objects.create(
+                audit_writer.record(UserActivity(
                     user=request.user,
                     activity_type='prediction',
                     description=f'Made prediction: {history.top_prediction} with {history.confidence_score}% confidence',
@@ -275,9 +464,9 @@ class SavePredictionHistoryView(APIView):
                         'confidence': history.confidence_score,
                         'job_role': history.top_prediction
                     }
-                )
+                ))
             except Exception as e:
-                print(f"⚠️ Failed to create UserActivity: {str(e)}")
+                logger.warning('Failed to create UserActivity: %s', e)
             
             return Response({
                 'success': True,
@@ -286,7 +475,7 @@ class SavePredictionHistoryView(APIView):
             }, status=status.HTTP_201_CREATED)
             
         except Exception as e:
-            print(f"Error saving prediction: {str(e)}")
+            logger.exception('Saving prediction failed')
             return Response({
                 'success': False,
                 'error': 'Failed to save prediction',
@@ -294,71 +483,106 @@ class SavePredictionHistoryView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def summarize_history(user):
+    """
+    Total, average confidence, most predicted role and latest prediction time
+    of ``user``'s predictions, in one GROUP BY over top_prediction.
+    """
+    per_role = (PredictionHistory.objects.filter(user=user)
+                .values('top_prediction')
+                .annotate(count=Count('id'), confidence_sum=Sum('confidence_score'), latest=Max('created_at'))
+                .order_by())
+    
+    total = 0
+    confidence_sum = 0
+    mode = None
+    latest = None
+    for row in per_role:
+        total += row['count']
+        confidence_sum += row['confidence_sum'] or 0
+        # Ties go to the role predicted most recently
+        if mode is None or (row['count'], row['latest']) > (mode['count'], mode['latest']):
+            mode = row
+        if latest is None or row['latest'] > latest:
+            latest = row['latest']
+    
+    return {
+        'total': total,
+        'average_confidence': round(confidence_sum / total, 2) if total else 0,
+        'most_predicted_role': {'role': mode['top_prediction'], 'count': mode['count']} if mode else None,
+        'latest': latest
+    }
+
+
 class PredictionHistoryView(generics.ListAPIView):
-    serializer_class = PredictionHistorySerializer
+    """
+    The user's predictions, newest first, a keyset page at a time (``cursor``
+    and ``page_size`` query parameters, see KeysetPagination).
+
+    Each page is one query over the projected list columns and the statistics
+    are one GROUP BY over the user's predictions, however many there are.
+    """
+    serializer_class = PredictionHistoryListSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
-        return PredictionHistory.objects.filter(user=self.request.user).order_by('-created_at')
+        fields = [name for name in PredictionHistoryListSerializer.Meta.fields if name != 'formatted_date']
+        return PredictionHistory.objects.filter(user=self.request.user).only(*fields).order_by('-created_at')
     
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        
-        # Add statistics
-        total_predictions = queryset.count()
-        avg_confidence = queryset.aggregate(Avg('confidence_score'))['confidence_score__avg'] or 0
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
         
         return Response({
+            'user': {
+                'email': request.user.email,
+                'name': request.user.name
+            },
             'predictions': serializer.data,
-            'statistics': {
-                'total_predictions': total_predictions,
-                'average_confidence': round(avg_confidence, 2),
-                'most_predicted_role': self._get_most_predicted_role(queryset),
-                'last_prediction': queryset.first().created_at.isoformat() if queryset.exists() else None
-            }
+            'next': self.paginator.get_next_link(),
+            'previous': self.paginator.get_previous_link(),
+            'statistics': self._get_statistics()
         })
     
-    def _get_most_predicted_role(self, queryset):
-        if not queryset.exists():
-            return None
-        
-        roles = [pred.top_prediction for pred in queryset]
-        most_common = Counter(roles).most_common(1)
-        
-        if most_common:
-            return {
-                'role': most_common[0][0],
-                'count': most_common[0][1]
-            }
-        return None
+    def _get_statistics(self):
+        summary = summarize_history(self.request.user)
+        return {
+            'total_predictions': summary['total'],
+            'average_confidence': summary['average_confidence'],
+            'most_predicted_role': summary['most_predicted_role'],
+            'last_prediction': summary['latest'].isoformat() if summary['latest'] else None
+        }
 
 
 class PredictionDetailView(generics.RetrieveAPIView):
+    """One prediction with the JSON the history listing leaves out"""
     serializer_class = PredictionHistorySerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return PredictionHistory.objects.filter(user=self.request.user)
+        return PredictionHistory.objects.filter(user=self.request.user).select_related('user')
 
 
 class MLModelStatusView(APIView):
     permission_classes = [IsAuthenticated]
+    cache_key = 'predictions:model_status'
+    cache_ttl = 60
     
     def get(self, request):
         try:
-            predictor = JobPredictionService()
+            predictor = get_predictor()
             model_info = predictor.get_model_info()
             
-            # Get latest model version from database
-            latest_model = MLModelVersion.objects.filter(is_active=True).first()
+            # Database figures are shared by all workers; model and cache info
+            # below describe this worker and are always live
+            database_status = response_cache.get_or_set(self.cache_key, self._get_database_status, ttl=self.cache_ttl)
             
             return Response({
                 'model_status': 'active' if model_info['loaded'] else 'inactive',
                 'model_info': model_info,
-                'database_info': MLModelVersionSerializer(latest_model).data if latest_model else None,
-                'total_predictions_made': PredictionHistory.objects.count(),
-                'average_confidence': PredictionHistory.objects.aggregate(Avg('confidence_score'))['confidence_score__avg'] or 0,
+                **database_status,
+                'prediction_cache': prediction_cache.stats(),
                 'system_status': 'operational'
             })
         except Exception as e:
@@ -366,6 +590,15 @@ class MLModelStatusView(APIView):
                 'error': 'Failed to get model status',
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def _get_database_status(self):
+        # Get latest model version from database
+        latest_model = MLModelVersion.objects.filter(is_active=True).first()
+        return {
+            'database_info': MLModelVersionSerializer(latest_model).data if latest_model else None,
+            'total_predictions_made': PredictionHistory.objects.count(),
+            'average_confidence': PredictionHistory.objects.aggregate(Avg('confidence_score'))['confidence_score__avg'] or 0,
+        }
 
 
 class RetrainModelView(APIView):
@@ -383,45 +616,21 @@ class RetrainModelView(APIView):
             # Get retraining parameters
             params = serializer.validated_data
             
-            # Initialize prediction service
-            predictor = JobPredictionService()
-            
-            # Retrain model
-            result = predictor.retrain_model(
-                dataset_path=params.get('dataset_path'),
-                n_estimators=params.get('n_estimators'),
-                max_depth=params.get('max_depth')
-            )
-            
-            if not result.get('success'):
-                return Response({
-                    'error': 'Model retraining failed',
-                    'details': result.get('error')
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-            # Save model version to database
-            model_version = MLModelVersion.objects.create(
-                version=f"v{timezone.now().strftime('%Y%m%d_%H%M%S')}",
-                accuracy_score=result['accuracy'],
-                trained_on=timezone.now(),
-                features_used=result.get('features_used', []),
-                total_samples=result.get('total_samples', 0),
-                model_path=result.get('model_path', ''),
-                is_active=True,
-                notes=params.get('notes', '')
-            )
+            # Training runs in run_training_worker; serving workers hot-swap to
+            # the new model once it is saved
+            job = submit_job('retrain_prediction_model', {
+                'dataset_path': params.get('dataset_path'),
+                'n_estimators': params.get('n_estimators'),
+                'max_depth': params.get('max_depth'),
+                'notes': params.get('notes', ''),
+            }, user=request.user)
             
             return Response({
                 'success': True,
-                'message': 'Model retrained successfully',
-                'model_version': MLModelVersionSerializer(model_version).data,
-                'training_results': {
-                    'accuracy': result['accuracy'],
-                    'training_time': result.get('training_time'),
-                    'total_samples': result.get('total_samples'),
-                    'features_used': len(result.get('features_used', []))
-                }
-            }, status=status.HTTP_200_OK)
+                'message': 'Model retraining queued',
+                'job': TrainingJobSerializer(job).data,
+                'status_url': request.build_absolute_uri(reverse('retrain_job_status', args=[job.id]))
+            }, status=status.HTTP_202_ACCEPTED)
             
         except Exception as e:
             return Response({
@@ -430,12 +639,25 @@ class RetrainModelView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class RetrainJobStatusView(generics.RetrieveAPIView):
+    """Progress, metrics and logs of a queued retraining job"""
+    serializer_class = TrainingJobSerializer
+    permission_classes = [IsAdminUser]
+    lookup_url_kwarg = 'job_id'
+    queryset = TrainingJob.objects.filter(job_type='retrain_prediction_model').select_related('submitted_by')
+
+
 class JobRolesListView(generics.ListAPIView):
     serializer_class = JobRoleSerializer
     permission_classes = [IsAuthenticated]
     queryset = JobRole.objects.all().order_by('name')
+    cache_key = 'predictions:job_roles'
+    cache_ttl = 3600  # invalidated when a job role changes
     
     def list(self, request, *args, **kwargs):
+        return Response(response_cache.get_or_set(self.cache_key, self._build_listing, ttl=self.cache_ttl))
+    
+    def _build_listing(self):
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True)
         
@@ -446,15 +668,15 @@ class JobRolesListView(generics.ListAPIView):
             avg_max_salary=Avg('avg_salary_max')
         )
         
-        return Response({
+        return {
             'job_roles': serializer.data,
             'statistics': {
                 'total_job_roles': queryset.count(),
                 'categories': list(categories),
-                'highest_demand': self._get_highest_demand_roles(),
-                'highest_salary': self._get_highest_salary_roles()
+                'highest_demand': list(self._get_highest_demand_roles()),
+                'highest_salary': list(self._get_highest_salary_roles())
             }
-        })
+        }
     
     def _get_highest_demand_roles(self):
         return JobRole.objects.filter(demand_level='High').values('name', 'demand_level', 'growth_projection')[:5]
@@ -464,32 +686,27 @@ class JobRolesListView(generics.ListAPIView):
 
 
 class UserStatisticsView(APIView):
+    """
+    Summary, timeline and skill trends of the user's predictions: five
+    indexed queries, none of which loads input_data (skill trends come from
+    SkillSnapshot, see predictions.skill_snapshots).
+    """
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
         user = request.user
-        
-        # Get user predictions
         predictions = PredictionHistory.objects.filter(user=user)
         
-        if not predictions.exists():
+        summary = summarize_history(user)
+        if not summary['total']:
             return Response({
                 'message': 'No predictions found for this user',
                 'statistics': {}
             })
         
-        # Calculate statistics
-        total_predictions = predictions.count()
-        avg_confidence = predictions.aggregate(Avg('confidence_score'))['confidence_score__avg'] or 0
-        latest_prediction = predictions.latest('created_at')
-        
-        # Most predicted role
-        roles = [pred.top_prediction for pred in predictions]
-        role_counter = Counter(roles)
-        most_common_role = role_counter.most_common(1)[0] if role_counter else None
-        
-        # Skill trends (extract from input data)
-        skill_trends = self._analyze_skill_trends(predictions)
+        latest_prediction = (predictions.order_by('-created_at', '-id')
+                             .values('top_prediction', 'confidence_score', 'created_at').first())
+        most_predicted_role = summary['most_predicted_role']
         
         return Response({
             'user': {
@@ -498,64 +715,33 @@ class UserStatisticsView(APIView):
                 'name': user.name
             },
             'statistics': {
-                'total_predictions': total_predictions,
-                'average_confidence': round(avg_confidence, 2),
+                'total_predictions': summary['total'],
+                'average_confidence': summary['average_confidence'],
                 'most_predicted_role': {
-                    'role': most_common_role[0] if most_common_role else None,
-                    'count': most_common_role[1] if most_common_role else 0
+                    'role': most_predicted_role['role'],
+                    'count': most_predicted_role['count']
                 },
                 'latest_prediction': {
-                    'role': latest_prediction.top_prediction,
-                    'confidence': latest_prediction.confidence_score,
-                    'date': latest_prediction.created_at.isoformat()
+                    'role': latest_prediction['top_prediction'],
+                    'confidence': latest_prediction['confidence_score'],
+                    'date': latest_prediction['created_at'].isoformat()
                 },
                 'prediction_timeline': self._get_prediction_timeline(predictions),
-                'skill_trends': skill_trends
+                'skill_trends': skill_trends(user)
             }
         })
     
-    def _analyze_skill_trends(self, predictions):
-        """Analyze skill trends from prediction history"""
-        skill_data = {}
-        
-        for pred in predictions:
-            input_data = pred.input_data
-            for key, value in input_data.items():
-                if key.startswith('skill_'):
-                    skill_name = key.replace('skill_', '').replace('_', ' ').title()
-                    if skill_name not in skill_data:
-                        skill_data[skill_name] = []
-                    skill_data[skill_name].append({
-                        'date': pred.created_at.isoformat(),
-                        'level': value
-                    })
-        
-        # Calculate trends
-        trends = []
-        for skill, data in skill_data.items():
-            if len(data) >= 2:
-                first = data[0]['level']
-                last = data[-1]['level']
-                trend = 'improving' if last > first else 'declining' if last < first else 'stable'
-                trends.append({
-                    'skill': skill,
-                    'trend': trend,
-                    'change': round(last - first, 2),
-                    'data_points': len(data)
-                })
-        
-        return trends
-    
     def _get_prediction_timeline(self, predictions):
         """Create prediction timeline"""
-        timeline = []
-        for pred in predictions.order_by('created_at'):
-            timeline.append({
-                'date': pred.created_at.strftime('%Y-%m-%d'),
-                'role': pred.top_prediction,
-                'confidence': pred.confidence_score
-            })
-        return timeline
+        rows = predictions.order_by('created_at', 'id').values_list('created_at', 'top_prediction', 'confidence_score')
+        return [
+            {
+                'date': created_at.strftime('%Y-%m-%d'),
+                'role': role,
+                'confidence': confidence
+            }
+            for created_at, role, confidence in rows
+        ]
 
 
 class PredictionFeedbackView(APIView):
@@ -599,7 +785,7 @@ class PredictionFeedbackView(APIView):
             
             # Try to log the feedback
             try:
-                SystemLog.objects.create(
+                audit_writer.record(SystemLog(
                     level='info',
                     category='prediction',
                     source='feedback_system',
@@ -610,23 +796,23 @@ class PredictionFeedbackView(APIView):
                         'rating': data['rating'],
                         'has_comment': bool(data.get('comment', ''))
                     }
-                )
+                ))
             except Exception as e:
-                print(f"⚠️ Failed to create SystemLog: {str(e)}")
+                logger.warning('Failed to create SystemLog: %s', e)
             
             # Try to create notification for admin if rating is low
             if data['rating'] <= 2:
                 try:
-                    Notification.objects.create(
+                    audit_writer.record(Notification(
                         title=f'Low Rating Received for Prediction',
                         message=f'Prediction {prediction.top_prediction} received {data["rating"]}/5 stars',
                         notification_type='prediction',
                         priority=2,
                         related_prediction=prediction,
                         related_user=request.user
-                    )
+                    ))
                 except Exception as e:
-                    print(f"⚠️ Failed to create Notification: {str(e)}")
+                    logger.warning('Failed to create Notification: %s', e)
             
             return Response({
                 'success': True,
@@ -635,7 +821,7 @@ class PredictionFeedbackView(APIView):
             }, status=status.HTTP_201_CREATED)
             
         except Exception as e:
-            print(f"Error submitting feedback: {str(e)}")
+            logger.exception('Submitting feedback failed')
             return Response({
                 'success': False,
                 'error': 'Failed to submit feedback',
@@ -664,61 +850,17 @@ class FeedbackDetailView(generics.RetrieveUpdateAPIView):
 class FeedbackStatsView(APIView):
     """Get feedback statistics"""
     permission_classes = [IsAdminUser]
-    
+
+    # Negative words counted in low-rated comments
+    NEGATIVE_WORDS = {'bad', 'poor', 'wrong', 'inaccurate', 'not', 'doesnt', 'incorrect', 'useless', 'waste'}
+    TIMELINE_DAYS = 30
+    cache_key = 'predictions:feedback_stats'
+    cache_ttl = 300  # invalidated when feedback is added, edited or deleted
+
     def get(self, request):
         try:
-            # Calculate statistics
-            total_feedback = PredictionFeedback.objects.count()
-            avg_rating = PredictionFeedback.objects.aggregate(Avg('rating'))['rating__avg'] or 0
-            
-            # Rating distribution
-            rating_distribution = {}
-            for rating in range(1, 6):
-                count = PredictionFeedback.objects.filter(rating=rating).count()
-                percentage = (count / total_feedback * 100) if total_feedback > 0 else 0
-                rating_distribution[rating] = {
-                    'count': count,
-                    'percentage': round(percentage, 2)
-                }
-            
-            # Feedback with comments
-            feedback_with_comments = PredictionFeedback.objects.exclude(comment='').count()
-            comments_percentage = (feedback_with_comments / total_feedback * 100) if total_feedback > 0 else 0
-            
-            # Recent feedback
-            recent_feedback = PredictionFeedback.objects.select_related('prediction', 'user').order_by('-created_at')[:10]
-            recent_serializer = PredictionFeedbackSerializer(recent_feedback, many=True)
-            
-            # Common issues from low ratings
-            low_rating_feedback = PredictionFeedback.objects.filter(rating__lte=3).exclude(comment='')
-            common_issues = []
-            if low_rating_feedback.exists():
-                # Simple word frequency analysis
-                comments = low_rating_feedback.values_list('comment', flat=True)
-                all_words = ' '.join(comments).lower().split()
-                word_freq = Counter(all_words)
-                # Filter common negative words
-                negative_words = ['bad', 'poor', 'wrong', 'inaccurate', 'not', 'doesnt', 'incorrect', 'useless', 'waste']
-                common_issues = [{'word': word, 'count': count} 
-                                for word, count in word_freq.items() 
-                                if word in negative_words and count > 1]
-            
-            return Response({
-                'statistics': {
-                    'total_feedback': total_feedback,
-                    'average_rating': round(avg_rating, 2),
-                    'rating_distribution': rating_distribution,
-                    'feedback_with_comments': {
-                        'count': feedback_with_comments,
-                        'percentage': round(comments_percentage, 2)
-                    },
-                    'unreviewed_feedback': PredictionFeedback.objects.filter(is_reviewed=False).count(),
-                    'low_ratings': PredictionFeedback.objects.filter(rating__lte=2).count()
-                },
-                'recent_feedback': recent_serializer.data,
-                'common_issues': common_issues[:5],
-                'timeline_data': self._get_feedback_timeline()
-            })
+            stats = response_cache.get_or_set(self.cache_key, self._calculate_stats, ttl=self.cache_ttl)
+            return Response(stats)
             
         except Exception as e:
             return Response({
@@ -726,32 +868,86 @@ class FeedbackStatsView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    def _calculate_stats(self):
+        # Totals and the rating distribution in a single pass over the table
+        rating_counts = {
+            f'rating_{rating}': Count('id', filter=Q(rating=rating)) for rating in range(1, 6)
+        }
+        summary = PredictionFeedback.objects.aggregate(
+            total=Count('id'),
+            average=Avg('rating'),
+            with_comments=Count('id', filter=~Q(comment='')),
+            unreviewed=Count('id', filter=Q(is_reviewed=False)),
+            low_ratings=Count('id', filter=Q(rating__lte=2)),
+            **rating_counts
+        )
+        total_feedback = summary['total']
+        avg_rating = summary['average'] or 0
+
+        def percentage(count):
+            return round(count / total_feedback * 100, 2) if total_feedback > 0 else 0
+
+        rating_distribution = {
+            rating: {
+                'count': summary[f'rating_{rating}'],
+                'percentage': percentage(summary[f'rating_{rating}'])
+            }
+            for rating in range(1, 6)
+        }
+
+        # Recent feedback
+        recent_feedback = PredictionFeedback.objects.select_related('prediction', 'user').order_by('-created_at')[:10]
+        recent_serializer = PredictionFeedbackSerializer(recent_feedback, many=True)
+
+        # Common issues from low ratings (simple word frequency analysis)
+        comments = PredictionFeedback.objects.filter(rating__lte=3).exclude(comment='').values_list('comment', flat=True)
+        word_freq = Counter(word for comment in comments for word in comment.lower().split())
+        common_issues = [{'word': word, 'count': count}
+                         for word, count in word_freq.items()
+                         if word in self.NEGATIVE_WORDS and count > 1]
+
+        return {
+            'statistics': {
+                'total_feedback': total_feedback,
+                'average_rating': round(avg_rating, 2),
+                'rating_distribution': rating_distribution,
+                'feedback_with_comments': {
+                    'count': summary['with_comments'],
+                    'percentage': percentage(summary['with_comments'])
+                },
+                'unreviewed_feedback': summary['unreviewed'],
+                'low_ratings': summary['low_ratings']
+            },
+            'recent_feedback': recent_serializer.data,
+            'common_issues': common_issues[:5],
+            'timeline_data': self._get_feedback_timeline()
+        }
+
     def _get_feedback_timeline(self):
-        """Get feedback timeline for last 30 days"""
-        today = timezone.now().date()
+        """Get feedback timeline for last 30 days (one grouped query, days in local time)"""
+        today = timezone.localdate()
+        first_day = today - timedelta(days=self.TIMELINE_DAYS - 1)
+        start = timezone.make_aware(datetime.combine(first_day, datetime.min.time()))
+
+        daily = {
+            row['day']: row
+            for row in PredictionFeedback.objects.filter(created_at__gte=start)
+            .annotate(day=TruncDate('created_at'))
+            .values('day')
+            .annotate(count=Count('id'), average=Avg('rating'))
+            .order_by()
+        }
+
         timeline = []
-        
-        for i in range(29, -1, -1):
-            date = today - timedelta(days=i)
-            date_start = timezone.make_aware(datetime.combine(date, datetime.min.time()))
-            date_end = timezone.make_aware(datetime.combine(date, datetime.max.time()))
-            
-            count = PredictionFeedback.objects.filter(
-                created_at__gte=date_start,
-                created_at__lte=date_end
-            ).count()
-            
-            avg = PredictionFeedback.objects.filter(
-                created_at__gte=date_start,
-                created_at__lte=date_end
-            ).aggregate(Avg('rating'))['rating__avg'] or 0
-            
+        for i in range(self.TIMELINE_DAYS):
+            date = first_day + timedelta(days=i)
+            row = daily.get(date)
             timeline.append({
                 'date': date.isoformat(),
-                'count': count,
-                'average_rating': round(avg, 2)
+                'count': row['count'] if row else 0,
+                'average_rating': round(row['average'] or 0, 2) if row else 0
             })
-        
+
         return timeline
 
 
@@ -789,4 +985,24 @@ def get_prediction_with_feedback(request, prediction_id):
         return Response({
             'error': 'Failed to get prediction',
             'details': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def readiness(request):
+    """
+    Readiness probe for the load balancer: 200 once this worker's model is
+    loaded and warm, 503 (with the reason) until then. Never loads the model in
+    the request; if nothing is warming it up, a background warm-up is started.
+    """
+    model_status = model_registry.status()
+    if model_status['ready']:
+        return JsonResponse({'status': 'ready', **model_status})
+    
+    if not model_status['warming_up']:
+        model_registry.start_warm_up()
+        model_status['warming_up'] = True
+    
+    return JsonResponse({
+        'status': 'failed' if model_status['error'] else 'warming_up',
+        **model_status
+    }, status=503)
@@ -459,14 +459,19 @@ const Dashboard = () => {
         jobMatches: 0
       });
 
+      // The history is paged; totals come from the server-side statistics
+      const statistics = predictionsResponse.data.statistics;
+
       setStats({
         predictionAccuracy: 94,
         jobMatches: statsData.jobMatches,
         skillGap: 2,
-        totalPredictions: statsData.totalPredictions,
-        avgConfidence: statsData.totalPredictions > 0 
-          ? Math.round(statsData.totalConfidence / statsData.totalPredictions)
-          : 0,
+        totalPredictions: statistics ? statistics.total_predictions : statsData.totalPredictions,
+        avgConfidence: statistics
+          ? Math.round(statistics.average_confidence)
+          : statsData.totalPredictions > 0
+            ? Math.round(statsData.totalConfidence / statsData.totalPredictions)
+            : 0,
         highConfidenceMatches: statsData.highConfidenceMatches
       });
 
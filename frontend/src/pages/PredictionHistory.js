@@ -17,21 +17,27 @@ const PredictionHistory = () => {
   const [sortBy, setSortBy] = useState('date');
   const [filterRole, setFilterRole] = useState('all');
   const [selectedPrediction, setSelectedPrediction] = useState(null);
+  const [nextPage, setNextPage] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchPredictions();
   }, []);
 
-  const fetchPredictions = async () => {
+  const fetchPredictions = async (url = 'http://localhost:8000/api/predictions/history/', append = false) => {
     try {
-      const response = await axios.get('http://localhost:8000/api/predictions/history/', {
+      const response = await axios.get(url, {
         headers: {
           'Authorization': `Bearer ${token}`
         }
       });
       
       if (response.data.predictions) {
-        setPredictions(response.data.predictions);
+        // The history is paged; "Load more" follows the next link
+        setPredictions(current => append
+          ? [...current, ...response.data.predictions]
+          : response.data.predictions);
+        setNextPage(response.data.next || null);
       }
     } catch (error) {
       console.error('Error fetching predictions:', error);
@@ -40,6 +46,27 @@ const PredictionHistory = () => {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    await fetchPredictions(nextPage, true);
+    setLoadingMore(false);
+  };
+
+  // List rows carry only the table columns; the modal needs the full record
+  const viewPrediction = async (prediction) => {
+    try {
+      const response = await axios.get(`http://localhost:8000/api/predictions/history/${prediction.id}/`, {
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      });
+      setSelectedPrediction(response.data);
+    } catch (error) {
+      console.error('Error fetching prediction details:', error);
+      setSelectedPrediction(prediction);
+    }
+  };
+
   const filteredPredictions = predictions.filter(pred => {
     const matchesSearch = pred.top_prediction.toLowerCase().includes(searchTerm.toLowerCase()) ||
                          pred.input_data?.degree_field?.toLowerCase().includes(searchTerm.toLowerCase());
@@ -310,7 +337,7 @@ const PredictionHistory = () => {
                       <td className="px-6 py-4 whitespace-nowrap text-sm font-medium">
                         <div className="flex items-center space-x-3">
                           <button
-                            onClick={() => setSelectedPrediction(prediction)}
+                            onClick={() => viewPrediction(prediction)}
                             className="text-primary hover:text-primary-dark"
                             title="View Details"
                           >
@@ -339,6 +366,17 @@ const PredictionHistory = () => {
                   ))}
                 </tbody>
               </table>
+              {nextPage && (
+                <div className="p-4 text-center">
+                  <button
+                    onClick={loadMore}
+                    disabled={loadingMore}
+                    className="px-6 py-2 bg-primary text-white rounded-lg font-semibold hover:bg-primary-dark transition-colors disabled:opacity-50"
+                  >
+                    {loadingMore ? 'Loading...' : 'Load more'}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -1317,7 +1317,7 @@ const PredictionLogs = () => {
   const filteredPredictions = predictions.filter(prediction => {
     const matchesSearch = searchTerm === '' || 
       prediction.user_email?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      JSON.stringify(prediction.prediction_result).toLowerCase().includes(searchTerm.toLowerCase());
+      prediction.job_role?.toLowerCase().includes(searchTerm.toLowerCase());
     
     const matchesStatus = filterStatus === 'all' || prediction.status === filterStatus;
     
@@ -1463,9 +1463,7 @@ const PredictionLogs = () => {
                   </td>
                   <td className="px-6 py-4">
                     <div className="text-sm text-gray-900">
-                      {prediction.prediction_result?.job_role || 
-                       prediction.prediction_result?.top_prediction ||
-                       'No prediction data'}
+                      {prediction.job_role || 'No prediction data'}
                     </div>
                   </td>
                   <td className="px-6 py-4 whitespace-nowrap">
@@ -45,7 +45,7 @@ const PredictionLogs = () => {
   const filteredPredictions = predictions.filter(prediction => {
     const matchesSearch = searchTerm === '' || 
       prediction.user_email?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      JSON.stringify(prediction.prediction_result).toLowerCase().includes(searchTerm.toLowerCase());
+      prediction.job_role?.toLowerCase().includes(searchTerm.toLowerCase());
     
     const matchesStatus = filterStatus === 'all' || prediction.status === filterStatus;
     
@@ -255,9 +255,7 @@ const PredictionLogs = () => {
                     </td>
                     <td className="px-6 py-4">
                       <div className="text-sm text-gray-900">
-                        {prediction.prediction_result?.job_role || 
-                         prediction.prediction_result?.top_prediction ||
-                         'No prediction data'}
+                        {prediction.job_role || 'No prediction data'}
                       </div>
                       <div className="text-xs text-gray-500 mt-1">
                         Model: {prediction.model_name || 'Default'}
@@ -417,7 +415,7 @@ const PredictionLogs = () => {
                       {prediction.user_name || 'Anonymous User'}
                     </p>
                     <p className="text-sm text-gray-500">
-                      {prediction.prediction_result?.job_role || 'No role predicted'}
+                      {prediction.job_role || 'No role predicted'}
                     </p>
                   </div>
                   <div className="text-right">